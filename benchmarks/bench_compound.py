@@ -0,0 +1,85 @@
+"""
+Microbenchmark: compound interest with integer and fractional tenures.
+
+Compares the original calculate_compound_interest() (reproduced below,
+raising a Decimal to the non-integer power n * t at context precision)
+against the split-exponent engine in decimal_power, checks they agree to
+the cent, and times the full endpoint through the Flask test client.
+
+"cold" cases use a fresh rate per call, so ln(1 + r/n) is never cached;
+"warm" cases repeat one rate, as a savings page does.
+
+Usage:
+    python -m benchmarks.bench_compound
+"""
+import itertools
+import timeit
+from decimal import Decimal, ROUND_HALF_UP
+from src.service.app import app
+from src.service.calculators import decimal_power
+from src.service.calculators.financial import calculate_compound_interest, COMPOUNDING_FREQUENCIES
+
+CASES = [
+    ('integer tenure', 10000, 5, 10, 'monthly'),
+    ('fractional tenure 2.37y', 10000, 5, 2.37, 'monthly'),
+    ('fractional tenure 1/3y', 10000, 5, 1 / 3, 'quarterly'),
+    ('large 29.99y @ 29.99%', 9999999.99, 29.99, 29.99, 'monthly'),
+]
+
+
+def legacy_compound_interest(principal, rate, time_years, frequency):
+    """calculate_compound_interest() before the power engine."""
+    P = Decimal(str(principal))
+    r = Decimal(str(rate)) / Decimal('100')
+    t = Decimal(str(time_years))
+    n = Decimal(str(COMPOUNDING_FREQUENCIES.get(frequency.lower(), 12)))
+    final_amount = P * ((Decimal('1') + r / n) ** (n * t))
+    interest = final_amount - P
+    return {
+        'interest': interest.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+        'final_amount': final_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    }
+
+
+def best_us(function, args, number=2000, repeat=5, cold=False):
+    """Best time per call in microseconds."""
+    principal, rate, time_years, frequency = args
+    rates = itertools.count()
+
+    def run():
+        for _ in range(number):
+            # A distinct rate per call defeats the ln cache
+            call_rate = rate + next(rates) * 1e-7 if cold else rate
+            function(principal, call_rate, time_years, frequency)
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / number * 1e6
+
+
+def main():
+    for _, *args in CASES:
+        assert calculate_compound_interest(*args) == legacy_compound_interest(*args), args
+
+    print(f'{"case":<28}{"legacy us":>11}{"cold us":>10}{"warm us":>10}')
+    for label, *args in CASES:
+        legacy = best_us(legacy_compound_interest, args)
+        cold = best_us(calculate_compound_interest, args, cold=True)
+        warm = best_us(calculate_compound_interest, args)
+        print(f'{label:<28}{legacy:>11.1f}{cold:>10.1f}{warm:>10.1f}')
+
+    app.config['TESTING'] = True
+    client = app.test_client()
+
+    def http():
+        for _, principal, rate, time_years, frequency in CASES:
+            client.post('/api/calculate/compound-interest', json={
+                'principal': principal,
+                'rate': rate,
+                'time_years': time_years,
+                'frequency': frequency
+            })
+    best = min(timeit.repeat(http, number=200, repeat=3)) / (200 * len(CASES)) * 1e6
+    print(f'{"full endpoint via test client":<28}{best:>11.1f}')
+    print(f'ln cache: {decimal_power._ln.cache_info()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Microbenchmark: calculate_emi() with and without the annuity-factor and
+result caches.
+
+Compares the original calculate_emi() (reproduced below, computing
+(1+r)^n in Decimal on every call) with the annuity-factor version
+(calculate_emi.uncached) and the result-cached version, checks that all
+return identical results, and times the full /api/calculate/emi endpoint
+through the Flask test client for context.
+
+Usage:
+    python -m benchmarks.bench_emi
+"""
+import timeit
+from decimal import Decimal, ROUND_HALF_UP
+from src.service.app import app
+from src.service.calculators import annuity
+from src.service.calculators.financial import calculate_emi, result_cache
+
+LOANS = [
+    (100000, 8.5, 20),
+    (2500000, 7.25, 30),
+    (50000, 12, 5),
+    (1000, 29.99, 1),
+]
+
+
+def legacy_calculate_emi(loan_amount, annual_rate, tenure_years):
+    """calculate_emi() before the annuity-factor cache."""
+    P = Decimal(str(loan_amount))
+    annual_rate_decimal = Decimal(str(annual_rate))
+    n = tenure_years * 12
+    if annual_rate == 0:
+        emi = P / Decimal(str(n))
+        total_payment = P
+        total_interest = Decimal('0')
+    else:
+        r = annual_rate_decimal / Decimal('12') / Decimal('100')
+        one_plus_r_power_n = (Decimal('1') + r) ** n
+        emi = P * r * one_plus_r_power_n / (one_plus_r_power_n - Decimal('1'))
+        total_payment = emi * Decimal(str(n))
+        total_interest = total_payment - P
+    return {
+        'emi': emi.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+        'total_interest': total_interest.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+        'total_payment': total_payment.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    }
+
+
+def best_us(function, number=5000, repeat=7):
+    """Best time per call in microseconds."""
+    def run():
+        for loan in LOANS:
+            function(*loan)
+    return min(timeit.repeat(run, number=number, repeat=repeat)) / (number * len(LOANS)) * 1e6
+
+
+def main():
+    for loan in LOANS:
+        assert calculate_emi(*loan) == calculate_emi.uncached(*loan) == legacy_calculate_emi(*loan), loan
+
+    print(f'{"calculate_emi":<40}{"us/call":>10}')
+    print(f'{"direct Decimal (1+r)^n":<40}{best_us(legacy_calculate_emi):>10.2f}')
+    print(f'{"annuity-factor cache":<40}{best_us(calculate_emi.uncached):>10.2f}')
+    print(f'{"result cache (hit)":<40}{best_us(calculate_emi):>10.2f}')
+
+    app.config['TESTING'] = True
+    client = app.test_client()
+
+    def http():
+        for loan_amount, annual_rate, tenure_years in LOANS:
+            client.post('/api/calculate/emi', json={
+                'loan_amount': loan_amount,
+                'annual_rate': annual_rate,
+                'tenure_years': tenure_years
+            })
+    best = min(timeit.repeat(http, number=200, repeat=3)) / (200 * len(LOANS)) * 1e6
+    print(f'{"full endpoint via test client":<40}{best:>10.2f}')
+    print(f'cached factors: {annuity.stats()["cached_factors"]}')
+    print(f'result cache: {result_cache.stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Microbenchmark: GET /api/history latency against page depth.
+
+Fills a temporary SQLite database with one user's history and times
+pages at increasing depth, fetched by page number (LIMIT/OFFSET) and by
+cursor (keyset), and the cost of include_total. The history blueprint is
+mounted on a throwaway app, so the service database is not touched.
+
+Usage:
+    python -m benchmarks.bench_history [rows]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_login import LoginManager
+from sqlalchemy import insert
+from src.service.database import db
+from src.service.history import encode_cursor, history_bp
+from src.service.models import CalculationHistory, User
+
+PER_PAGE = 50
+
+
+def make_app(path):
+    """History blueprint on its own app and database."""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config['SECRET_KEY'] = 'bench'
+    db.init_app(app)
+    login_manager = LoginManager()
+    login_manager.init_app(app)
+    login_manager.user_loader(lambda user_id: db.session.get(User, int(user_id)))
+    app.register_blueprint(history_bp)
+    return app
+
+
+def fill(rows):
+    """One user with rows calculations, one second apart."""
+    user = User(username='bench', email='bench@example.com', password_hash='-')
+    db.session.add(user)
+    db.session.commit()
+    start = datetime(2020, 1, 1)
+    db.session.execute(insert(CalculationHistory), [{
+        'user_id': user.id,
+        'calculation_type': 'basic',
+        'expression': f'{i} + 1',
+        'result': str(i + 1),
+        'timestamp': start + timedelta(seconds=i)
+    } for i in range(rows)])
+    db.session.commit()
+    return user
+
+
+def best_ms(client, url, number=5):
+    """Best time per request in milliseconds."""
+    def run():
+        response = client.get(url)
+        assert response.status_code == 200, response.get_json()
+    return min(timeit.repeat(run, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = make_app(os.path.join(directory, 'history.db'))
+        with app.app_context():
+            db.create_all()
+            user = fill(rows)
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user.id)
+
+            print(f'{rows} rows, {PER_PAGE} per page')
+            print(f'{"page":>8}{"page= ms":>11}{"+total ms":>11}{"cursor= ms":>12}')
+            ordered = CalculationHistory.query.filter_by(user_id=user.id).order_by(
+                CalculationHistory.timestamp.desc(), CalculationHistory.id.desc())
+            for page in sorted({1, 10, 100, 1000, rows // PER_PAGE}):
+                offset_ms = best_ms(client, f'/api/history?limit={PER_PAGE}&page={page}&include_total=false')
+                total_ms = best_ms(client, f'/api/history?limit={PER_PAGE}&page={page}')
+                cursor_ms = float('nan')
+                if page > 1:
+                    # Cursor to the same page: after the last row of the page before
+                    previous = ordered.offset((page - 1) * PER_PAGE - 1).first()
+                    cursor_ms = best_ms(client, f'/api/history?limit={PER_PAGE}&cursor={encode_cursor(previous, "next")}')
+                print(f'{page:>8}{offset_ms:>11.2f}{total_ms:>11.2f}{cursor_ms:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Microbenchmark: saving history one POST at a time vs POST /api/history/batch.
+
+Saves the same entries through POST /api/history (one request and one
+commit each), through POST /api/history with the write-behind queue (202
+at once, written in batches by a background thread; timed until the
+queue is flushed) and through batches of increasing size (one
+executemany INSERT and one commit per batch) and reports rows per
+second. Runs on the throwaway app and temporary database of
+bench_history.
+
+Usage:
+    python -m benchmarks.bench_history_batch [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from benchmarks.bench_history import make_app
+from src.service.database import db
+from src.service.history import history_queue
+from src.service.models import User
+
+BATCH_SIZES = (10, 100, 1000, 10000)
+
+
+def entries(count):
+    """Distinct valid history entries."""
+    return [{'calculation_type': 'basic', 'expression': f'{i} + 1', 'result': str(i + 1)}
+            for i in range(count)]
+
+
+def rows_per_second(client, items, batch_size=None):
+    """Save items singly (batch_size None) or in batches; rows per second."""
+    start = time.perf_counter()
+    if batch_size is None:
+        for item in items:
+            response = client.post('/api/history', json=item)
+            assert response.status_code in (201, 202), response.get_json()
+        history_queue.flush()
+    else:
+        for offset in range(0, len(items), batch_size):
+            response = client.post('/api/history/batch', json=items[offset:offset + batch_size])
+            assert response.status_code == 200, response.get_json()
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = make_app(os.path.join(directory, 'history.db'))
+        with app.app_context():
+            db.create_all()
+            user = User(username='bench', email='bench@example.com', password_hash='-')
+            db.session.add(user)
+            db.session.commit()
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user.id)
+
+            items = entries(rows)
+            single = rows_per_second(client, items[:min(rows, 1000)])
+            history_queue.configure(wrap=app.app_context)
+            history_queue.start()
+            queued = rows_per_second(client, items)
+            flush_ms = history_queue.stats()['avg_flush_ms']
+            history_queue.stop()
+            print(f'{rows} rows per run')
+            print(f'{"batch size":>12}{"rows/s":>12}{"speedup":>9}')
+            print(f'{"single":>12}{single:>12.0f}{1:>8.0f}x')
+            print(f'{"queued":>12}{queued:>12.0f}{queued / single:>8.0f}x'
+                  f'  (avg flush {flush_ms:.1f} ms)')
+            for batch_size in BATCH_SIZES:
+                if batch_size > rows:
+                    break
+                rate = rows_per_second(client, items, batch_size)
+                print(f'{batch_size:>12}{rate:>12.0f}{rate / single:>8.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Accuracy and speed of "precision": "fast" against the Decimal path.
+
+Runs the verification harness (benchmarks/precision.py) over sampled
+inputs from the validated domain of every financial calculator and
+reports mismatches and the worst error against the documented bound,
+then times one batch of the sampled inputs through each path.
+
+Usage:
+    python -m benchmarks.bench_precision [samples]
+"""
+import sys
+import timeit
+import numpy as np
+from src.service.calculators.financial import FAST_ABSOLUTE_ERROR, FAST_RELATIVE_ERROR
+from benchmarks.precision import CALCULATORS, verify_fast
+
+TIMED_ITEMS = 10000
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print(f'bound: {FAST_ABSOLUTE_ERROR} + {FAST_RELATIVE_ERROR:g} * |amount|, {samples} samples each')
+    print(f'{"calculator":<20}{"mismatched":>12}{"max abs":>10}{"max rel":>11}{"of bound":>10}  ok')
+    reports = verify_fast(samples)
+    for name, report in reports.items():
+        print(f'{name:<20}{report["mismatched"]:>12}{report["max_abs_error"]:>10.2f}'
+              f'{report["max_relative_error"]:>11.1e}{report["max_bound_ratio"]:>10.3f}'
+              f'  {"yes" if report["within_bound"] else "NO"}')
+
+    print(f'\n{"calculator":<20}{"exact us/item":>14}{"fast us/item":>14}{"speedup":>9}')
+    rng = np.random.default_rng(1)
+    for name, (sample, compute_many, calculate, _) in CALCULATORS.items():
+        params = sample(rng, TIMED_ITEMS)
+        columns = list(zip(*params))
+        exact = min(timeit.repeat(lambda: [calculate(*item) for item in params], number=1, repeat=3))
+        fast = min(timeit.repeat(lambda: compute_many(*columns), number=1, repeat=5))
+        print(f'{name:<20}{exact / TIMED_ITEMS * 1e6:>14.2f}{fast / TIMED_ITEMS * 1e6:>14.3f}'
+              f'{exact / fast:>8.0f}x')
+
+    if not all(report['within_bound'] for report in reports.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
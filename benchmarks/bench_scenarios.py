@@ -0,0 +1,76 @@
+"""
+Microbenchmark: scenario engine speedup against worker count.
+
+Simulates one large scenario set (prepayments, step-ups and rate resets
+on a 30-year loan) with 1, 2, 4, ... worker processes up to the CPU count
+and reports throughput and speedup over the in-process run. The pool is
+started before timing, so process start-up is not counted.
+
+Usage:
+    python -m benchmarks.bench_scenarios [scenarios] [max_workers]
+"""
+import os
+import random
+import sys
+import timeit
+from src.service.calculators import scenarios
+from src.service.calculators.scenarios import parse_scenario, run_scenarios
+
+LOAN = (5000000, 9.0, 30)
+
+
+def make_scenarios(count, seed=14):
+    """Random but reproducible repayment strategies."""
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        data = {
+            'strategy': rng.choice(['reduce_tenure', 'reduce_emi']),
+            'prepayments': [{'month': rng.randint(1, 360), 'amount': rng.randint(1, 50) * 10000}
+                            for _ in range(rng.randint(0, 10))],
+            'rate_resets': [{'month': rng.randint(1, 360), 'annual_rate': round(rng.uniform(7, 11), 2)}
+                            for _ in range(rng.randint(0, 3))],
+        }
+        if rng.random() < 0.5:
+            data['step_up'] = {'percent': rng.randint(1, 10)}
+        scenario, error = parse_scenario(data, LOAN[2])
+        assert error is None, error
+        items.append(scenario)
+    return items
+
+
+def worker_counts(maximum):
+    counts = [1]
+    while counts[-1] * 2 <= maximum:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != maximum:
+        counts.append(maximum)
+    return counts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    maximum = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    items = make_scenarios(count)
+    print(f'{count} scenarios, {os.cpu_count()} CPUs')
+    print(f'{"workers":>8}{"seconds":>10}{"scenarios/s":>13}{"speedup":>9}')
+
+    expected = None
+    baseline = None
+    for workers in worker_counts(maximum):
+        scenarios.configure(workers)
+        # Warm up: start the pool outside the timed runs
+        results, used = run_scenarios(LOAN, items)
+        assert used == workers
+        expected = expected or results
+        assert results == expected
+
+        best = min(timeit.repeat(lambda: run_scenarios(LOAN, items), number=1, repeat=3))
+        baseline = baseline or best
+        print(f'{workers:>8}{best:>10.3f}{count / best:>13.0f}{baseline / best:>8.2f}x')
+
+    scenarios.configure()
+
+
+if __name__ == '__main__':
+    main()
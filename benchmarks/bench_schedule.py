@@ -0,0 +1,57 @@
+"""
+Microbenchmark: CPU cost of a 30-year (360-row) amortization schedule.
+
+Times the closed-form schedule computation on its own and together with
+NDJSON and CSV formatting, and compares against a month-by-month Decimal
+loop for reference. Reports the best CPU time (time.process_time) per
+schedule.
+
+Usage:
+    python -m benchmarks.bench_schedule
+"""
+import time
+from decimal import Decimal, ROUND_HALF_UP
+from src.service.calculators.amortization import amortization_schedule, iter_schedule_rows
+
+LOAN = (5000000, 8.5, 30)
+
+
+def decimal_loop(loan_amount, annual_rate, tenure_years, emi=Decimal('38445.67')):
+    """Iterative schedule in Decimal, rounding each row to the cent."""
+    balance = Decimal(str(loan_amount))
+    r = Decimal(str(annual_rate)) / 12 / 100
+    cent = Decimal('0.01')
+    rows = []
+    for month in range(1, tenure_years * 12 + 1):
+        interest = (balance * r).quantize(cent, rounding=ROUND_HALF_UP)
+        principal = emi - interest
+        balance -= principal
+        rows.append((month, emi, principal, interest, balance))
+    return rows
+
+
+def best_cpu_ms(function, rounds=7, number=200):
+    """Best CPU milliseconds per call over several rounds."""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.process_time()
+        for _ in range(number):
+            function()
+        best = min(best, (time.process_time() - start) / number * 1e3)
+    return best
+
+
+def main():
+    cases = [
+        ('closed form (NumPy)', lambda: amortization_schedule(*LOAN)),
+        ('closed form + NDJSON rows', lambda: ''.join(iter_schedule_rows(amortization_schedule(*LOAN)))),
+        ('closed form + CSV rows', lambda: ''.join(iter_schedule_rows(amortization_schedule(*LOAN), 'csv'))),
+        ('iterative Decimal loop', lambda: decimal_loop(*LOAN)),
+    ]
+    print(f'{"360-row schedule":<32}{"CPU ms":>10}')
+    for label, function in cases:
+        print(f'{label:<32}{best_cpu_ms(function):>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
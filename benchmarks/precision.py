@@ -0,0 +1,164 @@
+"""
+Verification harness for "precision": "fast", used by bench_precision.py
+and tests/test_precision.py.
+
+Samples the validated input domain of each financial calculator, runs the
+float64 path and the Decimal path on the same inputs and reports how far
+apart they are against the documented bound
+
+    FAST_ABSOLUTE_ERROR + FAST_RELATIVE_ERROR * |exact amount|
+
+from financial.py. Inputs are drawn the way requests arrive: amounts in
+whole cents, log-uniform so small and large principals are equally
+covered, rates and times with a few decimals, plus the corners of every
+range. The Decimal side bypasses the result cache.
+
+Usage:
+    python -m benchmarks.bench_precision [samples]
+"""
+import numpy as np
+from decimal import Decimal
+from src.service.calculators.financial import (
+    calculate_emi,
+    calculate_simple_interest,
+    calculate_compound_interest,
+    check_emi_ranges,
+    emi_many,
+    EMI_FIELDS,
+    FAST_ABSOLUTE_ERROR,
+    FAST_RELATIVE_ERROR
+)
+from src.service.calculators.interest import (
+    parse_compound_interest_params,
+    simple_interest_many,
+    _compound_interest_many,
+    INTEREST_FIELDS
+)
+
+FREQUENCIES = ('monthly', 'quarterly', 'annual')
+
+
+def _amounts(rng, count, low, high):
+    """Log-uniform amounts rounded to the cent."""
+    return np.round(np.exp(rng.uniform(np.log(low), np.log(high), count)), 2)
+
+
+def _rounded(rng, values, max_places):
+    """Round each value to a random number of decimals, 0 to max_places."""
+    scale = 10.0 ** rng.integers(0, max_places + 1, len(values))
+    return np.round(values * scale) / scale
+
+
+def sample_emi(rng, count):
+    """EMI parameters within the /emi ranges, corners first."""
+    corners = [(1000.0, 0.0, 1), (1000.0, 30.0, 1), (10000000.0, 0.0, 30),
+               (10000000.0, 30.0, 30), (10000000.0, 0.01, 30), (1000.0, 0.01, 1)]
+    loans = _amounts(rng, count, 1000, 10000000)
+    rates = _rounded(rng, rng.uniform(0, 30, count), 3)
+    tenures = rng.integers(1, 31, count)
+    samples = corners + list(zip(loans.tolist(), rates.tolist(), tenures.tolist()))
+    assert all(check_emi_ranges(*params) is None for params in samples)
+    return samples[:count]
+
+
+def sample_simple_interest(rng, count):
+    """Simple interest parameters within the accepted ranges, corners first."""
+    corners = [(1.0, 0.0, 0.0), (1.0, 100.0, 100.0), (10000000.0, 100.0, 100.0),
+               (10000000.0, 0.01, 0.01)]
+    principals = _amounts(rng, count, 1, 10000000)
+    rates = _rounded(rng, rng.uniform(0, 100, count), 3)
+    times = _rounded(rng, rng.uniform(0, 100, count), 2)
+    return (corners + list(zip(principals.tolist(), rates.tolist(), times.tolist())))[:count]
+
+
+def sample_compound_interest(rng, count):
+    """
+    Compound interest parameters accepted by parse_compound_interest_params(),
+    i.e. excluding results over 15 digits, corners first.
+    """
+    corners = [(1.0, 0.0, 0.0, 'monthly'), (10000000.0, 0.01, 100.0, 'annual'),
+               (10000000.0, 100.0, 18.0, 'monthly'), (1.0, 100.0, 35.0, 'annual')]
+    samples = []
+    while len(samples) < count:
+        if corners:
+            principal, rate, time_years, frequency = corners.pop(0)
+        else:
+            principal = float(_amounts(rng, 1, 1, 10000000)[0])
+            rate = float(_rounded(rng, rng.uniform(0, 100, 1), 3)[0])
+            time_years = float(_rounded(rng, rng.uniform(0, 100, 1), 2)[0])
+            frequency = FREQUENCIES[rng.integers(0, 3)]
+        params, error = parse_compound_interest_params({
+            'principal': principal, 'rate': rate, 'time_years': time_years, 'frequency': frequency
+        })
+        if not error:
+            samples.append(params)
+    return samples
+
+
+# name: (sampler, vectorized float calculator, Decimal calculator, fields)
+CALCULATORS = {
+    'emi': (sample_emi, emi_many, calculate_emi.uncached, EMI_FIELDS),
+    'simple_interest': (sample_simple_interest, simple_interest_many,
+                        calculate_simple_interest.uncached, INTEREST_FIELDS),
+    'compound_interest': (sample_compound_interest, _compound_interest_many,
+                          calculate_compound_interest.uncached, INTEREST_FIELDS),
+}
+
+
+def verify_fast(samples=10000, seed=0, calculators=None):
+    """
+    Compare the fast and Decimal paths over sampled inputs.
+
+    Args:
+        samples (int): Inputs drawn per calculator
+        seed (int): Random seed
+        calculators (list): Names from CALCULATORS (default: all)
+
+    Returns:
+        dict: {name: {
+            'samples': int,
+            'mismatched': int,          # inputs where any field differs
+            'max_abs_error': float,
+            'max_relative_error': float,
+            'max_bound_ratio': float,   # largest error / documented bound
+            'worst': tuple,             # inputs with the largest bound ratio
+            'within_bound': bool
+        }}
+    """
+    rng = np.random.default_rng(seed)
+    reports = {}
+    for name in calculators or CALCULATORS:
+        sample, compute_many, calculate, fields = CALCULATORS[name]
+        params = sample(rng, samples)
+        fast = [column.tolist() for column in compute_many(*zip(*params))]
+
+        mismatched = 0
+        max_abs = max_relative = max_ratio = Decimal(0)
+        worst = None
+        for index, item in enumerate(params):
+            exact = calculate(*item)
+            differs = False
+            for field, column in zip(fields, fast):
+                error = abs(Decimal(repr(column[index])) - exact[field])
+                if not error:
+                    continue
+                differs = True
+                max_abs = max(max_abs, error)
+                if exact[field]:
+                    max_relative = max(max_relative, error / abs(exact[field]))
+                bound = Decimal(str(FAST_ABSOLUTE_ERROR)) + Decimal(str(FAST_RELATIVE_ERROR)) * abs(exact[field])
+                if error / bound > max_ratio:
+                    max_ratio = error / bound
+                    worst = item
+            mismatched += differs
+
+        reports[name] = {
+            'samples': len(params),
+            'mismatched': mismatched,
+            'max_abs_error': float(max_abs),
+            'max_relative_error': float(max_relative),
+            'max_bound_ratio': float(max_ratio),
+            'worst': worst,
+            'within_bound': max_ratio <= 1
+        }
+    return reports
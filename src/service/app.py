@@ -2,13 +2,16 @@
 Service application entry point.
 Minimal Flask service with health and metrics endpoints.
 """
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from datetime import datetime, timedelta
 import time
 import os
-import math
+import numpy as np
 from src.service.database import init_db, db
 from src.service.models import User
+from src.service.calculators.registry import resolve_operation
+from src.service.calculators import annuity, exact, expression, scenarios
+from src.service.streaming import is_ndjson_request, ndjson_response
 from flask_login import LoginManager
 
 app = Flask(__name__, static_folder='../../static')
@@ -32,16 +35,52 @@ def load_user(user_id):
 
 # Register blueprints
 from src.service.auth import auth_bp
-from src.service.history import history_bp
-from src.service.calculators.financial import financial_bp
+from src.service.history import history_bp, history_queue
+from src.service.calculators.financial import financial_bp, result_cache
 app.register_blueprint(auth_bp)
 app.register_blueprint(history_bp)
 app.register_blueprint(financial_bp)
 
+# Share a memory-mapped annuity-factor table between workers (optional)
+if os.environ.get('ANNUITY_TABLE_PATH'):
+    annuity.load_table(os.environ['ANNUITY_TABLE_PATH'])
+
+# Worker processes for large /api/calculate/emi/scenarios sets (default: one per CPU)
+if os.environ.get('SCENARIO_WORKERS'):
+    scenarios.configure(int(os.environ['SCENARIO_WORKERS']))
+
+# Financial result cache bound and time-to-live in seconds (default: 4096 entries, no expiry)
+if os.environ.get('RESULT_CACHE_SIZE') or os.environ.get('RESULT_CACHE_TTL'):
+    result_cache.configure(
+        maxsize=int(os.environ['RESULT_CACHE_SIZE']) if os.environ.get('RESULT_CACHE_SIZE') else None,
+        ttl=float(os.environ['RESULT_CACHE_TTL']) if os.environ.get('RESULT_CACHE_TTL') else None
+    )
+
+# Write-behind history saves: queue bound, flush batch size and interval in
+# seconds (default: off; 10000 entries, batches of 500, every 0.5 s)
+if os.environ.get('HISTORY_WRITE_BEHIND', '').lower() in ('1', 'true', 'yes'):
+    history_queue.configure(
+        maxsize=int(os.environ['HISTORY_QUEUE_SIZE']) if os.environ.get('HISTORY_QUEUE_SIZE') else None,
+        batch_size=int(os.environ['HISTORY_FLUSH_SIZE']) if os.environ.get('HISTORY_FLUSH_SIZE') else None,
+        interval=float(os.environ['HISTORY_FLUSH_INTERVAL']) if os.environ.get('HISTORY_FLUSH_INTERVAL') else None,
+        wrap=app.app_context
+    )
+    history_queue.start()
+
 # Track service start time
 START_TIME = time.time()
 REQUEST_COUNT = 0
 
+# Upper bound on items accepted by /api/calculate/batch
+BATCH_MAX_ITEMS = 10000
+
+# Upper bound on elements in array operands to /api/calculate
+ARRAY_MAX_ITEMS = 100000
+
+# Binary /api/calculate bodies: packed little-endian float64 operand arrays
+BINARY_MIMETYPE = 'application/octet-stream'
+BINARY_MAX_BYTES = 256 * 1024 * 1024
+
 
 @app.before_request
 def count_request():
@@ -66,12 +105,37 @@ def health():
 def metrics():
     """
     Metrics endpoint.
-    Returns basic service metrics: request count and uptime.
+    Returns basic service metrics: request count, uptime, expression plan
+    cache, financial result cache and history write-behind queue statistics.
     """
     uptime = int(time.time() - START_TIME)
+    expression_cache = expression.plan_cache.stats()
+    financial_cache = result_cache.stats()
+    queue = history_queue.stats()
     return jsonify({
         'requests_total': REQUEST_COUNT,
-        'uptime_seconds': uptime
+        'uptime_seconds': uptime,
+        'expression_cache_hits': expression_cache['hits'],
+        'expression_cache_misses': expression_cache['misses'],
+        'expression_cache_size': expression_cache['size'],
+        'result_cache_hits': financial_cache['hits'],
+        'result_cache_misses': financial_cache['misses'],
+        'result_cache_hit_ratio': financial_cache['hit_ratio'],
+        'result_cache_evictions': financial_cache['evictions'],
+        'result_cache_expirations': financial_cache['expirations'],
+        'result_cache_coalesced': financial_cache['coalesced'],
+        'result_cache_size': financial_cache['size'],
+        'history_queue_enabled': queue['enabled'],
+        'history_queue_depth': queue['depth'],
+        'history_queue_capacity': queue['capacity'],
+        'history_queue_enqueued': queue['enqueued'],
+        'history_queue_rejected': queue['rejected'],
+        'history_queue_written': queue['written'],
+        'history_queue_failed': queue['failed'],
+        'history_queue_flushes': queue['flushes'],
+        'history_queue_last_flush_ms': queue['last_flush_ms'],
+        'history_queue_max_flush_ms': queue['max_flush_ms'],
+        'history_queue_avg_flush_ms': queue['avg_flush_ms']
     }), 200
 
 
@@ -84,75 +148,273 @@ def calculate():
     Request body: 
         Basic: {"operation": "add|subtract|multiply|divide", "a": number, "b": number}
         Advanced: {"operation": "factorial|power|modulo", "a": number, "b": number (if needed)}
+        Scientific: {"operation": "sin|cos|tan|sqrt|log|ln|exp", "a": number,
+                     "angle_mode": "DEG|RAD" (trig only, default DEG)}
+        Exact: {"operation": "factorial|power", "a": int, "b": int, "exact": true}
+        Arrays: "a" and/or "b" may be arrays, evaluated elementwise
     Returns: {"result": number} or {"error": "message"}
+        Exact mode: {"result": str (decimal digits), "digits": int, "exact": true},
+        streamed when the result is large
+        Arrays: {"result": [number|null, ...], "errors": [{"index": int, "error": str}]}
+    
+    NDJSON (Content-Type: application/x-ndjson): one request body per line;
+    streams one {"line": int, "result"|"error": ...} object per line.
+    
+    Binary (Content-Type: application/octet-stream): see calculate_binary().
     """
+    if is_ndjson_request():
+        return ndjson_response(calculate_record)
+    if request.mimetype == BINARY_MIMETYPE:
+        return calculate_binary()
+    
     data = request.get_json()
     
     if not data:
         return jsonify({'error': 'Request body must be JSON'}), 400
     
-    operation = data.get('operation')
-    a = data.get('a')
-    b = data.get('b')
+    operation, error = resolve_operation(data.get('operation'), data.get('angle_mode'))
+    if error:
+        return jsonify({'error': error}), 400
+    
+    if data.get('exact') is True:
+        try:
+            value = exact.evaluate_exact(operation.name, data.get('a'), data.get('b'))
+        except exact.ExactError as e:
+            return jsonify({'error': str(e)}), 400
+        return exact_response(value)
+    
+    if isinstance(data.get('a'), list) or isinstance(data.get('b'), list):
+        return calculate_array(operation, data.get('a'), data.get('b'))
+    
+    result, error = operation.evaluate(data.get('a'), data.get('b'))
+    if error:
+        return jsonify({'error': error}), 400
+    
+    return jsonify({'result': result}), 200
+
+
+def calculate_array(operation, a, b):
+    """
+    Evaluate an operation elementwise over array operands in one NumPy pass.
+    
+    A scalar operand is broadcast against an array operand. Elements that
+    fail validation get null in "result" and an entry in "errors" with the
+    same message the scalar endpoint would return.
+    
+    Args:
+        operation (Operation): Resolved operation
+        a: First operand (list or number)
+        b: Second operand (list or number; unused for unary operations)
+    
+    Returns:
+        tuple: (response, status)
+    """
+    operands = [a] if operation.arity == 1 else [a, b]
+    if any(operand is None or (isinstance(operand, list) and None in operand) for operand in operands):
+        return jsonify({'error': operation.missing_message}), 400
+    
+    try:
+        arrays = [np.asarray(operand, dtype=np.float64) for operand in operands]
+    except (ValueError, TypeError, OverflowError):
+        return jsonify({'error': operation.invalid_message}), 400
+    try:
+        arrays = np.broadcast_arrays(*arrays)
+    except ValueError:
+        return jsonify({'error': 'Array operands must have the same length'}), 400
+    if arrays[0].ndim != 1:
+        return jsonify({'error': 'Array operands must be flat lists of numbers'}), 400
+    if arrays[0].size > ARRAY_MAX_ITEMS:
+        return jsonify({'error': f'Too many elements (max {ARRAY_MAX_ITEMS})'}), 400
+    
+    values, valid = operation.compute_array(*arrays)
+    results = values.tolist()
+    errors = []
+    for index in np.flatnonzero(~valid).tolist():
+        # Recompute rejected elements on the scalar path for their message
+        result, error = operation.evaluate(*(array[index] for array in arrays))
+        results[index] = result
+        if error:
+            errors.append({'index': index, 'error': error})
+    
+    return jsonify({'result': results, 'errors': errors}), 200
+
+
+def calculate_binary():
+    """
+    Elementwise calculation over packed float64 arrays.
+    
+    Request:
+        Header X-Operation: operation name
+        Header X-Angle-Mode: DEG|RAD (optional, trig only)
+        Body: n little-endian float64 values of a, followed by n values of b
+              (b is omitted for unary operations such as factorial)
+    Returns:
+        200: n little-endian float64 results followed by n validity bytes
+             (1 = valid, 0 = rejected by validation or non-finite result;
+             invalid results are NaN). Header X-Count: n
+        400: {"error": str}
+    """
+    operation, error = resolve_operation(request.headers.get('X-Operation'),
+                                         request.headers.get('X-Angle-Mode'))
+    if error:
+        return jsonify({'error': error}), 400
+    if request.content_length is not None and request.content_length > BINARY_MAX_BYTES:
+        return jsonify({'error': f'Body too large (max {BINARY_MAX_BYTES} bytes)'}), 400
+    
+    body = request.get_data(cache=False)
+    width = 8 * operation.arity
+    if not body or len(body) % width:
+        return jsonify({'error': f'Body must hold {operation.arity} float64 array(s) of equal length'}), 400
+    
+    # Zero-copy views over the request body
+    operands = np.frombuffer(memoryview(body), dtype='<f8')
+    count = len(operands) // operation.arity
+    a = operands[:count]
+    b = operands[count:] if operation.arity == 2 else None
+    
+    values, valid = operation.compute_array(a, b)
+    
+    response = Response(
+        [values.astype('<f8', copy=False).tobytes(), valid.astype(np.uint8).tobytes()],
+        status=200,
+        mimetype=BINARY_MIMETYPE
+    )
+    response.headers['X-Count'] = str(count)
+    return response
+
+
+def calculate_record(data):
+    """
+    Compute one calculation as a result dict.
+    
+    Used for NDJSON streaming, where each line gets a result record instead
+    of its own HTTP response.
+    
+    Args:
+        data (dict): Calculate request body
     
-    # Validate operation
-    valid_operations = ['add', 'subtract', 'multiply', 'divide', 'factorial', 'power', 'modulo']
-    if operation not in valid_operations:
-        return jsonify({'error': 'Invalid operation'}), 400
+    Returns:
+        dict: {"result": ...} (plus "digits"/"exact" in exact mode) or {"error": str}
+    """
+    operation, error = resolve_operation(data.get('operation'), data.get('angle_mode'))
+    if error:
+        return {'error': error}
     
-    # Factorial only needs 'a'
-    if operation == 'factorial':
-        if a is None:
-            return jsonify({'error': 'Missing operand'}), 400
-        
+    if data.get('exact') is True:
         try:
-            a = float(a)
-        except (ValueError, TypeError):
-            return jsonify({'error': 'Operand must be a number'}), 400
-        
-        # Validate factorial constraints
-        if a < 0:
-            return jsonify({'error': 'Factorial not defined for negative numbers'}), 400
-        if a != int(a):
-            return jsonify({'error': 'Factorial requires integer input'}), 400
-        if a > 20:
-            return jsonify({'error': 'Factorial input too large (max 20)'}), 400
-        
-        result = math.factorial(int(a))
-        return jsonify({'result': result}), 200
-    
-    # All other operations need both 'a' and 'b'
-    if a is None or b is None:
-        return jsonify({'error': 'Missing operands'}), 400
+            value = exact.evaluate_exact(operation.name, data.get('a'), data.get('b'))
+        except exact.ExactError as e:
+            return {'error': str(e)}
+        text = ''.join(exact.iter_decimal(value))
+        return {'result': text, 'digits': len(text.lstrip('-')), 'exact': True}
+    
+    result, error = operation.evaluate(data.get('a'), data.get('b'))
+    return {'error': error} if error else {'result': result}
+
+
+def exact_response(value):
+    """
+    Build the response for an exact-mode result.
+    
+    Results that fit in one chunk are returned with jsonify; larger ones are
+    streamed as the same JSON document, chunk by chunk, from a generator.
+    """
+    if abs(value) < 10 ** exact.CHUNK_DIGITS:
+        text = str(value)
+        return jsonify({'result': text, 'digits': len(text.lstrip('-')), 'exact': True}), 200
+    
+    def generate():
+        digits = 0
+        yield '{"exact": true, "result": "'
+        for chunk in exact.iter_decimal(value):
+            digits += len(chunk)
+            yield chunk
+        yield f'", "digits": {digits - (value < 0)}}}'
+    
+    return Response(generate(), status=200, mimetype='application/json')
+
+
+@app.route('/api/calculate/batch', methods=['POST'])
+def calculate_batch():
+    """
+    Batch calculate endpoint.
+    Evaluates many calculations in one request. Items sharing an operation
+    are computed together in a single vectorized pass.
+    
+    Request body:
+        [{"operation": str, "a": number, "b": number}, ...]
+        or {"items": [...]} (max BATCH_MAX_ITEMS items)
+    Returns: {"results": [{"result": number} | {"error": "message"}, ...],
+              "count": int, "errors": int}
+    """
+    data = request.get_json(silent=True)
+    
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'Request body must be a non-empty JSON array of calculations'}), 400
+    if len(data) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Too many items (max {BATCH_MAX_ITEMS})'}), 400
+    
+    results = [None] * len(data)
+    groups = {}
+    
+    # Validate every item first, grouping the valid ones by operation
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            results[index] = {'error': 'Item must be a JSON object'}
+            continue
+        operation, error = resolve_operation(item.get('operation'), item.get('angle_mode'))
+        if error:
+            results[index] = {'error': error}
+            continue
+        a, b, error = operation.validate(item.get('a'), item.get('b'))
+        if error:
+            results[index] = {'error': error}
+            continue
+        indexes, a_values, b_values = groups.setdefault(operation, ([], [], []))
+        indexes.append(index)
+        a_values.append(a)
+        b_values.append(b)
+    
+    # One vectorized pass per operation
+    for operation, (indexes, a_values, b_values) in groups.items():
+        for index, (result, error) in zip(indexes, operation.compute_many(a_values, b_values)):
+            results[index] = {'error': error} if error else {'result': result}
+    
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'errors': sum(1 for item in results if 'error' in item)
+    }), 200
+
+
+@app.route('/api/evaluate', methods=['POST'])
+def evaluate():
+    """
+    Evaluate endpoint.
+    Evaluates a full infix expression in one request, e.g. "2 + 3 * 4".
+    Supports + - * / % ^ (or **), postfix ! and parentheses, with the same
+    validation rules as /api/calculate.
+    
+    Request body: {"expression": str}
+    Returns: {"result": number, "expression": str (normalized)} or {"error": "message"}
+    """
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+    
+    text = data.get('expression')
+    if not isinstance(text, str):
+        return jsonify({'error': 'expression must be a string'}), 400
     
     try:
-        a = float(a)
-        b = float(b)
-    except (ValueError, TypeError):
-        return jsonify({'error': 'Operands must be numbers'}), 400
-    
-    # Perform calculation
-    if operation == 'add':
-        result = a + b
-    elif operation == 'subtract':
-        result = a - b
-    elif operation == 'multiply':
-        result = a * b
-    elif operation == 'divide':
-        if b == 0:
-            return jsonify({'error': 'Division by zero'}), 400
-        result = a / b
-    elif operation == 'power':
-        # Validate power bounds
-        if b > 100 or b < -100:
-            return jsonify({'error': 'Exponent out of bounds (-100 to 100)'}), 400
-        result = pow(a, b)
-    elif operation == 'modulo':
-        if b == 0:
-            return jsonify({'error': 'Division by zero'}), 400
-        result = a % b
+        normalized, result = expression.evaluate(text)
+    except expression.ExpressionError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({'result': result}), 200
+    return jsonify({'result': result, 'expression': normalized}), 200
 
 
 @app.route('/', methods=['GET'])
@@ -167,7 +429,7 @@ def api_info():
     return jsonify({
         'service': 'autobots-calculator',
         'version': '0.1.0',
-        'endpoints': ['/health', '/metrics', '/api/calculate']
+        'endpoints': ['/health', '/metrics', '/api/calculate', '/api/calculate/batch', '/api/evaluate']
     }), 200
 
 
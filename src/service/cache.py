@@ -0,0 +1,220 @@
+"""
+In-process caches shared by service endpoints.
+"""
+from collections import OrderedDict
+import copy
+import functools
+import threading
+import time
+
+_MISSING = object()
+
+
+class _Flight:
+    """A computation in progress that concurrent callers wait on."""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LRUCache:
+    """
+    Thread-safe bounded mapping with least-recently-used eviction.
+
+    Entries optionally expire after a time-to-live. get_or_compute()
+    coalesces concurrent misses on the same key (single-flight): one
+    caller computes while the others wait for its result.
+
+    Tracks hits, misses, evictions, expirations and coalesced waits so
+    they can be reported by /metrics.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of entries kept in the cache
+            ttl (float or None): Seconds an entry stays valid, or None to
+                keep entries until evicted
+            clock (callable): Time source for the TTL, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self._data = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        """Find a live entry and mark it most recently used (lock held)."""
+        try:
+            value, expires = self._data[key]
+        except KeyError:
+            return _MISSING
+        if expires is not None and self._clock() >= expires:
+            del self._data[key]
+            self.expirations += 1
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        """
+        Look up a key, marking it as most recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value, or default if the key is not cached or expired
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            expires = None if self.ttl is None else self._clock() + self.ttl
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing it on a miss.
+
+        Concurrent misses on the same key are coalesced: the first caller
+        runs compute() and caches the result; the others wait and receive
+        the same result (or the same exception). Failures are not cached.
+
+        Args:
+            key: Cache key
+            compute (callable): Produces the value, called without arguments
+
+        Returns:
+            The cached or computed value
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.put(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def configure(self, maxsize=None, ttl=_MISSING):
+        """
+        Change the size bound and/or TTL; clears the cache.
+
+        Args:
+            maxsize (int): New maximum number of entries (unchanged if None)
+            ttl (float or None): New time-to-live (unchanged if omitted)
+        """
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not _MISSING:
+                self.ttl = ttl
+        self.clear()
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.coalesced = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """
+        Returns:
+            dict: {'hits': int, 'misses': int, 'hit_ratio': float,
+            'evictions': int, 'expirations': int, 'coalesced': int,
+            'size': int, 'maxsize': int}. Coalesced waits count as hits
+            in hit_ratio, since they skip a computation.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'coalesced': self.coalesced,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+
+def cached(cache, key):
+    """
+    Decorator caching a function's results in an LRUCache, single-flight.
+
+    Results are shallow-copied on the way out, so callers may modify the
+    returned dict without affecting the cache. The undecorated function is
+    available as .uncached.
+
+    Args:
+        cache (LRUCache): Cache to store results in (may be shared; keys
+            are prefixed with the function name)
+        key (callable): Maps the call's arguments to a hashable key
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            cache_key = (function.__name__,) + key(*args, **kwargs)
+            return copy.copy(cache.get_or_compute(cache_key, lambda: function(*args, **kwargs)))
+        wrapper.uncached = function
+        return wrapper
+    return decorator
@@ -0,0 +1,8 @@
+"""
+Calculator modules.
+
+Operation modules register themselves in the operation registry on
+import, and financial feature modules add their routes to financial_bp;
+importing the package loads all of them.
+"""
+from src.service.calculators import arithmetic, scientific, amortization, emi_grid, interest, solvers, scenarios, floating, montecarlo, cashflow, sip  # noqa: F401
@@ -0,0 +1,168 @@
+"""
+Annuity-factor cache for calculate_emi().
+
+calculate_emi() needs the monthly rate r, (1+r)^n and (1+r)^n - 1 for the
+requested (rate, months). The valid domain is small (0-30% at 0.01
+granularity, 1-30 years), so these Decimals are computed once per key and
+reused. Values are produced by exactly the same Decimal operations as a
+direct computation, so EMI results are bit-identical with or without the
+cache.
+
+Factors are cached lazily in-process. Optionally, the (1+r)^n values for
+the whole 0.01% x 1-30 year grid can be persisted to a fixed-width file
+that every worker memory-maps (ANNUITY_TABLE_PATH), so workers share one
+copy instead of each warming its own cache. Rates off the grid, or
+tenures beyond 30 years, fall back to direct computation.
+"""
+import mmap
+import os
+import tempfile
+from decimal import Decimal
+
+# Table grid: rates 0.00% - 30.00% in 0.01% steps, tenures 1 - 30 years
+TABLE_RATE_STEPS = 3001
+TABLE_YEARS = 30
+
+# Each record is (1+r)^n as ASCII, space padded (28 significant digits
+# need at most 30 characters in this domain)
+RECORD_BYTES = 32
+TABLE_HEADER = f'annuity-factors v1 {TABLE_RATE_STEPS}x{TABLE_YEARS}'.encode().ljust(RECORD_BYTES)
+
+# In-process cache bound; covers the whole grid, and stops arbitrary
+# off-grid rates from growing the cache without limit
+MAX_CACHED_FACTORS = 100000
+
+_factors = {}
+_table = None
+
+
+def _monthly_rate(rate_text):
+    return Decimal(rate_text) / Decimal('12') / Decimal('100')
+
+
+def compute_factors(rate_text, months):
+    """
+    Compute annuity factors directly.
+
+    Args:
+        rate_text (str): Annual rate as str(annual_rate)
+        months (int): Number of monthly payments
+
+    Returns:
+        tuple: (r, (1+r)^n, (1+r)^n - 1) as Decimals
+    """
+    r = _monthly_rate(rate_text)
+    one_plus_r_power_n = (Decimal('1') + r) ** months
+    return r, one_plus_r_power_n, one_plus_r_power_n - Decimal('1')
+
+
+def _table_index(rate_text, months):
+    """Record index of (rate, months) in the table, or None if off the grid."""
+    if months % 12 or not 12 <= months <= TABLE_YEARS * 12:
+        return None
+    try:
+        hundredths = round(float(rate_text) * 100)
+    except ValueError:
+        return None
+    # Only rates whose text is exactly how the table spells them
+    if not 0 <= hundredths < TABLE_RATE_STEPS or str(hundredths / 100) != rate_text:
+        return None
+    return 1 + hundredths * TABLE_YEARS + months // 12 - 1
+
+
+def annuity_factors(annual_rate, months):
+    """
+    Get (r, (1+r)^n, (1+r)^n - 1) for an annual rate and number of months.
+
+    Looks in the in-process cache, then the memory-mapped table (if
+    loaded), and computes directly otherwise.
+
+    Args:
+        annual_rate (float): Annual interest rate (percentage)
+        months (int): Number of monthly payments
+
+    Returns:
+        tuple: (r, (1+r)^n, (1+r)^n - 1) as Decimals
+    """
+    rate_text = str(annual_rate)
+    key = (rate_text, months)
+    factors = _factors.get(key)
+    if factors is not None:
+        return factors
+
+    index = _table_index(rate_text, months) if _table is not None else None
+    if index is not None:
+        offset = index * RECORD_BYTES
+        one_plus_r_power_n = Decimal(_table[offset:offset + RECORD_BYTES].decode('ascii').strip())
+        factors = (_monthly_rate(rate_text), one_plus_r_power_n, one_plus_r_power_n - Decimal('1'))
+    else:
+        factors = compute_factors(rate_text, months)
+
+    if len(_factors) < MAX_CACHED_FACTORS:
+        _factors[key] = factors
+    return factors
+
+
+def build_table(path):
+    """
+    Write the full (1+r)^n table to path.
+
+    The file is written to a temporary name and renamed into place, so
+    workers building it concurrently never see a partial table.
+
+    Args:
+        path (str): Destination file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.annuity-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(TABLE_HEADER)
+            for hundredths in range(TABLE_RATE_STEPS):
+                rate_text = str(hundredths / 100)
+                for years in range(1, TABLE_YEARS + 1):
+                    _, one_plus_r_power_n, _ = compute_factors(rate_text, years * 12)
+                    f.write(str(one_plus_r_power_n).encode('ascii').ljust(RECORD_BYTES))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_table(path):
+    """
+    Memory-map the table at path, building it first if missing or stale.
+
+    Args:
+        path (str): Table file (shared by all workers)
+    """
+    global _table
+    expected_size = (1 + TABLE_RATE_STEPS * TABLE_YEARS) * RECORD_BYTES
+    for attempt in range(2):
+        if os.path.exists(path) and os.path.getsize(path) == expected_size:
+            with open(path, 'rb') as f:
+                table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if table[:RECORD_BYTES] == TABLE_HEADER:
+                _table = table
+                return
+            table.close()
+        if attempt == 0:
+            build_table(path)
+    raise ValueError(f'Invalid annuity table: {path}')
+
+
+def clear():
+    """Drop cached factors and unmap the table."""
+    global _table
+    _factors.clear()
+    if _table is not None:
+        _table.close()
+        _table = None
+
+
+def stats():
+    """Return cache statistics."""
+    return {
+        'cached_factors': len(_factors),
+        'table_loaded': _table is not None
+    }
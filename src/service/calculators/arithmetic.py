@@ -0,0 +1,35 @@
+"""
+Basic and advanced arithmetic operations for the calculate endpoints.
+
+Importing this module registers add, subtract, multiply, divide, power,
+modulo and factorial in the operation registry.
+"""
+import math
+import operator
+import numpy as np
+from src.service.calculators.registry import Operation, register
+
+# 0! .. 20! - the full domain allowed by the factorial bound
+FACTORIALS = tuple(math.factorial(i) for i in range(21))
+_FACTORIAL_TABLE = np.array(FACTORIALS, dtype=np.int64)
+
+_DIVISION_BY_ZERO = (lambda a, b: b == 0, 'Division by zero')
+
+register(Operation('add', 2, operator.add, np.add))
+register(Operation('subtract', 2, operator.sub, np.subtract))
+register(Operation('multiply', 2, operator.mul, np.multiply))
+register(Operation('divide', 2, operator.truediv, np.divide, rules=[_DIVISION_BY_ZERO]))
+register(Operation('modulo', 2, operator.mod, np.mod, rules=[_DIVISION_BY_ZERO]))
+register(Operation('power', 2, operator.pow, np.power, rules=[
+    (lambda a, b: abs(b) > 100, 'Exponent out of bounds (-100 to 100)'),
+]))
+register(Operation(
+    'factorial', 1,
+    lambda a: FACTORIALS[int(a)],
+    lambda a: _FACTORIAL_TABLE[a.astype(np.int64)],
+    rules=[
+        (lambda a, b: a < 0, 'Factorial not defined for negative numbers'),
+        (lambda a, b: a % 1 != 0, 'Factorial requires integer input'),
+        (lambda a, b: a > 20, 'Factorial input too large (max 20)'),
+    ]
+))
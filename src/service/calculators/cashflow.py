@@ -0,0 +1,392 @@
+"""
+Cash-flow calculators: NPV, IRR and XIRR over arbitrary flow arrays.
+
+The first flow is at time 0. NPV and IRR use whole periods (flow t is
+discounted by (1 + rate)^t); with "dates", NPV and XIRR use years of 365
+days since the first date, as spreadsheets do. Rates are percentages.
+
+Portfolios are evaluated together: the flows of every portfolio in a
+request are concatenated into one flat array and per-portfolio sums are
+taken with np.add.reduceat, so there is no per-flow Python loop at any
+size.
+
+IRR has no closed form. Each portfolio's root is first bracketed by
+scanning NPV signs on a fixed rate grid (preferring brackets closest to
+0%), then refined with a vectorized Newton iteration that falls back to
+bisection whenever a step leaves the bracket. Discount factors are
+evaluated as (1 + r)^(s - t), with s the last flow time when r < 0 and
+0 otherwise, so they never exceed 1; this scales NPV by a positive
+factor, which keeps its sign and root. Flows with several sign changes
+can have several IRRs; the one in the bracket nearest 0% is returned.
+"""
+import numpy as np
+from flask import jsonify, request
+from src.service.calculators.financial import financial_bp
+
+# Largest number of flows per request (all portfolios together)
+MAX_FLOWS = 100000
+
+# Largest number of portfolios per batch request
+BATCH_MAX_ITEMS = 10000
+
+# Root finder settings: iteration cap and relative step tolerance
+MAX_ITERATIONS = 100
+RATE_TOLERANCE = 1e-12
+
+# IRR bracket scan: rate grid (fractions), finer where rates usually are,
+# and its adjacent pairs in the order they are tried, nearest to 0% first
+_GRID = np.array([-0.999999, -0.99, -0.9, -0.5, -0.2, -0.1, 0.0, 0.05, 0.1, 0.2, 0.5,
+                  1.0, 10.0, 100.0, 1000.0, 10000.0])
+_PAIRS = np.array(sorted(((i, i + 1) for i in range(len(_GRID) - 1)),
+                         key=lambda pair: sorted(abs(_GRID[list(pair)]))))
+
+DAYS_PER_YEAR = 365
+
+
+def _owners(lengths):
+    """Portfolio index of every flow, and the offset where each portfolio starts."""
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    return np.repeat(np.arange(len(lengths)), lengths), starts
+
+
+def npv_many(rates, flows, times, lengths):
+    """
+    Net present value of many portfolios.
+
+    Args:
+        rates (numpy.ndarray): Discount rate per portfolio (fraction)
+        flows (numpy.ndarray): All flows, concatenated portfolio by portfolio
+        times (numpy.ndarray): Time of each flow (periods or years)
+        lengths (numpy.ndarray): Number of flows per portfolio
+
+    Returns:
+        numpy.ndarray: NPV per portfolio
+    """
+    owner, starts = _owners(lengths)
+    with np.errstate(over='ignore', invalid='ignore'):
+        factors = np.exp(-times * np.log1p(np.asarray(rates, dtype=np.float64))[owner])
+        return np.add.reduceat(flows * factors, starts)
+
+
+def _scaled_npv(r, flows, times, owner, starts, last_times):
+    """NPV scaled by (1 + r)^s, and its derivative, per portfolio."""
+    shift = np.where(r < 0, last_times, 0.0)
+    exponent = shift[owner] - times
+    values = flows * np.exp(exponent * np.log1p(r)[owner])
+    value = np.add.reduceat(values, starts)
+    derivative = np.add.reduceat(values * exponent, starts) / (1 + r)
+    return value, derivative
+
+
+def irr_many(flows, times, lengths):
+    """
+    Internal rate of return of many portfolios.
+
+    Args:
+        flows (numpy.ndarray): All flows, concatenated portfolio by portfolio
+        times (numpy.ndarray): Time of each flow (periods or years)
+        lengths (numpy.ndarray): Number of flows per portfolio
+
+    Returns:
+        dict: {
+            'rate': numpy.ndarray,        # fraction; NaN where no root was bracketed
+            'iterations': numpy.ndarray,  # root finder steps per portfolio
+            'converged': numpy.ndarray    # bool
+        }
+    """
+    owner, starts = _owners(lengths)
+    last_times = np.maximum.reduceat(times, starts)
+    size = len(lengths)
+
+    # Bracket: NPV signs on the grid, first pair (nearest 0%) with a sign change
+    signs = np.array([
+        np.sign(_scaled_npv(np.full(size, point), flows, times, owner, starts, last_times)[0])
+        for point in _GRID
+    ])
+    changes = signs[_PAIRS[:, 0]] * signs[_PAIRS[:, 1]] <= 0
+    bracketed = changes.any(axis=0)
+    pair = _PAIRS[changes.argmax(axis=0)]
+    lo = _GRID[pair[:, 0]]
+    hi = _GRID[pair[:, 1]]
+    sign_lo = signs[pair[:, 0], np.arange(size)]
+    sign_hi = signs[pair[:, 1], np.arange(size)]
+
+    # Start mid-bracket, or at a grid point that is already a root
+    rate = np.where(sign_lo == 0, lo, np.where(sign_hi == 0, hi, (lo + hi) / 2))
+    iterations = np.zeros(size, dtype=np.int64)
+    converged = ~bracketed | (sign_lo == 0) | (sign_hi == 0)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(MAX_ITERATIONS):
+            active = ~converged
+            if not active.any():
+                break
+            value, derivative = _scaled_npv(rate, flows, times, owner, starts, last_times)
+            below = np.sign(value) == sign_lo
+            lo = np.where(active & below, rate, lo)
+            hi = np.where(active & ~below, rate, hi)
+
+            step = rate - value / derivative
+            outside = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+            new_rate = np.where(outside, (lo + hi) / 2, step)
+            done = (value == 0) | (np.abs(new_rate - rate) <= RATE_TOLERANCE * (1 + np.abs(rate)))
+            rate = np.where(active & (value != 0), new_rate, rate)
+            iterations += active
+            converged |= active & done
+
+    converged &= bracketed
+    return {
+        'rate': np.where(bracketed, rate, np.nan),
+        'iterations': iterations,
+        'converged': converged
+    }
+
+
+def parse_cash_flows(data, kind):
+    """
+    Extract and validate one portfolio from a request body.
+
+    Args:
+        data (dict): {"cash_flows": [...], "rate": float (npv),
+            "dates": ["YYYY-MM-DD", ...] (xirr; optional for npv)}
+        kind (str): 'npv', 'irr' or 'xirr'
+
+    Returns:
+        tuple: ((rate, flows, times), error) - rate as a fraction (None
+        unless kind is 'npv'), float64 flows and flow times, or None and
+        an error message
+    """
+    flows = data.get('cash_flows')
+    if flows is None:
+        return None, 'cash_flows is required'
+    if not isinstance(flows, list) or not flows:
+        return None, 'cash_flows must be a non-empty list of numbers'
+    if len(flows) > MAX_FLOWS:
+        return None, f'Too many cash flows (max {MAX_FLOWS})'
+    try:
+        flows = np.asarray(flows, dtype=np.float64)
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+    if flows.ndim != 1:
+        return None, 'cash_flows must be a non-empty list of numbers'
+    if not np.isfinite(flows).all():
+        return None, 'cash_flows must be finite numbers'
+
+    rate = None
+    if kind == 'npv':
+        rate = data.get('rate')
+        if rate is None:
+            return None, 'rate is required'
+        try:
+            rate = float(rate) / 100
+        except (ValueError, TypeError, OverflowError):
+            return None, 'Invalid parameter types'
+        if not rate > -1:
+            return None, 'Rate must be greater than -100%'
+
+    dates = data.get('dates')
+    if kind == 'xirr' and dates is None:
+        return None, 'dates is required'
+    if dates is None:
+        times = np.arange(len(flows), dtype=np.float64)
+    else:
+        if not isinstance(dates, list) or len(dates) != len(flows):
+            return None, 'dates and cash_flows must have the same length'
+        try:
+            days = np.asarray(dates, dtype='datetime64[D]')
+        except (ValueError, TypeError):
+            return None, 'Invalid date format (use YYYY-MM-DD)'
+        if np.isnat(days).any():
+            return None, 'Invalid date format (use YYYY-MM-DD)'
+        times = (days - days[0]).astype(np.float64) / DAYS_PER_YEAR
+        if (times < 0).any():
+            return None, 'dates must not be earlier than the first date'
+
+    if kind != 'npv' and not ((flows > 0).any() and (flows < 0).any()):
+        return None, 'cash_flows must contain at least one positive and one negative value'
+
+    return (rate, flows, times), None
+
+
+def evaluate_portfolios(kind, portfolios):
+    """
+    Evaluate parsed portfolios in one vectorized pass.
+
+    Args:
+        kind (str): 'npv', 'irr' or 'xirr'
+        portfolios (list): (rate, flows, times) tuples from parse_cash_flows()
+
+    Returns:
+        list: One result dict per portfolio
+    """
+    lengths = np.array([len(flows) for _, flows, _ in portfolios])
+    flows = np.concatenate([flows for _, flows, _ in portfolios])
+    times = np.concatenate([times for _, _, times in portfolios])
+
+    if kind == 'npv':
+        rates = np.array([rate for rate, _, _ in portfolios])
+        return [
+            {'npv': value} if np.isfinite(value) else {'error': 'NPV is too large to represent'}
+            for value in npv_many(rates, flows, times, lengths).tolist()
+        ]
+
+    solved = irr_many(flows, times, lengths)
+    results = []
+    for rate, iterations, converged in zip(solved['rate'].tolist(), solved['iterations'].tolist(),
+                                           solved['converged'].tolist()):
+        if np.isnan(rate):
+            results.append({'error': 'No IRR found: NPV does not change sign'})
+        else:
+            results.append({kind: rate * 100, 'iterations': iterations, 'converged': converged})
+    return results
+
+
+def _total_flows(data):
+    return sum(len(item['cash_flows']) for item in data
+               if isinstance(item, dict) and isinstance(item.get('cash_flows'), list))
+
+
+def _cash_flow_endpoint(kind):
+    """Shared body of the single-portfolio endpoints."""
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    portfolio, error = parse_cash_flows(data, kind)
+    if error:
+        return jsonify({'error': error}), 400
+
+    result = evaluate_portfolios(kind, [portfolio])[0]
+    if 'error' in result:
+        return jsonify(result), 400
+
+    return jsonify(result), 200
+
+
+def _cash_flow_batch(kind):
+    """Shared body of the batch endpoints: validate every item, then evaluate the valid ones together."""
+    data = request.get_json(silent=True)
+
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'Request body must be a non-empty JSON array of items'}), 400
+    if len(data) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Too many items (max {BATCH_MAX_ITEMS})'}), 400
+    if _total_flows(data) > MAX_FLOWS:
+        return jsonify({'error': f'Too many cash flows (max {MAX_FLOWS})'}), 400
+
+    results = [None] * len(data)
+    indexes = []
+    portfolios = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            results[index] = {'error': 'Item must be a JSON object'}
+            continue
+        portfolio, error = parse_cash_flows(item, kind)
+        if error:
+            results[index] = {'error': error}
+            continue
+        indexes.append(index)
+        portfolios.append(portfolio)
+
+    if portfolios:
+        for index, result in zip(indexes, evaluate_portfolios(kind, portfolios)):
+            results[index] = result
+
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'errors': sum(1 for item in results if 'error' in item)
+    }), 200
+
+
+@financial_bp.route('/npv', methods=['POST'])
+def npv_calculator():
+    """
+    Net present value endpoint.
+
+    Request body:
+        {
+            "rate": float (> -100),  # discount rate per period, or per year with dates
+            "cash_flows": [float, ...],  # first flow at time 0
+            "dates": ["YYYY-MM-DD", ...]  # optional, one per flow (XNPV)
+        }
+
+    Returns:
+        200: {"npv": float}
+        400: {"error": str} - validation error
+    """
+    return _cash_flow_endpoint('npv')
+
+
+@financial_bp.route('/irr', methods=['POST'])
+def irr_calculator():
+    """
+    Internal rate of return endpoint (per period).
+
+    Request body:
+        {"cash_flows": [float, ...]}  # at least one positive and one negative
+
+    Returns:
+        200: {"irr": float (percent), "iterations": int, "converged": bool}
+        400: {"error": str} - validation error, or no IRR found
+    """
+    return _cash_flow_endpoint('irr')
+
+
+@financial_bp.route('/xirr', methods=['POST'])
+def xirr_calculator():
+    """
+    Annual internal rate of return for dated cash flows.
+
+    Request body:
+        {
+            "cash_flows": [float, ...],
+            "dates": ["YYYY-MM-DD", ...]  # none earlier than the first
+        }
+
+    Returns:
+        200: {"xirr": float (percent), "iterations": int, "converged": bool}
+        400: {"error": str} - validation error, or no XIRR found
+    """
+    return _cash_flow_endpoint('xirr')
+
+
+@financial_bp.route('/npv/batch', methods=['POST'])
+def npv_batch():
+    """
+    Batch NPV: a list of /npv bodies, or {"items": [...]} (max 10,000
+    items and 100,000 flows in all).
+
+    Returns:
+        200: {"results": [{"npv"} | {"error"}], "count": int, "errors": int}
+        400: {"error": str} - malformed batch
+    """
+    return _cash_flow_batch('npv')
+
+
+@financial_bp.route('/irr/batch', methods=['POST'])
+def irr_batch():
+    """
+    Batch IRR, solved for all portfolios together.
+
+    Returns:
+        200: {"results": [{"irr", "iterations", "converged"} | {"error"}],
+              "count": int, "errors": int}
+        400: {"error": str} - malformed batch
+    """
+    return _cash_flow_batch('irr')
+
+
+@financial_bp.route('/xirr/batch', methods=['POST'])
+def xirr_batch():
+    """
+    Batch XIRR, solved for all portfolios together.
+
+    Returns:
+        200: {"results": [{"xirr", "iterations", "converged"} | {"error"}],
+              "count": int, "errors": int}
+        400: {"error": str} - malformed batch
+    """
+    return _cash_flow_batch('xirr')
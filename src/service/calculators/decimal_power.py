@@ -0,0 +1,135 @@
+"""
+Decimal powers with controlled precision, for compound growth.
+
+Decimal's x ** y with a non-integer y runs a general exp/ln at the full
+context precision and is an order of magnitude slower than an integer
+power. compound_growth() instead splits the exponent into its integer
+and fractional parts:
+
+    scale * base ** (k + f) = scale * base ** k * exp(f * ln(base))
+
+The integer part uses Decimal's integer power (binary exponentiation);
+only the fractional part needs exp/ln, which runs at the precision the
+answer actually needs - its integer digits, plus the decimal places
+requested, plus guard digits - so results stay correct to the cent.
+
+Results may have at most MAX_RESULT_DIGITS integer digits. For
+fractional exponents a cost guard estimates the size from float
+logarithms before any exp/ln work; integer powers are cheap at any size,
+so they are computed at the largest working precision and checked after.
+"""
+import math
+from decimal import Context, Decimal, Overflow
+from functools import lru_cache
+
+# Largest result accepted, in integer digits (just under 10^15)
+MAX_RESULT_DIGITS = 15
+
+# Extra significant digits carried beyond the requested decimal places
+GUARD_DIGITS = 12
+
+_ZERO = Decimal('0')
+
+
+class PowerError(ValueError):
+    """Raised when a power is invalid or its result is over budget."""
+
+
+def result_digits(scale, base, exponent):
+    """
+    Estimate the integer digits of scale * base ** exponent.
+
+    Uses float logarithms, so it costs nothing even for huge exponents.
+
+    Args:
+        scale: Non-negative multiplier (e.g. the principal)
+        base: Positive base
+        exponent: Non-negative exponent
+
+    Returns:
+        int: Estimated digit count before the decimal point (at least 1)
+    """
+    if not scale:
+        return 1
+    magnitude = math.log10(scale) + float(exponent) * math.log10(base)
+    return max(math.floor(magnitude) + 1, 1)
+
+
+def check_power_cost(scale, base, exponent):
+    """
+    Validate the operands of compound_growth() and apply the cost guard.
+
+    Returns:
+        int: Estimated integer digits of the result
+
+    Raises:
+        PowerError: If an operand is out of domain or the result would
+        exceed MAX_RESULT_DIGITS
+    """
+    _check_operands(scale, base, exponent)
+    digits = result_digits(scale, base, exponent)
+    if digits > MAX_RESULT_DIGITS:
+        raise PowerError(f'Result too large (max {MAX_RESULT_DIGITS} digits)')
+    return digits
+
+
+def _check_operands(scale, base, exponent):
+    if base <= _ZERO:
+        raise PowerError('Base must be positive')
+    if scale < _ZERO:
+        raise PowerError('Scale must be non-negative')
+    if exponent < _ZERO:
+        raise PowerError('Exponent must be non-negative')
+
+
+@lru_cache(maxsize=None)
+def _context(precision):
+    """Arithmetic context for a working precision (one per precision)."""
+    return Context(prec=precision)
+
+
+@lru_cache(maxsize=4096)
+def _ln(base, precision):
+    """Natural log of base at a given precision (bases repeat across requests)."""
+    return _context(precision).ln(base)
+
+
+def compound_growth(scale, base, exponent, places=2):
+    """
+    Compute scale * base ** exponent to a given number of decimal places.
+
+    Args:
+        scale (Decimal): Non-negative multiplier (e.g. the principal)
+        base (Decimal): Positive base (e.g. 1 + rate per period)
+        exponent (Decimal): Non-negative exponent (e.g. number of periods)
+        places (int): Decimal places the result must be correct to
+
+    Returns:
+        Decimal: The result at working precision; quantizing it to
+        `places` gives the correctly rounded answer
+
+    Raises:
+        PowerError: If the operands are invalid or the result is too large
+    """
+    whole = int(exponent)
+    fraction = exponent - whole
+
+    if not fraction:
+        # An integer power is only O(log k) multiplications, so compute it
+        # at the largest working precision and check the size afterwards
+        _check_operands(scale, base, exponent)
+        ctx = _context(MAX_RESULT_DIGITS + places + GUARD_DIGITS)
+        try:
+            result = ctx.multiply(scale, ctx.power(base, whole))
+        except Overflow:
+            result = None
+        if result is None or result.adjusted() >= MAX_RESULT_DIGITS:
+            raise PowerError(f'Result too large (max {MAX_RESULT_DIGITS} digits)')
+        return result
+
+    digits = check_power_cost(scale, base, exponent)
+    precision = digits + places + GUARD_DIGITS
+    ctx = _context(precision)
+
+    result = ctx.multiply(scale, ctx.power(base, whole))
+    return ctx.multiply(result, ctx.exp(ctx.multiply(fraction, _ln(base, precision))))
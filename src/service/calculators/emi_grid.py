@@ -0,0 +1,199 @@
+"""
+What-if EMI grids: every combination of loan amounts, rates and tenures.
+
+The whole amount x rate x tenure cube is computed in one pass with NumPy
+broadcasting instead of one calculate_emi() call per cell. Float results
+are rounded half up to the cent like calculate_emi(); the optional
+verified mode recomputes every cell with calculate_emi() in Decimal and
+reports the largest deviation.
+"""
+import math
+import numpy as np
+from decimal import Decimal
+from flask import jsonify, request
+from src.service.calculators.financial import financial_bp, calculate_emi, check_emi_ranges, round_cents
+
+# Largest grid accepted, in cells
+MAX_GRID_CELLS = 100000
+
+# Largest grid accepted with "verify": true (Decimal is ~1000x slower)
+MAX_VERIFY_CELLS = 10000
+
+GRID_FIELDS = ('emi', 'total_interest', 'total_payment')
+
+
+def parse_axis(name, value):
+    """
+    Expand one grid axis from a request value.
+
+    Accepts a single number, a list of numbers, or an inclusive range
+    {"start": x, "stop": y, "step": z}.
+
+    Args:
+        name (str): Parameter name, used in error messages
+        value: Axis value as received in the request
+
+    Returns:
+        tuple: (values, error) - list of floats, or None and an error message
+    """
+    if value is None:
+        return None, f'{name} is required'
+
+    if isinstance(value, dict):
+        try:
+            start = float(value['start'])
+            stop = float(value['stop'])
+            step = float(value.get('step', 1))
+        except (KeyError, ValueError, TypeError, OverflowError):
+            return None, f'{name} range requires numeric start and stop (and optional step)'
+        if not all(math.isfinite(bound) for bound in (start, stop, step)):
+            return None, f'{name} must be finite numbers'
+        if not step > 0 or stop < start:
+            return None, f'{name} range requires step > 0 and stop >= start'
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        if count > MAX_GRID_CELLS:
+            return None, f'Grid too large (max {MAX_GRID_CELLS} cells)'
+        # Rounding keeps steps like 0.1 from drifting (0.30000000000000004)
+        return [round(start + step * i, 10) for i in range(count)], None
+
+    values = value if isinstance(value, list) else [value]
+    if not values:
+        return None, f'{name} must not be empty'
+    try:
+        values = [float(item) for item in values]
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+    if not all(math.isfinite(item) for item in values):
+        return None, f'{name} must be finite numbers'
+    return values, None
+
+
+def emi_grid(loan_amounts, annual_rates, tenures):
+    """
+    Compute EMI, total interest and total payment for every combination.
+
+    Args:
+        loan_amounts (list): Loan principal amounts
+        annual_rates (list): Annual interest rates (percentage)
+        tenures (list): Loan tenures in years (ints)
+
+    Returns:
+        dict: {'emi', 'total_interest', 'total_payment'} - float64 arrays
+        of shape (len(loan_amounts), len(annual_rates), len(tenures)),
+        rounded half up to the cent
+    """
+    P = np.asarray(loan_amounts, dtype=np.float64)[:, None, None]
+    r = np.asarray(annual_rates, dtype=np.float64)[None, :, None] / 12 / 100
+    n = np.asarray(tenures, dtype=np.float64)[None, None, :] * 12
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.power(1 + r, n)
+        emi = np.where(r == 0, P / n, P * r * growth / (growth - 1))
+    # Zero-rate loans repay exactly the principal, as in calculate_emi()
+    total_payment = np.where(r == 0, P, emi * n)
+    total_interest = total_payment - P
+
+    return {
+        'emi': round_cents(emi),
+        'total_interest': round_cents(total_interest),
+        'total_payment': round_cents(total_payment)
+    }
+
+
+def max_deviation(grid, loan_amounts, annual_rates, tenures):
+    """
+    Largest absolute difference between a float grid and calculate_emi().
+
+    Args:
+        grid (dict): Output of emi_grid()
+        loan_amounts, annual_rates, tenures (list): The grid axes
+
+    Returns:
+        tuple: (deviation, mismatched_cells) - deviation as a float, and
+        the number of cells where any field differs
+    """
+    deviation = Decimal('0')
+    mismatched = 0
+    for i, loan_amount in enumerate(loan_amounts):
+        for j, annual_rate in enumerate(annual_rates):
+            for k, tenure_years in enumerate(tenures):
+                # Uncached: one request must not flood the shared result cache
+                exact = calculate_emi.uncached(loan_amount, annual_rate, tenure_years)
+                cell = max(
+                    abs(Decimal(repr(float(grid[field][i, j, k]))) - exact[field])
+                    for field in GRID_FIELDS
+                )
+                if cell:
+                    mismatched += 1
+                    deviation = max(deviation, cell)
+    return float(deviation), mismatched
+
+
+@financial_bp.route('/emi/grid', methods=['POST'])
+def emi_grid_calculator():
+    """
+    What-if EMI grid endpoint.
+
+    Request body:
+        {
+            "loan_amount": number | [number, ...] | {"start", "stop", "step"},
+            "annual_rate": number | [number, ...] | {"start", "stop", "step"},
+            "tenure_years": number | [number, ...] | {"start", "stop", "step"},
+            "verify": bool (optional, default false)
+        }
+        Every value must be within the /api/calculate/emi ranges.
+
+    Returns:
+        200: {
+            "loan_amount": [...], "annual_rate": [...], "tenure_years": [...],
+            "emi": [[[...]]], "total_interest": [[[...]]], "total_payment": [[[...]]],
+            "cells": int,
+            "max_deviation": float, "mismatched_cells": int   (verify only)
+        }
+        Result cubes are indexed [loan_amount][annual_rate][tenure_years].
+        400: {"error": str} - validation error
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    axes = []
+    for name in ('loan_amount', 'annual_rate', 'tenure_years'):
+        values, error = parse_axis(name, data.get(name))
+        if error:
+            return jsonify({'error': error}), 400
+        axes.append(values)
+    loan_amounts, annual_rates, tenures = axes
+    tenures = [int(value) for value in tenures]
+
+    # Ranges are independent per axis, so the extremes decide validity
+    error = (check_emi_ranges(min(loan_amounts), min(annual_rates), min(tenures)) or
+             check_emi_ranges(max(loan_amounts), max(annual_rates), max(tenures)))
+    if error:
+        return jsonify({'error': error}), 400
+
+    cells = len(loan_amounts) * len(annual_rates) * len(tenures)
+    if cells > MAX_GRID_CELLS:
+        return jsonify({'error': f'Grid too large (max {MAX_GRID_CELLS} cells)'}), 400
+
+    verify = data.get('verify', False) is True
+    if verify and cells > MAX_VERIFY_CELLS:
+        return jsonify({'error': f'Verified grid too large (max {MAX_VERIFY_CELLS} cells)'}), 400
+
+    grid = emi_grid(loan_amounts, annual_rates, tenures)
+
+    response = {
+        'loan_amount': loan_amounts,
+        'annual_rate': annual_rates,
+        'tenure_years': tenures,
+        'cells': cells
+    }
+    for field in GRID_FIELDS:
+        response[field] = grid[field].tolist()
+    if verify:
+        response['max_deviation'], response['mismatched_cells'] = max_deviation(
+            grid, loan_amounts, annual_rates, tenures
+        )
+
+    return jsonify(response), 200
@@ -0,0 +1,214 @@
+"""
+Exact integer arithmetic for factorial and power ("exact": true).
+
+Results are Python ints of arbitrary size, so the float limits of the
+default mode (factorial <= 20, exponent within +-100) do not apply.
+Instead every request has a result-size budget: the number of decimal
+digits is estimated before computing, and requests that would exceed
+MAX_EXACT_DIGITS are rejected without doing the work.
+
+Large results are converted to decimal text by divide and conquer in
+fixed-size chunks, which is subquadratic and lets the endpoint stream
+the digits instead of building one huge string.
+"""
+import math
+from functools import lru_cache
+
+# Largest result accepted in exact mode, in decimal digits (about 25000!)
+MAX_EXACT_DIGITS = 100000
+
+# Digits per streamed chunk; must stay below Python's int/str conversion
+# limit (sys.get_int_max_str_digits(), 4300 by default)
+CHUNK_DIGITS = 2048
+
+# Memoized n! for small n, filled once at import
+SMALL_FACTORIAL_LIMIT = 256
+SMALL_FACTORIALS = [1] * (SMALL_FACTORIAL_LIMIT + 1)
+for _n in range(2, SMALL_FACTORIAL_LIMIT + 1):
+    SMALL_FACTORIALS[_n] = SMALL_FACTORIALS[_n - 1] * _n
+
+_LOG10_2 = math.log10(2)
+
+# Digit estimates above this are reported as math.inf: far over budget, and
+# the operands may not even convert to float (n! has over 1e15 digits for
+# n > 1e14)
+DIGITS_ESTIMATE_LIMIT = 10 ** 15
+_FACTORIAL_ESTIMATE_LIMIT = 10 ** 14
+
+
+class ExactError(ValueError):
+    """Raised when an exact-mode request is invalid or over budget."""
+
+
+def to_int(value):
+    """
+    Convert a request operand to an exact int.
+
+    Accepts ints, integral floats and integer strings.
+
+    Args:
+        value: Operand as received in the request
+
+    Returns:
+        int or None: The integer value, or None if not an integer
+    """
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def factorial_digits(n):
+    """
+    Estimate the number of decimal digits of n!.
+
+    Uses log10(n!) = lgamma(n + 1) / ln(10); exact to within one digit.
+    Returns math.inf when the estimate exceeds DIGITS_ESTIMATE_LIMIT.
+    """
+    if n < 2:
+        return 1
+    if n > _FACTORIAL_ESTIMATE_LIMIT:
+        return math.inf
+    return int(math.lgamma(n + 1) / math.log(10)) + 1
+
+
+def power_digits(base, exponent):
+    """
+    Estimate the number of decimal digits of base ** exponent.
+
+    Works from the bit length so it is safe for huge bases. Returns
+    math.inf when the estimate exceeds DIGITS_ESTIMATE_LIMIT.
+    """
+    base = abs(base)
+    if base < 2 or exponent == 0:
+        return 1
+    # log10(base) from its leading bits plus the remaining bit count
+    shift = max(base.bit_length() - 53, 0)
+    log10_base = math.log10(base >> shift) + shift * _LOG10_2
+    try:
+        estimate = exponent * log10_base
+    except OverflowError:
+        return math.inf
+    if not estimate < DIGITS_ESTIMATE_LIMIT:
+        return math.inf
+    return int(estimate) + 1
+
+
+def exact_factorial(n):
+    """
+    Compute n! exactly.
+
+    Small factorials come from the memoized table. Larger ones use
+    math.factorial, whose C implementation multiplies the odd part by
+    binary splitting and applies the power of two as a single shift -
+    the same divide-and-conquer scheme as prime-swing, without the
+    interpreter overhead of doing it in Python.
+
+    Args:
+        n (int): Non-negative integer
+
+    Returns:
+        int: n!
+    """
+    if n <= SMALL_FACTORIAL_LIMIT:
+        return SMALL_FACTORIALS[n]
+    return math.factorial(n)
+
+
+def _check_budget(digits):
+    if digits > MAX_EXACT_DIGITS and not math.isfinite(digits):
+        raise ExactError(f'Result too large for exact mode (max {MAX_EXACT_DIGITS} digits)')
+    if digits > MAX_EXACT_DIGITS:
+        raise ExactError(
+            f'Result too large for exact mode (about {digits} digits, max {MAX_EXACT_DIGITS})'
+        )
+
+
+def evaluate_exact(operation, a, b):
+    """
+    Validate and compute an exact-mode calculation.
+
+    Args:
+        operation (str): 'factorial' or 'power'
+        a: First operand as received in the request
+        b: Second operand as received (power only)
+
+    Returns:
+        int: Exact result
+
+    Raises:
+        ExactError: On invalid operands, unsupported operations or when
+        the estimated result exceeds the digit budget
+    """
+    if operation == 'factorial':
+        if a is None:
+            raise ExactError('Missing operand')
+        n = to_int(a)
+        if n is None:
+            raise ExactError('Factorial requires integer input')
+        if n < 0:
+            raise ExactError('Factorial not defined for negative numbers')
+        _check_budget(factorial_digits(n))
+        return exact_factorial(n)
+
+    if operation == 'power':
+        if a is None or b is None:
+            raise ExactError('Missing operands')
+        base, exponent = to_int(a), to_int(b)
+        if base is None or exponent is None:
+            raise ExactError('Exact mode requires integer operands')
+        if exponent < 0:
+            raise ExactError('Exact power requires a non-negative exponent')
+        _check_budget(power_digits(base, exponent))
+        return base ** exponent
+
+    raise ExactError('Exact mode supports factorial and power only')
+
+
+@lru_cache(maxsize=None)
+def _power_of_ten(exponent):
+    return 10 ** exponent
+
+
+def iter_decimal(value):
+    """
+    Yield the decimal representation of an int in chunks.
+
+    Splits the value by powers of ten (divide and conquer) until each part
+    fits in CHUNK_DIGITS, so conversion is subquadratic and never hits the
+    int/str conversion limit.
+
+    Args:
+        value (int): Integer to format
+
+    Yields:
+        str: Consecutive pieces of the decimal string
+    """
+    if value < 0:
+        yield '-'
+        value = -value
+    yield from _iter_digits(value, 0)
+
+
+def _iter_digits(value, width):
+    """Yield value's digits left-padded with zeros to width (0 = no padding)."""
+    if value < _power_of_ten(CHUNK_DIGITS):
+        text = str(value)
+        yield text.zfill(width) if width else text
+        return
+    # Split at the largest CHUNK_DIGITS * 2**k below half the digit count,
+    # so the divisors repeat across calls and stay cached. The digit count
+    # is a lower bound from the bit length, which keeps the high part > 0.
+    digits = int((value.bit_length() - 1) * _LOG10_2) + 1
+    split = CHUNK_DIGITS
+    while split * 2 < digits:
+        split *= 2
+    high, low = divmod(value, _power_of_ten(split))
+    yield from _iter_digits(high, width - split if width else 0)
+    yield from _iter_digits(low, split)
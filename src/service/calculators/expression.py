@@ -0,0 +1,253 @@
+"""
+Infix expression engine for POST /api/evaluate.
+
+Expressions are tokenized and parsed into an AST by a recursive-descent
+parser (no eval), then compiled into a tree of closures. Compiled plans
+are cached in a bounded LRU keyed by the normalized expression text, so a
+repeated expression skips parsing and compiling entirely.
+
+Grammar (lowest to highest precedence):
+    expr    := term (('+' | '-') term)*
+    term    := unary (('*' | '/' | '%') unary)*
+    unary   := ('+' | '-') unary | power
+    power   := postfix (('^' | '**') unary)?      right-associative
+    postfix := primary '!'*
+    primary := number | '(' expr ')'
+"""
+import re
+from src.service.cache import LRUCache
+from src.service.calculators.registry import OPERATIONS
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_NESTING_DEPTH = 100
+
+# Compiled plans keyed by normalized expression text
+plan_cache = LRUCache(maxsize=1024)
+
+_TOKEN_PATTERN = re.compile(r'\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|(\*\*|[-+*/%^!()]))')
+
+_BINARY_OPERATIONS = {
+    '+': 'add',
+    '-': 'subtract',
+    '*': 'multiply',
+    '/': 'divide',
+    '%': 'modulo',
+    '^': 'power',
+    '**': 'power',
+}
+
+
+class ExpressionError(ValueError):
+    """Raised for malformed expressions and calculation errors."""
+
+
+def tokenize(expression):
+    """
+    Split an expression into number and operator tokens.
+
+    Args:
+        expression (str): Infix expression
+
+    Returns:
+        list: Token strings ('**' is normalized to '^')
+
+    Raises:
+        ExpressionError: On characters that are not part of the grammar
+    """
+    tokens = []
+    position = 0
+    length = len(expression.rstrip())
+    while position < length:
+        match = _TOKEN_PATTERN.match(expression, position)
+        if not match:
+            raise ExpressionError(f'Invalid character at position {position + 1}')
+        number, operator = match.groups()
+        tokens.append(number if number is not None else ('^' if operator == '**' else operator))
+        position = match.end()
+    if not tokens:
+        raise ExpressionError('Expression is empty')
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing tuple-based AST nodes."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def advance(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.expr()
+        if self.peek() is not None:
+            raise ExpressionError(f"Unexpected token '{self.peek()}'")
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek() in ('+', '-'):
+            operator = self.advance()
+            node = ('binary', _BINARY_OPERATIONS[operator], node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in ('*', '/', '%'):
+            operator = self.advance()
+            node = ('binary', _BINARY_OPERATIONS[operator], node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() in ('+', '-'):
+            operator = self.advance()
+            self._enter()
+            operand = self.unary()
+            self.depth -= 1
+            return ('negate', operand) if operator == '-' else operand
+        return self.power()
+
+    def power(self):
+        node = self.postfix()
+        if self.peek() == '^':
+            self.advance()
+            self._enter()
+            node = ('binary', 'power', node, self.unary())
+            self.depth -= 1
+        return node
+
+    def postfix(self):
+        node = self.primary()
+        depth = self.depth
+        while self.peek() == '!':
+            self.advance()
+            # Each '!' nests the node one level deeper, like a parenthesis
+            self._enter()
+            node = ('factorial', node)
+        self.depth = depth
+        return node
+
+    def primary(self):
+        token = self.peek()
+        if token is None:
+            raise ExpressionError('Unexpected end of expression')
+        if token == '(':
+            self.advance()
+            self._enter()
+            node = self.expr()
+            self.depth -= 1
+            if self.peek() != ')':
+                raise ExpressionError("Missing ')'")
+            self.advance()
+            return node
+        if token[0].isdigit() or token[0] == '.':
+            self.advance()
+            return ('number', float(token))
+        raise ExpressionError(f"Unexpected token '{token}'")
+
+    def _enter(self):
+        self.depth += 1
+        if self.depth > MAX_NESTING_DEPTH:
+            raise ExpressionError(f'Expression nested too deeply (max {MAX_NESTING_DEPTH})')
+
+
+def parse(tokens):
+    """
+    Parse tokens into an AST.
+
+    Args:
+        tokens (list): Output of tokenize()
+
+    Returns:
+        tuple: Root AST node
+    """
+    return _Parser(tokens).parse()
+
+
+def _operation(name, left, right):
+    """Closure applying a registered operation with its validation rules."""
+    operation = OPERATIONS[name]
+
+    def run():
+        a, b, error = operation.validate(left(), right() if right else None)
+        if error:
+            raise ExpressionError(error)
+        result, error = operation.compute(a, b)
+        if error:
+            raise ExpressionError(error)
+        return result
+    return run
+
+
+def compile_ast(node):
+    """
+    Compile an AST node into a zero-argument closure.
+
+    Args:
+        node (tuple): AST node from parse()
+
+    Returns:
+        callable: Evaluates the expression, raising ExpressionError on
+        the same conditions calculate() rejects
+    """
+    kind = node[0]
+    if kind == 'number':
+        value = node[1]
+        return lambda: value
+    if kind == 'negate':
+        operand = compile_ast(node[1])
+        return lambda: -operand()
+    if kind == 'factorial':
+        return _operation('factorial', compile_ast(node[1]), None)
+    return _operation(node[1], compile_ast(node[2]), compile_ast(node[3]))
+
+
+def get_plan(expression):
+    """
+    Return the compiled plan for an expression, using the plan cache.
+
+    Args:
+        expression (str): Infix expression
+
+    Returns:
+        tuple: (normalized expression, compiled closure)
+
+    Raises:
+        ExpressionError: If the expression is malformed
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f'Expression too long (max {MAX_EXPRESSION_LENGTH} characters)')
+    tokens = tokenize(expression)
+    normalized = ' '.join(tokens)
+    plan = plan_cache.get(normalized)
+    if plan is None:
+        plan = compile_ast(parse(tokens))
+        plan_cache.put(normalized, plan)
+    return normalized, plan
+
+
+def evaluate(expression):
+    """
+    Evaluate an infix expression.
+
+    Args:
+        expression (str): Infix expression, e.g. "2 + 3 * (4 - 1)^2"
+
+    Returns:
+        tuple: (normalized expression, result)
+
+    Raises:
+        ExpressionError: If the expression is malformed or a calculation
+        fails validation
+    """
+    normalized, plan = get_plan(expression)
+    return normalized, plan()
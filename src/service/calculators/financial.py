@@ -1,12 +1,66 @@
 """
 Financial calculators including EMI, Simple Interest, and Compound Interest.
+
+Every calculator has a Decimal path (the default, exact to the cent) and
+an opt-in float64 path selected with "precision": "fast", which computes
+whole batches in one NumPy pass. Fast results are rounded half up to the
+cent like the Decimal ones and differ from them by at most
+
+    FAST_ABSOLUTE_ERROR + FAST_RELATIVE_ERROR * |exact amount|
+
+over the validated input domain: one cent where float64 rounding falls on
+the other side of a half-cent tie, plus the float64 resolution of amounts
+too large to hold whole cents (compound interest allows 15 digits). The
+bound is checked by sampling the domain (benchmarks/precision.py). On
+compound interest the relative term dominates: at the 15-digit limit
+(about 1e15) the bound allows an error of about $200, although sampled
+errors so far stay under $10.
 """
+import numpy as np
 from decimal import Decimal, ROUND_HALF_UP
 from flask import Blueprint, request, jsonify
+from src.service.cache import LRUCache, cached
+from src.service.streaming import is_ndjson_request, ndjson_response
+from src.service.calculators.annuity import annuity_factors
+from src.service.calculators.decimal_power import PowerError, compound_growth
 
 financial_bp = Blueprint('financial', __name__, url_prefix='/api/calculate')
 
+# Compounding periods per year
+COMPOUNDING_FREQUENCIES = {
+    'monthly': 12,
+    'quarterly': 4,
+    'annual': 1
+}
+
+# "precision" values: the Decimal path (default) or float64
+PRECISIONS = ('exact', 'fast')
+
+# Documented worst-case |fast - exact| is FAST_ABSOLUTE_ERROR plus
+# FAST_RELATIVE_ERROR times the exact amount (see module docstring); the
+# largest relative error seen over 500,000 sampled compound-interest
+# requests is about 1e-13, on long tenures where exp() amplifies it
+FAST_ABSOLUTE_ERROR = 0.01
+FAST_RELATIVE_ERROR = 2e-13
+
+# Largest batch accepted per request
+BATCH_MAX_ITEMS = 10000
+
+EMI_FIELDS = ('emi', 'total_interest', 'total_payment')
 
+# Results of calculate_emi(), calculate_simple_interest() and
+# calculate_compound_interest(), keyed by their normalized Decimal inputs
+# (sized by RESULT_CACHE_SIZE / RESULT_CACHE_TTL in app.py)
+result_cache = LRUCache(maxsize=4096)
+
+
+def _decimal_key(value):
+    """Normalize a numeric input, so 500000, 500000.0 and '5E+5' share a key."""
+    return Decimal(str(value)).normalize()
+
+
+@cached(result_cache, lambda loan_amount, annual_rate, tenure_years:
+        (_decimal_key(loan_amount), _decimal_key(annual_rate), int(tenure_years)))
 def calculate_emi(loan_amount, annual_rate, tenure_years):
     """
     Calculate Equated Monthly Installment (EMI) for a loan.
@@ -31,7 +85,6 @@ def calculate_emi(loan_amount, annual_rate, tenure_years):
     """
     # Convert to Decimal for precision
     P = Decimal(str(loan_amount))
-    annual_rate_decimal = Decimal(str(annual_rate))
     n = tenure_years * 12
     
     # Handle zero interest rate edge case
@@ -40,15 +93,11 @@ def calculate_emi(loan_amount, annual_rate, tenure_years):
         total_payment = P
         total_interest = Decimal('0')
     else:
-        # Calculate monthly rate
-        r = annual_rate_decimal / Decimal('12') / Decimal('100')
+        # Monthly rate, (1+r)^n and (1+r)^n - 1, cached per (rate, months)
+        r, one_plus_r_power_n, denominator = annuity_factors(annual_rate, n)
         
         # Calculate EMI: [P × r × (1+r)^n] / [(1+r)^n - 1]
-        one_plus_r = Decimal('1') + r
-        one_plus_r_power_n = one_plus_r ** n
-        
         numerator = P * r * one_plus_r_power_n
-        denominator = one_plus_r_power_n - Decimal('1')
         
         emi = numerator / denominator
         
@@ -77,7 +126,8 @@ def emi_calculator():
         {
             "loan_amount": float (1000 - 10000000),
             "annual_rate": float (0.1 - 30),
-            "tenure_years": int (1 - 30)
+            "tenure_years": int (1 - 30),
+            "precision": "exact" | "fast" (default: "exact")
         }
     
     Returns:
@@ -87,54 +137,273 @@ def emi_calculator():
             "total_payment": float  # Total amount paid
         }
         400: {"error": str} - validation error
+    
+    NDJSON (Content-Type: application/x-ndjson): one request body per line;
+    streams one {"line": int, "emi"|"error": ...} object per line.
     """
+    if is_ndjson_request():
+        return ndjson_response(emi_record)
+    
     data = request.get_json()
     
     if not data:
         return jsonify({'error': 'Request body must be JSON'}), 400
     
-    # Extract and validate parameters
+    record = emi_record(data)
+    if 'error' in record:
+        return jsonify(record), 400
+    
+    return jsonify(record), 200
+
+
+def parse_emi_params(data):
+    """
+    Extract and validate EMI parameters from a request body.
+    
+    Args:
+        data (dict): Request body with loan_amount, annual_rate, tenure_years
+    
+    Returns:
+        tuple: ((loan_amount, annual_rate, tenure_years), error) - converted
+        parameters, or None and an error message
+    """
     try:
         loan_amount = data.get('loan_amount')
         annual_rate = data.get('annual_rate')
         tenure_years = data.get('tenure_years')
         
         if loan_amount is None:
-            return jsonify({'error': 'loan_amount is required'}), 400
+            return None, 'loan_amount is required'
         if annual_rate is None:
-            return jsonify({'error': 'annual_rate is required'}), 400
+            return None, 'annual_rate is required'
         if tenure_years is None:
-            return jsonify({'error': 'tenure_years is required'}), 400
+            return None, 'tenure_years is required'
         
         # Convert to appropriate types
         loan_amount = float(loan_amount)
         annual_rate = float(annual_rate)
         tenure_years = int(tenure_years)
         
-    except (ValueError, TypeError):
-        return jsonify({'error': 'Invalid parameter types'}), 400
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+    
+    error = check_emi_ranges(loan_amount, annual_rate, tenure_years)
+    if error:
+        return None, error
+    
+    return (loan_amount, annual_rate, tenure_years), None
+
+
+def check_emi_ranges(loan_amount, annual_rate, tenure_years):
+    """
+    Check EMI parameters against the accepted ranges.
+    
+    Args:
+        loan_amount (float): Loan principal amount
+        annual_rate (float): Annual interest rate (percentage)
+        tenure_years (int): Loan tenure in years
+    
+    Returns:
+        str or None: Error message, or None if all parameters are in range
+    """
+    # Written as "not in range" so NaN is rejected too
+    if not 1000 <= loan_amount <= 10000000:
+        return 'Loan amount must be between $1,000 and $10,000,000'
+    
+    if not 0 <= annual_rate <= 30:
+        return 'Annual rate must be between 0% and 30%'
+    
+    if not 1 <= tenure_years <= 30:
+        return 'Tenure must be between 1 and 30 years'
+    
+    return None
+
+
+def parse_precision(data):
+    """
+    Extract the optional "precision" of a request body.
+    
+    Args:
+        data (dict): Request body
+    
+    Returns:
+        tuple: (precision, error) - 'exact' or 'fast', or None and an error message
+    """
+    precision = data.get('precision', 'exact')
+    if precision not in PRECISIONS:
+        return None, 'precision must be exact or fast'
+    return precision, None
+
+
+def fast_record(compute_many, params, fields):
+    """
+    Compute one parsed request with a vectorized float calculator.
+    
+    Args:
+        compute_many (callable): Takes one sequence per parameter and
+            returns one rounded array per field
+        params (tuple): Parsed parameters
+        fields (tuple): Result field names, in compute_many() order
     
-    # Validate ranges
-    if loan_amount < 1000 or loan_amount > 10000000:
-        return jsonify({'error': 'Loan amount must be between $1,000 and $10,000,000'}), 400
+    Returns:
+        dict: {field: float}
+    """
+    columns = compute_many(*([value] for value in params))
+    return {field: float(column[0]) for field, column in zip(fields, columns)}
+
+
+def emi_record(data):
+    """
+    Validate and compute one EMI request as a result dict.
     
-    if annual_rate < 0 or annual_rate > 30:
-        return jsonify({'error': 'Annual rate must be between 0% and 30%'}), 400
+    Args:
+        data (dict): Request body
     
-    if tenure_years < 1 or tenure_years > 30:
-        return jsonify({'error': 'Tenure must be between 1 and 30 years'}), 400
+    Returns:
+        dict: {"emi", "total_interest", "total_payment"} as floats, or {"error": str}
+    """
+    params, error = parse_emi_params(data)
+    if error:
+        return {'error': error}
+    
+    precision, error = parse_precision(data)
+    if error:
+        return {'error': error}
+    if precision == 'fast':
+        return fast_record(emi_many, params, EMI_FIELDS)
     
-    # Calculate EMI
-    result = calculate_emi(loan_amount, annual_rate, tenure_years)
+    result = calculate_emi(*params)
     
     # Convert Decimal to float for JSON response
-    return jsonify({
+    return {
         'emi': float(result['emi']),
         'total_interest': float(result['total_interest']),
         'total_payment': float(result['total_payment'])
+    }
+
+
+def round_cents(values):
+    """
+    Round float amounts half up to two decimals, vectorized.
+    
+    Matches quantize(Decimal('0.01'), ROUND_HALF_UP) for non-negative
+    amounts, up to float representation error at exact ties.
+    
+    Args:
+        values (numpy.ndarray): Amounts
+    
+    Returns:
+        numpy.ndarray: Rounded amounts
+    """
+    return np.floor(values * 100 + 0.5) / 100
+
+
+def emi_many(loan_amounts, annual_rates, tenures):
+    """
+    Vectorized EMI for float64 arrays ("precision": "fast").
+    
+    Evaluates P r / (1 - (1 + r)^-n) through log1p/expm1, which stays
+    accurate for rates close to 0; zero-rate loans repay P / n per month
+    and exactly the principal in total, as in calculate_emi().
+    
+    Returns:
+        tuple: (emi, total_interest, total_payment) arrays rounded to the cent
+    """
+    P = np.asarray(loan_amounts, dtype=np.float64)
+    r = np.asarray(annual_rates, dtype=np.float64) / 12 / 100
+    n = np.asarray(tenures, dtype=np.float64) * 12
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        emi = np.where(r == 0, P / n, P * r / -np.expm1(-n * np.log1p(r)))
+    total_payment = np.where(r == 0, P, emi * n)
+    return round_cents(emi), round_cents(total_payment - P), round_cents(total_payment)
+
+
+def precision_batch(parse, calculate, compute_many, fields):
+    """
+    Shared body of the batch calculator endpoints.
+    
+    Validates every item first, then computes the valid ones: one Decimal
+    calculate() call per item for "precision": "exact" (default), or one
+    vectorized compute_many() pass over the whole batch for "fast".
+    
+    Args:
+        parse (callable): Item validator returning (params, error)
+        calculate (callable): Decimal calculator taking the parsed params
+        compute_many (callable): Vectorized float calculator taking one
+            sequence per parameter and returning one array per field
+        fields (tuple): Result field names
+    """
+    data = request.get_json(silent=True)
+    
+    precision = 'exact'
+    if isinstance(data, dict):
+        precision = data.get('precision', 'exact')
+        data = data.get('items')
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'Request body must be a non-empty JSON array of items'}), 400
+    if len(data) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Too many items (max {BATCH_MAX_ITEMS})'}), 400
+    if precision not in PRECISIONS:
+        return jsonify({'error': 'precision must be exact or fast'}), 400
+    
+    results = [None] * len(data)
+    indexes = []
+    columns = []
+    
+    # Validate every item first, collecting the valid parameters by column
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            results[index] = {'error': 'Item must be a JSON object'}
+            continue
+        params, error = parse(item)
+        if error:
+            results[index] = {'error': error}
+            continue
+        if precision == 'exact':
+            try:
+                result = calculate(*params)
+            except PowerError as e:
+                results[index] = {'error': str(e)}
+                continue
+            results[index] = {field: float(result[field]) for field in fields}
+            continue
+        indexes.append(index)
+        columns.append(params)
+    
+    # One vectorized pass over all valid items
+    if columns:
+        values = [column.tolist() for column in compute_many(*zip(*columns))]
+        for index, row in zip(indexes, zip(*values)):
+            results[index] = dict(zip(fields, row))
+    
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'errors': sum(1 for item in results if 'error' in item),
+        'precision': precision
     }), 200
 
 
+@financial_bp.route('/emi/batch', methods=['POST'])
+def emi_batch():
+    """
+    Batch EMI endpoint.
+    
+    Request body:
+        [{"loan_amount", "annual_rate", "tenure_years"}, ...]
+        or {"items": [...], "precision": "exact" | "fast"} (max BATCH_MAX_ITEMS items)
+    
+    Returns:
+        200: {"results": [{"emi", "total_interest", "total_payment"} | {"error"}, ...],
+              "count": int, "errors": int, "precision": str}
+        400: {"error": str}
+    """
+    return precision_batch(parse_emi_params, calculate_emi, emi_many, EMI_FIELDS)
+
+
+@cached(result_cache, lambda principal, rate, time_years:
+        (_decimal_key(principal), _decimal_key(rate), _decimal_key(time_years)))
 def calculate_simple_interest(principal, rate, time_years):
     """
     Calculate Simple Interest.
@@ -173,6 +442,8 @@ def calculate_simple_interest(principal, rate, time_years):
     }
 
 
+@cached(result_cache, lambda principal, rate, time_years, frequency:
+        (_decimal_key(principal), _decimal_key(rate), _decimal_key(time_years), frequency.lower()))
 def calculate_compound_interest(principal, rate, time_years, frequency):
     """
     Calculate Compound Interest.
@@ -195,24 +466,23 @@ def calculate_compound_interest(principal, rate, time_years, frequency):
             'interest': Decimal,  # Interest earned
             'final_amount': Decimal  # Principal + Interest
         }
+    
+    Raises:
+        PowerError: If the final amount would exceed MAX_RESULT_DIGITS digits
     """
     P = Decimal(str(principal))
     r = Decimal(str(rate)) / Decimal('100')
     t = Decimal(str(time_years))
     
     # Determine compounding frequency
-    frequency_map = {
-        'monthly': 12,
-        'quarterly': 4,
-        'annual': 1
-    }
-    n = Decimal(str(frequency_map.get(frequency.lower(), 12)))
+    n = Decimal(str(COMPOUNDING_FREQUENCIES.get(frequency.lower(), 12)))
     
-    # Calculate: A = P(1 + r/n)^(nt)
+    # Calculate: A = P(1 + r/n)^(nt), correct to the cent even when
+    # nt is fractional (see decimal_power)
     rate_per_period = r / n
     num_periods = n * t
     
-    final_amount = P * ((Decimal('1') + rate_per_period) ** num_periods)
+    final_amount = compound_growth(P, Decimal('1') + rate_per_period, num_periods)
     interest = final_amount - P
     
     # Round to 2 decimal places
@@ -0,0 +1,270 @@
+"""
+Floating-rate loans: EMI schedules from a rate timeline.
+
+A rate timeline maps effective months to annual rates. The loan is split
+into segments between resets and every segment is priced with the closed
+form of amortization.py, B(k) = B0 * g^k - E * (g^k - 1) / r, so a summary
+costs O(resets) rather than O(months). Rows are only expanded, per
+segment and vectorized, when a schedule is streamed.
+
+Two modes:
+
+    recompute_emi  at each reset the EMI is recomputed on the remaining
+                   balance over the remaining original tenure (default)
+    keep_emi       the EMI stays fixed and the tenure shrinks or extends
+                   to fit; past the last reset the loan runs at that rate
+                   until repaid (at most MAX_MONTHS months in all)
+
+As in amortization_schedule(), the last payment settles the remaining
+balance, so every schedule ends at exactly zero.
+"""
+import math
+import numpy as np
+from flask import Response, jsonify, request
+from src.service.calculators.financial import financial_bp, calculate_emi, parse_emi_params
+from src.service.calculators.amortization import (
+    SCHEDULE_FORMATS,
+    closed_form_balances,
+    emi_cents,
+    format_cents,
+    iter_schedule_rows,
+    to_cents
+)
+
+# Longest loan accepted in keep_emi mode, in months
+MAX_MONTHS = 600
+
+MODES = ('recompute_emi', 'keep_emi')
+
+FLOATING_FORMATS = ('summary',) + tuple(SCHEDULE_FORMATS)
+
+
+def parse_rate_timeline(timeline, annual_rate, tenure_years):
+    """
+    Validate a rate timeline and merge it with the starting rate.
+
+    Args:
+        timeline (dict): {effective month: annual rate}, months from 1
+        annual_rate (float): Rate before the first reset
+        tenure_years (int): Loan tenure in years
+
+    Returns:
+        tuple: (resets, error) - [(month, annual_rate)] sorted by month
+        and starting at month 1, or None and an error message
+    """
+    if not isinstance(timeline, dict):
+        return None, 'rate_timeline must be an object of month: rate'
+
+    tenure_months = tenure_years * 12
+    rates = {1: annual_rate}
+    try:
+        for month, rate in timeline.items():
+            rates[int(month)] = float(rate)
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+
+    for month, rate in rates.items():
+        if month < 1 or month > tenure_months:
+            return None, f'Reset month must be between 1 and {tenure_months}'
+        # Written as "not in range" so NaN is rejected too
+        if not 0 <= rate <= 30:
+            return None, 'Annual rate must be between 0% and 30%'
+
+    return sorted(rates.items()), None
+
+
+def _payoff_months(balance, emi, annual_rate):
+    """Payments of a fixed EMI that clear a balance at one rate (closed form)."""
+    if annual_rate == 0:
+        months = math.ceil(balance / emi)
+    else:
+        r = annual_rate / 12 / 100
+        months = max(math.ceil(math.log(emi / (emi - balance * r)) / math.log1p(r)), 1)
+    # The float logarithm can be off by one against the rounded balances
+    while months > 1 and closed_form_balances(balance, emi, annual_rate, months - 1) <= 0:
+        months -= 1
+    while closed_form_balances(balance, emi, annual_rate, months) > 0:
+        months += 1
+    return months
+
+
+def floating_segments(loan_amount, tenure_years, resets, mode='recompute_emi'):
+    """
+    Split a floating-rate loan into fixed-rate segments.
+
+    Args:
+        loan_amount (float): Loan principal amount
+        tenure_years (int): Loan tenure in years
+        resets (list): [(month, annual_rate)] from parse_rate_timeline()
+        mode (str): 'recompute_emi' or 'keep_emi'
+
+    Returns:
+        list: One dict per segment with 'start_month', 'months',
+        'annual_rate', and 'emi', 'opening_balance', 'closing_balance' and
+        'payment' (total paid in the segment) in integer cents. Resets
+        after the loan is repaid have no segment.
+
+    Raises:
+        ValueError: If a fixed EMI cannot repay the loan
+    """
+    tenure_months = tenure_years * 12
+    balance = to_cents(loan_amount)
+    emi = to_cents(calculate_emi(loan_amount, resets[0][1], tenure_years)['emi'])
+    segments = []
+
+    for index, (start, rate) in enumerate(resets):
+        last = index + 1 == len(resets)
+        end = tenure_months + 1 if last else resets[index + 1][0]
+
+        if mode == 'recompute_emi':
+            emi = emi_cents(balance, rate, tenure_months - start + 1)
+            months = end - start
+            final = last
+            if emi > balance * rate / 12 / 100:
+                # At high rates the rounded EMI can repay the loan before
+                # the segment (or the tenure) ends
+                payoff = _payoff_months(balance, emi, rate)
+                final = last or payoff <= months
+                months = min(months, payoff)
+        else:
+            if emi <= balance * rate / 12 / 100:
+                raise ValueError(f'EMI does not cover the interest from month {start}')
+            limit = MAX_MONTHS + 1 - start if last else end - start
+            payoff = _payoff_months(balance, emi, rate)
+            final = payoff <= limit
+            if not final and last:
+                raise ValueError(f'Loan not repaid within {MAX_MONTHS} months')
+            months = min(payoff, limit)
+
+        closing = int(closed_form_balances(balance, emi, rate, months))
+        # The last payment is the EMI plus whatever residual it leaves
+        payment = emi * months + closing if final else emi * months
+        segments.append({
+            'start_month': start,
+            'months': months,
+            'annual_rate': rate,
+            'emi': emi,
+            'opening_balance': balance,
+            'closing_balance': 0 if final else closing,
+            'payment': payment
+        })
+        if final:
+            break
+        balance = closing
+
+    return segments
+
+
+def floating_schedule(segments):
+    """
+    Expand segments into a month-by-month schedule.
+
+    Args:
+        segments (list): Output of floating_segments()
+
+    Returns:
+        dict: 'payment', 'principal', 'interest' and 'balance' int64 cent
+        arrays, one row per month, as amortization_schedule() returns
+    """
+    columns = {'payment': [], 'principal': [], 'interest': [], 'balance': []}
+    for segment in segments:
+        months = segment['months']
+        balance = closed_form_balances(segment['opening_balance'], segment['emi'],
+                                       segment['annual_rate'], np.arange(months + 1))
+        payment = np.full(months, segment['emi'], dtype=np.int64)
+        principal = balance[:-1] - balance[1:]
+        if not segment['closing_balance']:
+            # Final payment clears whatever balance remains
+            principal[-1] = balance[-2]
+            payment[-1] = segment['payment'] - segment['emi'] * (months - 1)
+            balance[-1] = 0
+        columns['payment'].append(payment)
+        columns['principal'].append(principal)
+        columns['interest'].append(payment - principal)
+        columns['balance'].append(balance[1:])
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+
+@financial_bp.route('/emi/floating', methods=['POST'])
+def emi_floating():
+    """
+    Floating-rate EMI endpoint.
+
+    Request body:
+        {
+            "loan_amount": float (1000 - 10000000),
+            "annual_rate": float (0 - 30),  # rate before the first reset
+            "tenure_years": int (1 - 30),
+            "rate_timeline": {"<month>": float, ...},  # effective month -> rate
+            "mode": "recompute_emi" | "keep_emi" (default: "recompute_emi"),
+            "format": "summary" | "ndjson" | "csv" (default: "summary")
+        }
+
+    Returns:
+        200: summary: {
+                 "mode": str,
+                 "months": int,
+                 "total_payment": float,
+                 "total_interest": float,
+                 "segments": [{"start_month", "end_month", "annual_rate",
+                               "emi", "opening_balance", "closing_balance",
+                               "interest"}]
+             }
+             ndjson/csv: streamed rows as /emi/schedule, with
+             X-Total-Payment and X-Total-Interest headers
+        400: {"error": str} - validation error
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    params, error = parse_emi_params(data)
+    if error:
+        return jsonify({'error': error}), 400
+    loan_amount, annual_rate, tenure_years = params
+
+    mode = data.get('mode', 'recompute_emi')
+    if mode not in MODES:
+        return jsonify({'error': f'mode must be one of: {", ".join(MODES)}'}), 400
+
+    output_format = data.get('format', 'summary')
+    if output_format not in FLOATING_FORMATS:
+        return jsonify({'error': f'format must be one of: {", ".join(FLOATING_FORMATS)}'}), 400
+
+    resets, error = parse_rate_timeline(data.get('rate_timeline', {}), annual_rate, tenure_years)
+    if error:
+        return jsonify({'error': error}), 400
+
+    try:
+        segments = floating_segments(loan_amount, tenure_years, resets, mode)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    total_payment = sum(segment['payment'] for segment in segments)
+    total_interest = total_payment - to_cents(loan_amount)
+
+    if output_format != 'summary':
+        schedule = floating_schedule(segments)
+        response = Response(iter_schedule_rows(schedule, output_format), status=200,
+                            mimetype=SCHEDULE_FORMATS[output_format])
+        response.headers['X-Total-Payment'] = format_cents(total_payment)
+        response.headers['X-Total-Interest'] = format_cents(total_interest)
+        return response
+
+    return jsonify({
+        'mode': mode,
+        'months': sum(segment['months'] for segment in segments),
+        'total_payment': total_payment / 100,
+        'total_interest': total_interest / 100,
+        'segments': [{
+            'start_month': segment['start_month'],
+            'end_month': segment['start_month'] + segment['months'] - 1,
+            'annual_rate': segment['annual_rate'],
+            'emi': segment['emi'] / 100,
+            'opening_balance': segment['opening_balance'] / 100,
+            'closing_balance': segment['closing_balance'] / 100,
+            'interest': (segment['payment'] - segment['opening_balance']
+                         + segment['closing_balance']) / 100
+        } for segment in segments]
+    }), 200
@@ -0,0 +1,303 @@
+"""
+Simple and compound interest endpoints, single and batched.
+
+Requests use the Decimal calculators in financial.py by default, or the
+float64 functions below with "precision": "fast" (see financial.py for
+the error bound). Batches validate every item first and then compute the
+valid ones together: per item in Decimal, or the whole batch in one
+NumPy pass in fast mode.
+"""
+import numpy as np
+from flask import jsonify, request
+from src.service.streaming import is_ndjson_request, ndjson_response
+from src.service.calculators.financial import (
+    financial_bp,
+    calculate_simple_interest,
+    calculate_compound_interest,
+    fast_record,
+    parse_precision,
+    precision_batch,
+    round_cents,
+    COMPOUNDING_FREQUENCIES
+)
+from src.service.calculators.decimal_power import PowerError, check_power_cost
+
+INTEREST_FIELDS = ('interest', 'final_amount')
+
+
+def _parse_common(data):
+    """Extract and validate principal, rate and time_years."""
+    try:
+        principal = data.get('principal')
+        rate = data.get('rate')
+        time_years = data.get('time_years')
+
+        if principal is None:
+            return None, 'principal is required'
+        if rate is None:
+            return None, 'rate is required'
+        if time_years is None:
+            return None, 'time_years is required'
+
+        principal = float(principal)
+        rate = float(rate)
+        time_years = float(time_years)
+
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+
+    # Written as "not in range" so NaN is rejected too
+    if not 1 <= principal <= 10000000:
+        return None, 'Principal must be between $1 and $10,000,000'
+
+    if not 0 <= rate <= 100:
+        return None, 'Rate must be between 0% and 100%'
+
+    if not 0 <= time_years <= 100:
+        return None, 'Time must be between 0 and 100 years'
+
+    return (principal, rate, time_years), None
+
+
+def parse_simple_interest_params(data):
+    """
+    Extract and validate simple interest parameters from a request body.
+
+    Args:
+        data (dict): Request body with principal, rate, time_years
+
+    Returns:
+        tuple: ((principal, rate, time_years), error) - converted
+        parameters, or None and an error message
+    """
+    return _parse_common(data)
+
+
+def parse_compound_interest_params(data):
+    """
+    Extract and validate compound interest parameters from a request body.
+
+    Args:
+        data (dict): Request body with principal, rate, time_years and
+            optional frequency ('monthly', 'quarterly', 'annual'; default monthly)
+
+    Returns:
+        tuple: ((principal, rate, time_years, frequency), error) - converted
+        parameters, or None and an error message
+    """
+    params, error = _parse_common(data)
+    if error:
+        return None, error
+
+    frequency = data.get('frequency', 'monthly')
+    if not isinstance(frequency, str) or frequency.lower() not in COMPOUNDING_FREQUENCIES:
+        return None, 'Frequency must be one of: monthly, quarterly, annual'
+    frequency = frequency.lower()
+
+    # Reject results too large to compute to the cent, before any work
+    principal, rate, time_years = params
+    periods = COMPOUNDING_FREQUENCIES[frequency]
+    try:
+        check_power_cost(principal, 1 + rate / 100 / periods, periods * time_years)
+    except PowerError as e:
+        return None, str(e)
+
+    return params + (frequency,), None
+
+
+def simple_interest_record(data):
+    """
+    Validate and compute one simple interest request as a result dict.
+
+    Args:
+        data (dict): Request body
+
+    Returns:
+        dict: {"interest", "final_amount"} as floats, or {"error": str}
+    """
+    params, error = parse_simple_interest_params(data)
+    if error:
+        return {'error': error}
+
+    precision, error = parse_precision(data)
+    if error:
+        return {'error': error}
+    if precision == 'fast':
+        return fast_record(simple_interest_many, params, INTEREST_FIELDS)
+
+    result = calculate_simple_interest(*params)
+    return {
+        'interest': float(result['interest']),
+        'final_amount': float(result['final_amount'])
+    }
+
+
+def compound_interest_record(data):
+    """
+    Validate and compute one compound interest request as a result dict.
+
+    Args:
+        data (dict): Request body
+
+    Returns:
+        dict: {"interest", "final_amount"} as floats, or {"error": str}
+    """
+    params, error = parse_compound_interest_params(data)
+    if error:
+        return {'error': error}
+
+    precision, error = parse_precision(data)
+    if error:
+        return {'error': error}
+    if precision == 'fast':
+        return fast_record(_compound_interest_many, params, INTEREST_FIELDS)
+
+    try:
+        result = calculate_compound_interest(*params)
+    except PowerError as e:
+        return {'error': str(e)}
+    return {
+        'interest': float(result['interest']),
+        'final_amount': float(result['final_amount'])
+    }
+
+
+def simple_interest_many(principals, rates, times):
+    """
+    Vectorized simple interest for float64 arrays.
+
+    Returns:
+        tuple: (interest, final_amount) arrays rounded to the cent
+    """
+    principals = np.asarray(principals, dtype=np.float64)
+    interest = principals * (np.asarray(rates, dtype=np.float64) / 100) * np.asarray(times, dtype=np.float64)
+    return round_cents(interest), round_cents(principals + interest)
+
+
+def compound_interest_many(principals, rates, times, frequencies):
+    """
+    Vectorized compound interest for float64 arrays.
+
+    Args:
+        frequencies: Compounding periods per year (12, 4 or 1) per item
+
+    Returns:
+        tuple: (interest, final_amount) arrays rounded to the cent
+    """
+    principals = np.asarray(principals, dtype=np.float64)
+    n = np.asarray(frequencies, dtype=np.float64)
+    rate_per_period = np.asarray(rates, dtype=np.float64) / 100 / n
+    # exp(nt ln(1 + r/n)) rather than (1 + r/n)^nt: forming 1 + r/n first
+    # would lose the low bits of r/n, and nt amplifies that error
+    final_amount = principals * np.exp(n * np.asarray(times, dtype=np.float64) * np.log1p(rate_per_period))
+    return round_cents(final_amount - principals), round_cents(final_amount)
+
+
+def _interest_endpoint(record):
+    """Shared body of the single-request interest endpoints."""
+    if is_ndjson_request():
+        return ndjson_response(record)
+
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    result = record(data)
+    if 'error' in result:
+        return jsonify(result), 400
+
+    return jsonify(result), 200
+
+
+def _compound_interest_many(principals, rates, times, frequencies):
+    """compound_interest_many() taking frequency names."""
+    return compound_interest_many(
+        principals, rates, times,
+        [COMPOUNDING_FREQUENCIES[frequency] for frequency in frequencies]
+    )
+
+
+@financial_bp.route('/simple-interest', methods=['POST'])
+def simple_interest_calculator():
+    """
+    Simple interest calculator endpoint.
+
+    Request body:
+        {
+            "principal": float (1 - 10000000),
+            "rate": float (0 - 100),
+            "time_years": float (0 - 100),
+            "precision": "exact" | "fast" (default: "exact")
+        }
+
+    Returns:
+        200: {"interest": float, "final_amount": float}
+        400: {"error": str} - validation error
+
+    NDJSON:
+        With Content-Type application/x-ndjson, each line is one request
+        body and results stream back one line each.
+    """
+    return _interest_endpoint(simple_interest_record)
+
+
+@financial_bp.route('/compound-interest', methods=['POST'])
+def compound_interest_calculator():
+    """
+    Compound interest calculator endpoint.
+
+    Request body:
+        {
+            "principal": float (1 - 10000000),
+            "rate": float (0 - 100),
+            "time_years": float (0 - 100),
+            "frequency": "monthly" | "quarterly" | "annual" (default: "monthly"),
+            "precision": "exact" | "fast" (default: "exact")
+        }
+
+    Returns:
+        200: {"interest": float, "final_amount": float}
+        400: {"error": str} - validation error
+
+    NDJSON:
+        With Content-Type application/x-ndjson, each line is one request
+        body and results stream back one line each.
+    """
+    return _interest_endpoint(compound_interest_record)
+
+
+@financial_bp.route('/simple-interest/batch', methods=['POST'])
+def simple_interest_batch():
+    """
+    Batch simple interest endpoint.
+
+    Request body:
+        [{"principal", "rate", "time_years"}, ...]
+        or {"items": [...], "precision": "exact" | "fast"} (max BATCH_MAX_ITEMS items)
+
+    Returns:
+        200: {"results": [{"interest", "final_amount"} | {"error"}, ...],
+              "count": int, "errors": int, "precision": str}
+        400: {"error": str}
+    """
+    return precision_batch(parse_simple_interest_params, calculate_simple_interest,
+                           simple_interest_many, INTEREST_FIELDS)
+
+
+@financial_bp.route('/compound-interest/batch', methods=['POST'])
+def compound_interest_batch():
+    """
+    Batch compound interest endpoint.
+
+    Request body:
+        [{"principal", "rate", "time_years", "frequency"}, ...]
+        or {"items": [...], "precision": "exact" | "fast"} (max BATCH_MAX_ITEMS items)
+
+    Returns:
+        200: {"results": [{"interest", "final_amount"} | {"error"}, ...],
+              "count": int, "errors": int, "precision": str}
+        400: {"error": str}
+    """
+    return precision_batch(parse_compound_interest_params, calculate_compound_interest,
+                           _compound_interest_many, INTEREST_FIELDS)
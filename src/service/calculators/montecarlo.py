@@ -0,0 +1,218 @@
+"""
+Monte Carlo loan cost: the distribution of total interest under random
+rate paths.
+
+Each path starts at the loan's annual rate and resets every reset_months
+by a random step, rate += drift + volatility * Z with Z ~ N(0, 1),
+clipped to 0-30%. At each reset the EMI is recomputed on the remaining
+balance over the remaining tenure (a floating-rate loan), so a path is
+priced per reset segment in closed form with the vectorized annuity
+formula from solvers.py - all paths of a chunk at once, never month by
+month.
+
+Paths are drawn from a seeded NumPy generator and processed in chunks of
+PATH_CHUNK, so memory stays bounded (a chunk's random draws are at most
+PATH_CHUNK x 360 floats) however many paths are requested. Draws are
+consumed in path order, so results for a seed do not depend on the chunk
+size. Amounts are float64 and are not rounded to the cent month by month.
+"""
+import numpy as np
+from flask import jsonify, request
+from src.service.calculators.financial import financial_bp, calculate_emi, parse_emi_params
+from src.service.calculators.solvers import emi_values, SMALL_RATE
+
+MAX_PATHS = 100000
+
+# Paths simulated together; bounds memory per chunk
+PATH_CHUNK = 10000
+
+MAX_BINS = 1000
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95, 99)
+
+# Rate bounds for simulated paths (the EMI calculator's accepted range)
+MIN_RATE = 0
+MAX_RATE = 30
+
+
+def _balances_after(balance, emi, r, months):
+    """Balance after `months` payments of `emi` at monthly rate r (vectorized)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth_minus_one = np.expm1(months * np.log1p(r))
+        annuity = np.where(r < SMALL_RATE, months * (1 + r * (months - 1) / 2), growth_minus_one / r)
+    return balance * (1 + growth_minus_one) - emi * annuity
+
+
+def simulate_interest(loan_amount, annual_rate, tenure_years, paths, seed=0,
+                      volatility=0.5, drift=0.0, reset_months=12):
+    """
+    Total interest paid on each of `paths` random rate paths.
+
+    Args:
+        loan_amount (float): Loan principal amount
+        annual_rate (float): Starting annual rate (percentage)
+        tenure_years (int): Loan tenure in years
+        paths (int): Number of rate paths
+        seed (int): Random seed
+        volatility (float): Standard deviation of each rate step, in
+            percentage points
+        drift (float): Mean rate step, in percentage points
+        reset_months (int): Months between rate resets
+
+    Returns:
+        numpy.ndarray: float64 total interest per path
+    """
+    n = tenure_years * 12
+    starts = np.arange(0, n, reset_months)
+    lengths = np.minimum(reset_months, n - starts)
+    rng = np.random.default_rng(seed)
+    totals = np.empty(paths)
+
+    for first in range(0, paths, PATH_CHUNK):
+        size = min(PATH_CHUNK, paths - first)
+        # One row of steps per path, drawn in path order
+        steps = drift + volatility * rng.standard_normal((size, len(starts) - 1))
+        rate = np.full(size, float(annual_rate))
+        balance = np.full(size, float(loan_amount))
+        interest = np.zeros(size)
+
+        for segment, (start, length) in enumerate(zip(starts.tolist(), lengths.tolist())):
+            if segment:
+                rate = np.clip(rate + steps[:, segment - 1], MIN_RATE, MAX_RATE)
+            r = rate / 12 / 100
+            emi = emi_values(balance, r, n - start)
+            closing = _balances_after(balance, emi, r, length)
+            interest += emi * length - (balance - closing)
+            balance = closing
+
+        # Whatever float residual is left is settled with the last payment
+        totals[first:first + size] = interest + balance
+    return totals
+
+
+def _parse_float(data, name, default, low, high):
+    """Read an optional float parameter; returns (value, error)."""
+    try:
+        value = float(data.get(name, default))
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+    if not low <= value <= high:
+        return None, f'{name} must be between {low} and {high}'
+    return value, None
+
+
+def parse_simulation_params(data, tenure_years):
+    """
+    Extract and validate Monte Carlo settings from a request body.
+
+    Returns:
+        tuple: (settings, error) - dict of simulate_interest() keyword
+        arguments plus "bins" and "percentiles", or None and an error message
+    """
+    try:
+        paths = int(data.get('paths', 10000))
+        seed = int(data.get('seed', 0))
+        reset_months = int(data.get('reset_months', 12))
+        bins = int(data.get('bins', 20))
+        percentiles = data.get('percentiles', list(DEFAULT_PERCENTILES))
+        # A string would otherwise be read character by character
+        if isinstance(percentiles, list):
+            percentiles = [float(q) for q in percentiles]
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+
+    if not 1 <= paths <= MAX_PATHS:
+        return None, f'paths must be between 1 and {MAX_PATHS}'
+    if seed < 0:
+        return None, 'seed must be non-negative'
+    if not 1 <= reset_months <= tenure_years * 12:
+        return None, f'reset_months must be between 1 and {tenure_years * 12}'
+    if not 1 <= bins <= MAX_BINS:
+        return None, f'bins must be between 1 and {MAX_BINS}'
+    if not isinstance(percentiles, list) or not percentiles or not all(0 <= q <= 100 for q in percentiles):
+        return None, 'percentiles must be a list of numbers between 0 and 100'
+
+    volatility, error = _parse_float(data, 'volatility', 0.5, 0, 10)
+    if error:
+        return None, error
+    drift, error = _parse_float(data, 'drift', 0.0, -5, 5)
+    if error:
+        return None, error
+
+    return {
+        'paths': paths,
+        'seed': seed,
+        'volatility': volatility,
+        'drift': drift,
+        'reset_months': reset_months,
+        'bins': bins,
+        'percentiles': percentiles
+    }, None
+
+
+@financial_bp.route('/emi/monte-carlo', methods=['POST'])
+def emi_monte_carlo():
+    """
+    Monte Carlo distribution of total interest under random rate paths.
+
+    Request body:
+        {
+            "loan_amount": float (1000 - 10000000),
+            "annual_rate": float (0 - 30),  # starting rate
+            "tenure_years": int (1 - 30),
+            "paths": int (1 - 100000, default 10000),
+            "seed": int (default 0),
+            "volatility": float (0 - 10, default 0.5),  # points per reset
+            "drift": float (-5 - 5, default 0),          # points per reset
+            "reset_months": int (default 12),
+            "bins": int (1 - 1000, default 20),
+            "percentiles": [float, ...] (default [5, 25, 50, 75, 95, 99])
+        }
+
+    Returns:
+        200: {
+            "paths": int,
+            "seed": int,
+            "fixed_rate_interest": float,  # calculate_emi() at the starting rate
+            "mean": float,
+            "std": float,
+            "min": float,
+            "max": float,
+            "percentiles": {"p5": float, ...},
+            "histogram": {"edges": [float], "counts": [int]}
+        }
+        400: {"error": str} - validation error
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    params, error = parse_emi_params(data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    settings, error = parse_simulation_params(data, params[2])
+    if error:
+        return jsonify({'error': error}), 400
+    bins = settings.pop('bins')
+    percentiles = settings.pop('percentiles')
+
+    totals = simulate_interest(*params, **settings)
+    counts, edges = np.histogram(totals, bins=bins)
+    values = np.percentile(totals, percentiles)
+
+    return jsonify({
+        'paths': settings['paths'],
+        'seed': settings['seed'],
+        'fixed_rate_interest': float(calculate_emi(*params)['total_interest']),
+        'mean': round(float(totals.mean()), 2),
+        'std': round(float(totals.std()), 2),
+        'min': round(float(totals.min()), 2),
+        'max': round(float(totals.max()), 2),
+        'percentiles': {f'p{q:g}': round(float(value), 2) for q, value in zip(percentiles, values)},
+        'histogram': {
+            'edges': np.round(edges, 2).tolist(),
+            'counts': counts.tolist()
+        }
+    }), 200
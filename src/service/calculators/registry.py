@@ -0,0 +1,237 @@
+"""
+Operation registry for the calculate endpoints.
+
+Each operation is an Operation object holding its arity, its validation
+rules and its compute function. The endpoints dispatch through the
+OPERATIONS dict, so adding an operation is a register() call from a
+module under src/service/calculators/ - no endpoint changes needed.
+"""
+import numpy as np
+
+# Operation name -> Operation
+OPERATIONS = {}
+
+# Operand errors by arity, matching the original calculate() messages
+_MISSING_OPERANDS = {1: 'Missing operand', 2: 'Missing operands'}
+_INVALID_OPERANDS = {1: 'Operand must be a number', 2: 'Operands must be numbers'}
+
+# Angle modes for trigonometric operations; DEG matches the frontend default
+ANGLE_MODES = ('DEG', 'RAD')
+DEFAULT_ANGLE_MODE = 'DEG'
+
+
+class Operation:
+    """
+    A calculator operation.
+
+    Rules are (condition, message) pairs checked in order after the
+    operands are converted to float; the first condition that is true
+    rejects the request with its message. Conditions are callables taking
+    `a` and `b` (e.g. lambda a, b: b == 0) and should only use comparisons
+    and arithmetic so they also work on NumPy arrays.
+
+    compute() and evaluate() report float errors (overflow, zero to a
+    negative power, complex roots of negative numbers, math domain errors)
+    as error messages instead of raising.
+    """
+
+    def __init__(self, name, arity, function, vector_function=None, rules=(), degrees=None):
+        """
+        Args:
+            name (str): Operation name used in requests
+            arity (int): Number of operands (1 or 2)
+            function (callable): Scalar implementation taking arity floats
+            vector_function (callable): Optional NumPy implementation taking
+                arity float64 arrays; defaults to looping over compute()
+            rules (tuple): (condition, message) validation rules
+            degrees (Operation): Variant used in DEG angle mode, for
+                operations taking an angle
+        """
+        self.name = name
+        self.arity = arity
+        self.function = function
+        self.vector_function = vector_function
+        self.rules = tuple(rules)
+        self.degrees = degrees
+        self.missing_message = _MISSING_OPERANDS[arity]
+        self.invalid_message = _INVALID_OPERANDS[arity]
+
+    def validate(self, a, b=None):
+        """
+        Convert operands to float and check the rules.
+
+        Args:
+            a: First operand from the request
+            b: Second operand (ignored for unary operations)
+
+        Returns:
+            tuple: (a, b, error) - floats, or None, None and an error message
+        """
+        if self.arity == 1:
+            b = None
+        if a is None or (self.arity == 2 and b is None):
+            return None, None, self.missing_message
+        try:
+            a = float(a)
+            if self.arity == 2:
+                b = float(b)
+        except (ValueError, TypeError, OverflowError):
+            return None, None, self.invalid_message
+        for condition, message in self.rules:
+            if condition(a, b):
+                return None, None, message
+        return a, b, None
+
+    def compute(self, a, b=None):
+        """
+        Compute the operation over validated operands.
+
+        Args:
+            a (float): First operand
+            b (float): Second operand (ignored for unary operations)
+
+        Returns:
+            tuple: (result, error) - the result, or None and an error message
+        """
+        try:
+            result = self.function(a) if self.arity == 1 else self.function(a, b)
+        except OverflowError:
+            return None, 'Result too large'
+        except ZeroDivisionError:
+            return None, 'Division by zero'
+        except ValueError:
+            return None, 'Math domain error'
+        if result.__class__ is complex:
+            return None, 'Result is not a real number'
+        return result, None
+
+    def evaluate(self, a, b=None):
+        """
+        Validate and compute in one call.
+
+        Returns:
+            tuple: (result, error) - the result, or None and an error message
+        """
+        a, b, error = self.validate(a, b)
+        if error:
+            return None, error
+        return self.compute(a, b)
+
+    def compute_many(self, a, b=None):
+        """
+        Compute the operation over many validated operands in one pass.
+
+        Elements whose vectorized result is not finite are recomputed with
+        the scalar path, so inf/nan handling and errors match compute().
+
+        Args:
+            a (list): First operands (floats)
+            b (list): Second operands (floats; ignored for unary operations)
+
+        Returns:
+            list: (result, error) tuples in input order
+        """
+        if self.vector_function is None:
+            return [self.compute(a[i], b[i] if b else None) for i in range(len(a))]
+
+        arrays = [np.asarray(a, dtype=np.float64)]
+        if self.arity == 2:
+            arrays.append(np.asarray(b, dtype=np.float64))
+        with np.errstate(all='ignore'):
+            values = self.vector_function(*arrays)
+
+        results = [(value, None) for value in values.tolist()]
+        if values.dtype.kind == 'f':
+            for i in np.flatnonzero(~np.isfinite(values)).tolist():
+                results[i] = self.compute(a[i], b[i] if self.arity == 2 else None)
+        return results
+
+    def compute_array(self, a, b=None):
+        """
+        Validate and compute over float64 arrays without per-element Python.
+
+        Used by the array and binary endpoints. Elements failing a rule, or
+        whose result is not finite, are marked invalid and their value is NaN.
+
+        Args:
+            a (numpy.ndarray): First operands (float64)
+            b (numpy.ndarray): Second operands (float64; None for unary)
+
+        Returns:
+            tuple: (values, valid) - float64 results and a boolean mask
+        """
+        operands = (a,) if self.arity == 1 else (a, b)
+        valid = np.ones(len(a), dtype=bool)
+        with np.errstate(all='ignore'):
+            for condition, _ in self.rules:
+                valid &= ~condition(a, b)
+            if valid.all():
+                values = self._apply_vector(*operands)
+            else:
+                values = np.full(len(a), np.nan)
+                values[valid] = self._apply_vector(*(operand[valid] for operand in operands))
+        valid &= np.isfinite(values)
+        values[~valid] = np.nan
+        return values, valid
+
+    def _apply_vector(self, *operands):
+        """Apply the vector function, falling back to compute() per element."""
+        if self.vector_function is not None:
+            return np.asarray(self.vector_function(*operands), dtype=np.float64)
+        results = [self.compute(*values)[0] for values in zip(*(o.tolist() for o in operands))]
+        return np.array([np.nan if r is None else r for r in results], dtype=np.float64)
+
+
+def register(operation):
+    """
+    Register an operation, replacing any operation with the same name.
+
+    Args:
+        operation (Operation): Operation to register
+
+    Returns:
+        Operation: The registered operation
+    """
+    OPERATIONS[operation.name] = operation
+    return operation
+
+
+def get_operation(name):
+    """
+    Look up an operation by name.
+
+    Args:
+        name (str): Operation name from the request
+
+    Returns:
+        Operation or None: The registered operation, or None if unknown
+    """
+    try:
+        return OPERATIONS.get(name)
+    except TypeError:
+        # Unhashable names (lists, objects) from JSON are simply unknown
+        return None
+
+
+def resolve_operation(name, angle_mode=None):
+    """
+    Look up the operation to run for a request.
+
+    Args:
+        name (str): Operation name from the request
+        angle_mode (str): 'DEG' or 'RAD' (default DEFAULT_ANGLE_MODE); selects
+            the degree variant of operations taking an angle
+
+    Returns:
+        tuple: (operation, error) - the Operation, or None and an error message
+    """
+    operation = get_operation(name)
+    if operation is None:
+        return None, 'Invalid operation'
+    if angle_mode is None:
+        angle_mode = DEFAULT_ANGLE_MODE
+    if angle_mode not in ANGLE_MODES:
+        return None, 'angle_mode must be DEG or RAD'
+    if angle_mode == 'DEG' and operation.degrees is not None:
+        return operation.degrees, None
+    return operation, None
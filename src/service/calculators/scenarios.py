@@ -0,0 +1,401 @@
+"""
+Repayment scenarios: lump-sum prepayments, EMI step-ups and rate resets.
+
+A scenario replays the loan month by month from calculate_emi()'s EMI,
+in integer cents, applying its events:
+
+    prepayments   lump sums paid together with a month's installment
+    step_up       the EMI grows by a percentage every N months
+    rate_resets   a new annual rate applies from a month onwards
+
+With the "reduce_tenure" strategy (default) the EMI is kept and the loan
+ends early; "reduce_emi" recomputes the EMI over the remaining original
+tenure after every prepayment and rate reset. Monthly interest is the
+balance times the exact monthly rate, rounded half up to the cent. While
+the loan is still on an EMI's planned term, the last installment of the
+term settles the balance, absorbing EMI rounding as amortization_schedule()
+does.
+
+Scenarios are independent, so large sets are split into chunks and fanned
+out to a ProcessPoolExecutor; sets smaller than PARALLEL_MIN_SCENARIOS run
+in-process, where pool overhead would dominate. The pool has one worker
+per CPU unless configure() sets a count (SCENARIO_WORKERS in app.py).
+"""
+import atexit
+import itertools
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from flask import jsonify, request
+from src.service.calculators.financial import financial_bp, calculate_emi, parse_emi_params
+from src.service.calculators.amortization import emi_cents, to_cents
+
+# Largest scenario set accepted per request
+MAX_SCENARIOS = 5000
+
+# Largest number of prepayments or rate resets per scenario
+MAX_EVENTS = 360
+
+# A loan still outstanding after this many months is reported as an error
+MAX_MONTHS = 600
+
+# Smaller sets are simulated in-process
+PARALLEL_MIN_SCENARIOS = 32
+
+# Chunks handed to each worker, to even out uneven scenario costs
+CHUNKS_PER_WORKER = 4
+
+STRATEGIES = ('reduce_tenure', 'reduce_emi')
+
+_workers = None
+_executor = None
+
+
+def configure(workers=None):
+    """
+    Set the number of worker processes used for large scenario sets.
+
+    Args:
+        workers (int or None): Worker count, or None for one per CPU
+
+    Raises:
+        ValueError: If workers is not a positive integer
+    """
+    global _workers
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise ValueError('workers must be a positive integer')
+    shutdown()
+    _workers = workers
+
+
+def get_workers():
+    """Number of worker processes used for large scenario sets."""
+    return _workers or os.cpu_count() or 1
+
+
+def shutdown():
+    """Stop the worker pool, if one is running."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+atexit.register(shutdown)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        # Workers are spawned rather than forked, so they never inherit
+        # locks held by the web server's threads
+        _executor = ProcessPoolExecutor(
+            max_workers=get_workers(),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _executor
+
+
+def _ratio(value):
+    """Exact integer ratio of a number's decimal text (8.5 -> (17, 2))."""
+    return Decimal(str(value)).as_integer_ratio()
+
+
+def simulate(loan, scenario):
+    """
+    Replay a loan month by month under one scenario.
+
+    Args:
+        loan (tuple): (loan_amount, annual_rate, tenure_years) as returned
+            by parse_emi_params()
+        scenario (dict): Normalized scenario from parse_scenario()
+
+    Returns:
+        dict: {"months", "total_payment", "total_interest", "total_prepaid",
+        "final_emi"} with amounts in integer cents, or {"error": str}
+    """
+    loan_amount, annual_rate, tenure_years = loan
+    tenure_months = tenure_years * 12
+    prepayments = scenario['prepayments']
+    rate_resets = scenario['rate_resets']
+    step_up = scenario['step_up']
+    reduce_emi = scenario['strategy'] == 'reduce_emi'
+
+    balance = to_cents(loan_amount)
+    emi = int(calculate_emi(loan_amount, annual_rate, tenure_years)['emi'] * 100)
+    rate_num, rate_den = _ratio(annual_rate)
+    rate_den *= 1200
+    total_payment = total_interest = total_prepaid = 0
+    # Month whose installment settles the loan, while on a planned term
+    end_month = tenure_months
+    month = 0
+
+    while balance > 0:
+        month += 1
+        if month > MAX_MONTHS:
+            return {'error': f'Loan not repaid within {MAX_MONTHS} months'}
+
+        if month in rate_resets:
+            annual_rate = rate_resets[month]
+            rate_num, rate_den = _ratio(annual_rate)
+            rate_den *= 1200
+            if reduce_emi and month <= tenure_months:
+                emi = emi_cents(balance, annual_rate, tenure_months - month + 1)
+            else:
+                end_month = None
+
+        if step_up and month > 1 and (month - 1) % step_up['every_months'] == 0:
+            step_num, step_den = step_up['ratio']
+            emi = (2 * emi * step_num + step_den) // (2 * step_den)
+            end_month = None
+
+        interest = (2 * balance * rate_num + rate_den) // (2 * rate_den)
+        due = balance + interest
+        if emi <= interest:
+            return {'error': f'EMI does not cover the interest in month {month}'}
+
+        payment = due if month == end_month else min(emi, due)
+        balance = due - payment
+        total_interest += interest
+        total_payment += payment
+
+        extra = prepayments.get(month)
+        if extra and balance:
+            extra = min(extra, balance)
+            balance -= extra
+            total_prepaid += extra
+            if reduce_emi and balance and month < tenure_months:
+                emi = emi_cents(balance, annual_rate, tenure_months - month)
+            else:
+                end_month = None
+
+    return {
+        'months': month,
+        'total_payment': total_payment + total_prepaid,
+        'total_interest': total_interest,
+        'total_prepaid': total_prepaid,
+        'final_emi': emi
+    }
+
+
+def simulate_many(loan, scenarios):
+    """Simulate a list of scenarios in order (one worker task)."""
+    return [simulate(loan, scenario) for scenario in scenarios]
+
+
+def run_scenarios(loan, scenarios):
+    """
+    Simulate scenarios, fanning large sets out to the worker pool.
+
+    Args:
+        loan (tuple): (loan_amount, annual_rate, tenure_years)
+        scenarios (list): Normalized scenarios
+
+    Returns:
+        tuple: (results, workers) - simulate() results in input order, and
+        the number of processes used
+    """
+    workers = get_workers()
+    if workers == 1 or len(scenarios) < PARALLEL_MIN_SCENARIOS:
+        return simulate_many(loan, scenarios), 1
+
+    size = -(-len(scenarios) // (workers * CHUNKS_PER_WORKER))
+    chunks = [scenarios[i:i + size] for i in range(0, len(scenarios), size)]
+    try:
+        results = _get_executor().map(simulate_many, itertools.repeat(loan), chunks)
+        return [result for chunk in results for result in chunk], workers
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OS); start a fresh pool next time
+        shutdown()
+        return simulate_many(loan, scenarios), 1
+
+
+def _parse_events(events, field):
+    """Convert a list of {"month", field} events to [(month, value)]."""
+    if not isinstance(events, list):
+        raise TypeError('events must be a list')
+    return [(int(event['month']), float(event[field])) for event in events]
+
+
+def parse_scenario(data, tenure_years, index=0):
+    """
+    Validate one scenario and convert it to the form simulate() expects.
+
+    Request form:
+        {
+            "name": str (optional),
+            "strategy": "reduce_tenure" | "reduce_emi" (optional),
+            "prepayments": [{"month": int, "amount": float}, ...],
+            "step_up": {"percent": float, "every_months": int (default 12)},
+            "rate_resets": [{"month": int, "annual_rate": float}, ...]
+        }
+
+    Months count from 1 and must fall within the original tenure.
+
+    Args:
+        data (dict): Scenario from the request body
+        tenure_years (int): Tenure of the base loan
+        index (int): Position in the request, for the default name
+
+    Returns:
+        tuple: (scenario, error) - normalized scenario, or None and an
+        error message
+    """
+    if not isinstance(data, dict):
+        return None, 'Scenario must be an object'
+
+    tenure_months = tenure_years * 12
+    strategy = data.get('strategy', 'reduce_tenure')
+    if strategy not in STRATEGIES:
+        return None, f'strategy must be one of: {", ".join(STRATEGIES)}'
+
+    try:
+        prepayments = _parse_events(data.get('prepayments', []), 'amount')
+        rate_resets = _parse_events(data.get('rate_resets', []), 'annual_rate')
+        step_up = data.get('step_up')
+        if step_up is not None:
+            percent = float(step_up['percent'])
+            every_months = int(step_up.get('every_months', 12))
+    except (ValueError, TypeError, OverflowError, KeyError, AttributeError):
+        return None, 'Invalid parameter types'
+
+    values = [value for _, value in prepayments + rate_resets]
+    if step_up is not None:
+        values.append(percent)
+    if not all(math.isfinite(value) for value in values):
+        return None, 'Parameters must be finite numbers'
+
+    if len(prepayments) > MAX_EVENTS or len(rate_resets) > MAX_EVENTS:
+        return None, f'Too many events (max {MAX_EVENTS})'
+
+    for month, _ in prepayments + rate_resets:
+        if month < 1 or month > tenure_months:
+            return None, f'Event month must be between 1 and {tenure_months}'
+
+    amounts = {}
+    for month, amount in prepayments:
+        if amount <= 0:
+            return None, 'Prepayment amount must be positive'
+        # Anything above the largest loan is clamped to the balance anyway
+        if amount > 10000000:
+            return None, 'Prepayment amount must be at most $10,000,000'
+        amounts[month] = amounts.get(month, 0) + to_cents(amount)
+
+    for _, annual_rate in rate_resets:
+        if annual_rate < 0 or annual_rate > 30:
+            return None, 'Annual rate must be between 0% and 30%'
+
+    if step_up is not None:
+        if percent <= 0 or percent > 100:
+            return None, 'Step-up percent must be between 0% and 100%'
+        if every_months < 1 or every_months > tenure_months:
+            return None, f'Step-up interval must be between 1 and {tenure_months} months'
+        percent_num, percent_den = _ratio(percent)
+        step_up = {
+            'ratio': (100 * percent_den + percent_num, 100 * percent_den),
+            'every_months': every_months
+        }
+
+    return {
+        'name': str(data.get('name', f'scenario {index + 1}')),
+        'strategy': strategy,
+        'prepayments': amounts,
+        'rate_resets': dict(rate_resets),
+        'step_up': step_up
+    }, None
+
+
+_NO_EVENTS = {'strategy': 'reduce_tenure', 'prepayments': {}, 'rate_resets': {}, 'step_up': None}
+
+
+def _amounts(result):
+    """Convert a simulate() result from cents to JSON floats."""
+    return {
+        'months': result['months'],
+        'emi': result['final_emi'] / 100,
+        'total_payment': result['total_payment'] / 100,
+        'total_interest': result['total_interest'] / 100,
+        'total_prepaid': result['total_prepaid'] / 100
+    }
+
+
+@financial_bp.route('/emi/scenarios', methods=['POST'])
+def emi_scenarios():
+    """
+    Compare repayment scenarios for one loan.
+
+    Request body:
+        {
+            "loan_amount": float (1000 - 10000000),
+            "annual_rate": float (0 - 30),
+            "tenure_years": int (1 - 30),
+            "scenarios": [scenario, ...]  # see parse_scenario()
+        }
+
+    Returns:
+        200: {
+            "baseline": {"months", "emi", "total_payment", "total_interest",
+                         "total_prepaid"},
+            "scenarios": [{"name", "months", "emi" (final EMI),
+                           "total_payment", "total_interest", "total_prepaid",
+                           "interest_saved", "months_saved"} | {"name", "error"}],
+            "count": int,
+            "errors": [{"index": int, "error": str}],
+            "workers": int  # processes used
+        }
+        400: {"error": str} - validation error
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    loan, error = parse_emi_params(data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    items = data.get('scenarios')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'scenarios must be a non-empty list'}), 400
+    if len(items) > MAX_SCENARIOS:
+        return jsonify({'error': f'Too many scenarios (max {MAX_SCENARIOS})'}), 400
+
+    scenarios = []
+    results = [None] * len(items)
+    errors = []
+    for index, item in enumerate(items):
+        scenario, error = parse_scenario(item, loan[2], index)
+        if error:
+            name = item.get('name') if isinstance(item, dict) else None
+            results[index] = {'name': str(name or f'scenario {index + 1}'), 'error': error}
+            errors.append({'index': index, 'error': error})
+        else:
+            scenarios.append((index, scenario))
+
+    baseline = _amounts(simulate(loan, _NO_EVENTS))
+    simulated, workers = run_scenarios(loan, [scenario for _, scenario in scenarios])
+
+    for (index, scenario), result in zip(scenarios, simulated):
+        if 'error' in result:
+            results[index] = {'name': scenario['name'], 'error': result['error']}
+            errors.append({'index': index, 'error': result['error']})
+            continue
+        amounts = _amounts(result)
+        results[index] = {
+            'name': scenario['name'],
+            **amounts,
+            'interest_saved': round(baseline['total_interest'] - amounts['total_interest'], 2),
+            'months_saved': baseline['months'] - amounts['months']
+        }
+
+    errors.sort(key=lambda error: error['index'])
+    return jsonify({
+        'baseline': baseline,
+        'scenarios': results,
+        'count': len(results),
+        'errors': errors,
+        'workers': workers
+    }), 200
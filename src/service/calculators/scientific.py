@@ -0,0 +1,71 @@
+"""
+Scientific functions for the calculate endpoints.
+
+Importing this module registers sin, cos, tan, sqrt, log, ln and exp in
+the operation registry. Domain errors and rounding match
+calculateScientific() in static/app.js, so the API and the browser
+return the same answers: trigonometric functions honour the DEG/RAD
+angle mode, and results are rounded to 1e-10 with Math.round semantics
+(ties toward +infinity).
+"""
+import math
+import numpy as np
+from src.service.calculators.registry import Operation, register
+
+_DEGREES_TO_RADIANS = math.pi / 180
+
+# Above this magnitude a float scaled by 1e10 is already an integer
+_ROUNDING_LIMIT = 2.0 ** 52
+
+
+def round_like_js(value):
+    """
+    Round a float to 1e-10 the way the frontend does.
+
+    Equivalent to JavaScript's Math.round(value * 1e10) / 1e10.
+    """
+    scaled = value * 1e10
+    if abs(scaled) < _ROUNDING_LIMIT:
+        scaled = math.floor(scaled + 0.5)
+    return scaled / 1e10
+
+
+def round_like_js_array(values):
+    """Vectorized round_like_js() for float64 arrays."""
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = values * 1e10
+        return np.where(np.abs(scaled) < _ROUNDING_LIMIT, np.floor(scaled + 0.5), scaled) / 1e10
+
+
+def _scientific(name, scalar, vector, rules=(), degrees=False):
+    """Build a rounded unary operation, with a degree variant for trig."""
+    def function(a):
+        return round_like_js(scalar(a))
+
+    def vector_function(a):
+        return round_like_js_array(vector(a))
+
+    degree_variant = None
+    if degrees:
+        degree_variant = _scientific(
+            name,
+            lambda a: scalar(a * _DEGREES_TO_RADIANS),
+            lambda a: vector(a * _DEGREES_TO_RADIANS),
+            rules
+        )
+    return Operation(name, 1, function, vector_function, rules=rules, degrees=degree_variant)
+
+
+register(_scientific('sin', math.sin, np.sin, degrees=True))
+register(_scientific('cos', math.cos, np.cos, degrees=True))
+register(_scientific('tan', math.tan, np.tan, degrees=True))
+register(_scientific('sqrt', math.sqrt, np.sqrt, rules=[
+    (lambda a, b: a < 0, 'Cannot take square root of negative number'),
+]))
+register(_scientific('log', math.log10, np.log10, rules=[
+    (lambda a, b: a <= 0, 'Logarithm requires positive number'),
+]))
+register(_scientific('ln', math.log, np.log, rules=[
+    (lambda a, b: a <= 0, 'Natural log requires positive number'),
+]))
+register(_scientific('exp', math.exp, np.exp))
@@ -0,0 +1,257 @@
+"""
+SIP / recurring-deposit calculator: future value of regular monthly
+contributions, with an optional annual step-up.
+
+Contributions are monthly; compounding uses COMPOUNDING_FREQUENCIES from
+financial.py, converted to the equivalent monthly growth factor
+q = (1 + r/n)^(n/12). With G = q^12 the yearly growth, s = 1 + step-up and
+A the value at year end of one unit paid every month of that year
+(q (q^12 - 1) / (q - 1) when paid at the start of the month, as in a SIP;
+without the leading q when paid at the end, as in a recurring deposit),
+the value after Y years is the geometric series
+
+    V(Y) = C * A * sum(s^y * G^(Y-1-y), y = 0..Y-1)
+         = C * A * s^(Y-1) * (e^(Y d) - 1) / (e^d - 1),   d = ln G - ln s
+
+and the amount invested is 12 C (s^Y - 1) / (s - 1). Both are evaluated
+with expm1/log1p, so they stay accurate when the rate or step-up is 0 or
+when G is close to s, and every year of every plan is computed in one
+NumPy pass with no loop over periods. Amounts are float64, rounded half
+up to the cent.
+"""
+import numpy as np
+from flask import jsonify, request
+from src.service.calculators.financial import financial_bp, round_cents, COMPOUNDING_FREQUENCIES
+from src.service.calculators.decimal_power import MAX_RESULT_DIGITS
+
+# Largest batch accepted per request
+BATCH_MAX_ITEMS = 10000
+
+MAX_YEARS = 50
+
+TIMINGS = ('start', 'end')
+
+
+def _series_ratio(log_growth, years):
+    """(e^(Y x) - 1) / (e^x - 1) per item and year, with its limit Y at x = 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.expm1(years * log_growth) / np.expm1(log_growth)
+    return np.where(log_growth == 0, years, ratio)
+
+
+def sip_series(monthly_investment, annual_rate, years, periods_per_year, step_up_percent=0, timing='start'):
+    """
+    Year-by-year invested amount and value of SIP plans (vectorized).
+
+    Args:
+        monthly_investment: Contribution per month in the first year
+        annual_rate: Annual return rate (percentage)
+        years: Plan length in whole years
+        periods_per_year: Compounding periods per year (12, 4 or 1)
+        step_up_percent: Yearly increase of the contribution (percentage)
+        timing: 'start' or 'end' of month contributions, per plan
+
+    Returns:
+        tuple: (invested, value) float64 arrays of shape (plans, max years),
+        unrounded; row i is meaningful for its first years[i] columns
+    """
+    C = np.asarray(monthly_investment, dtype=np.float64).reshape(-1, 1)
+    r = np.asarray(annual_rate, dtype=np.float64).reshape(-1, 1) / 100
+    n = np.asarray(periods_per_year, dtype=np.float64).reshape(-1, 1)
+    log_step = np.log1p(np.asarray(step_up_percent, dtype=np.float64).reshape(-1, 1) / 100)
+    at_start = (np.asarray(timing) == 'start').reshape(-1, 1)
+    Y = np.arange(1, int(np.max(years)) + 1, dtype=np.float64)
+
+    log_q = n / 12 * np.log1p(r / n)
+    year_end_value = _series_ratio(log_q, 12) * np.where(at_start, np.exp(log_q), 1)
+    value = C * year_end_value * np.exp((Y - 1) * log_step) * _series_ratio(12 * log_q - log_step, Y)
+    invested = 12 * C * _series_ratio(log_step, Y)
+    return invested, value
+
+
+def parse_sip_params(data):
+    """
+    Extract and validate SIP parameters from a request body.
+
+    Args:
+        data (dict): Request body with monthly_investment, annual_rate,
+            years and optional frequency, step_up_percent and timing
+
+    Returns:
+        tuple: ((monthly_investment, annual_rate, years, frequency,
+        step_up_percent, timing), error) - converted parameters, or None
+        and an error message
+    """
+    try:
+        monthly_investment = data.get('monthly_investment')
+        annual_rate = data.get('annual_rate')
+        years = data.get('years')
+
+        if monthly_investment is None:
+            return None, 'monthly_investment is required'
+        if annual_rate is None:
+            return None, 'annual_rate is required'
+        if years is None:
+            return None, 'years is required'
+
+        monthly_investment = float(monthly_investment)
+        annual_rate = float(annual_rate)
+        years = int(years)
+        step_up_percent = float(data.get('step_up_percent', 0))
+
+    except (ValueError, TypeError, OverflowError):
+        # int() raises OverflowError for an infinite years value
+        return None, 'Invalid parameter types'
+
+    # Written as "not in range" so NaN is rejected too
+    if not 1 <= monthly_investment <= 10000000:
+        return None, 'Monthly investment must be between $1 and $10,000,000'
+
+    if not 0 <= annual_rate <= 100:
+        return None, 'Rate must be between 0% and 100%'
+
+    if years < 1 or years > MAX_YEARS:
+        return None, f'Years must be between 1 and {MAX_YEARS}'
+
+    if not 0 <= step_up_percent <= 100:
+        return None, 'Step-up must be between 0% and 100%'
+
+    frequency = data.get('frequency', 'monthly')
+    if not isinstance(frequency, str) or frequency.lower() not in COMPOUNDING_FREQUENCIES:
+        return None, 'Frequency must be one of: monthly, quarterly, annual'
+
+    timing = data.get('timing', 'start')
+    if timing not in TIMINGS:
+        return None, 'timing must be start or end'
+
+    return (monthly_investment, annual_rate, years, frequency.lower(), step_up_percent, timing), None
+
+
+def sip_results(plans, series=True):
+    """
+    Compute parsed plans in one vectorized pass.
+
+    Args:
+        plans (list): Parameter tuples from parse_sip_params()
+        series (bool): Include the year-by-year series
+
+    Returns:
+        list: One result dict per plan, or {"error": str} if too large
+    """
+    monthly_investment, annual_rate, years, frequency, step_up_percent, timing = zip(*plans)
+    periods = [COMPOUNDING_FREQUENCIES[name] for name in frequency]
+    invested, value = sip_series(monthly_investment, annual_rate, years, periods, step_up_percent, timing)
+    invested = round_cents(invested)
+    value = round_cents(value)
+
+    results = []
+    for row, plan_years in enumerate(years):
+        total_invested = float(invested[row, plan_years - 1])
+        future_value = float(value[row, plan_years - 1])
+        if not future_value < 10 ** MAX_RESULT_DIGITS:
+            results.append({'error': f'Result too large (max {MAX_RESULT_DIGITS} digits)'})
+            continue
+        result = {
+            'total_invested': total_invested,
+            'future_value': future_value,
+            'gains': round(future_value - total_invested, 2)
+        }
+        if series:
+            result['series'] = {
+                'invested': invested[row, :plan_years].tolist(),
+                'value': value[row, :plan_years].tolist()
+            }
+        results.append(result)
+    return results
+
+
+@financial_bp.route('/sip', methods=['POST'])
+def sip_calculator():
+    """
+    SIP / recurring-deposit future value endpoint.
+
+    Request body:
+        {
+            "monthly_investment": float (1 - 10000000),
+            "annual_rate": float (0 - 100),
+            "years": int (1 - 50),
+            "frequency": "monthly" | "quarterly" | "annual" (default: "monthly"),
+            "step_up_percent": float (0 - 100, default 0),  # yearly increase
+            "timing": "start" | "end" (default: "start")  # of each month
+        }
+
+    Returns:
+        200: {
+            "total_invested": float,
+            "future_value": float,
+            "gains": float,
+            "series": {"invested": [float], "value": [float]}  # one per year
+        }
+        400: {"error": str} - validation error
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    params, error = parse_sip_params(data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    result = sip_results([params])[0]
+    if 'error' in result:
+        return jsonify(result), 400
+
+    return jsonify(result), 200
+
+
+@financial_bp.route('/sip/batch', methods=['POST'])
+def sip_batch():
+    """
+    Batch SIP endpoint for comparing plans.
+
+    Request body:
+        [plan, ...] or {"items": [plan, ...], "series": bool (default false)}
+        (max 10,000 plans)
+
+    Returns:
+        200: {"results": [result | {"error": str}], "count": int, "errors": int}
+        400: {"error": str} - malformed batch
+    """
+    data = request.get_json(silent=True)
+
+    series = False
+    if isinstance(data, dict):
+        series = data.get('series', False)
+        data = data.get('items')
+    if not isinstance(data, list) or not data:
+        return jsonify({'error': 'Request body must be a non-empty JSON array of items'}), 400
+    if len(data) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Too many items (max {BATCH_MAX_ITEMS})'}), 400
+    if not isinstance(series, bool):
+        return jsonify({'error': 'series must be true or false'}), 400
+
+    results = [None] * len(data)
+    indexes = []
+    plans = []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            results[index] = {'error': 'Item must be a JSON object'}
+            continue
+        params, error = parse_sip_params(item)
+        if error:
+            results[index] = {'error': error}
+            continue
+        indexes.append(index)
+        plans.append(params)
+
+    # One vectorized pass over all valid plans
+    if plans:
+        for index, result in zip(indexes, sip_results(plans, series)):
+            results[index] = result
+
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'errors': sum(1 for item in results if 'error' in item)
+    }), 200
@@ -0,0 +1,363 @@
+"""
+Inverse EMI solvers: affordable principal, tenure and rate.
+
+Each solver inverts the annuity formula used by calculate_emi(),
+
+    EMI = P * r * g / (g - 1),   g = (1 + r)^n   (EMI = P / n when r = 0)
+
+for whole arrays of targets at once:
+
+- principal: closed form, P = EMI * (g - 1) / (r * g), rounded down to
+  the cent so the EMI never exceeds the target
+- tenure: closed form, n = -ln(1 - P * r / EMI) / ln(1 + r)
+- rate: no closed form; solved with a vectorized Newton iteration that
+  falls back to bisection whenever a step leaves the bracket
+
+Every solver reports the residual EMI(solution) - target per item, and
+the rate solver also reports iterations and convergence.
+"""
+import numpy as np
+from flask import jsonify, request
+from src.service.calculators.financial import financial_bp
+
+# Largest number of targets solved per request
+SOLVER_MAX_ITEMS = 10000
+
+# Rate solver settings: monthly-rate bracket, iteration cap and tolerance
+# on |EMI(r) - target| relative to the target
+MAX_MONTHLY_RATE = 30 / 12 / 100
+MAX_ITERATIONS = 60
+RELATIVE_TOLERANCE = 1e-12
+
+# Below this monthly rate the annuity formula is evaluated by its series
+SMALL_RATE = 1e-9
+
+
+def emi_values(P, r, n):
+    """
+    Vectorized EMI for monthly rate r and n months (unrounded).
+
+    Args:
+        P, r, n (numpy.ndarray): Principal, monthly rate, months
+
+    Returns:
+        numpy.ndarray: EMI per item
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # P r / (1 - (1 + r)^-n), stable for small r
+        emi = P * r / -np.expm1(-n * np.log1p(r))
+        small = P / n * (1 + r * (n + 1) / 2)
+    return np.where(r < SMALL_RATE, small, emi)
+
+
+def _emi_derivative(P, r, n):
+    """d EMI / d r for the Newton step."""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_growth = np.log1p(r)
+        one_minus_discount = -np.expm1(-n * log_growth)
+        discount_slope = n * np.exp(-(n + 1) * log_growth)   # n (1 + r)^-(n+1)
+        derivative = P * (one_minus_discount - r * discount_slope) / one_minus_discount ** 2
+        small = P * (n + 1) / (2 * n)
+    return np.where(r < SMALL_RATE, small, derivative)
+
+
+def solve_principal(emi, annual_rate, tenure_years):
+    """
+    Largest loan whose EMI does not exceed the target.
+
+    Args:
+        emi, annual_rate, tenure_years (numpy.ndarray): Targets and terms
+
+    Returns:
+        dict: {'loan_amount', 'residual'} arrays
+    """
+    r = annual_rate / 12 / 100
+    n = tenure_years * 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        principal = np.where(r == 0, emi * n, emi * -np.expm1(-n * np.log1p(r)) / r)
+    principal = np.floor(principal * 100 + 1e-6) / 100
+    return {
+        'loan_amount': principal,
+        'residual': emi_values(principal, r, n) - emi
+    }
+
+
+def solve_tenure(emi, loan_amount, annual_rate):
+    """
+    Months needed to repay a loan at a given EMI.
+
+    Items whose EMI does not cover the first month's interest come back
+    as NaN.
+
+    Args:
+        emi, loan_amount, annual_rate (numpy.ndarray): Targets and terms
+
+    Returns:
+        dict: {'tenure_months', 'residual'} arrays
+    """
+    r = annual_rate / 12 / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        months = np.where(
+            r == 0,
+            loan_amount / emi,
+            -np.log1p(-loan_amount * r / emi) / np.log1p(r)
+        )
+    return {
+        'tenure_months': months,
+        'residual': emi_values(loan_amount, r, months) - emi
+    }
+
+
+def solve_rate(emi, loan_amount, tenure_years):
+    """
+    Annual rate at which a loan's EMI equals the target.
+
+    Targets must lie between the zero-rate EMI (P / n) and the EMI at 30%;
+    the root is bracketed in that interval. Each iteration takes a Newton
+    step where it stays inside the bracket and bisects otherwise, so it
+    converges for every valid item. Converged items drop out of the
+    working set.
+
+    Args:
+        emi, loan_amount, tenure_years (numpy.ndarray): Targets and terms
+
+    Returns:
+        dict: {'annual_rate', 'residual', 'iterations', 'converged'} arrays
+    """
+    n = tenure_years * 12
+    size = emi.shape[0]
+    low = np.zeros(size)
+    high = np.full(size, MAX_MONTHLY_RATE)
+    # Start from the small-rate approximation EMI ~ P/n (1 + r (n+1)/2)
+    rate = np.clip((emi * n / loan_amount - 1) * 2 / (n + 1), 0, MAX_MONTHLY_RATE)
+    iterations = np.zeros(size, dtype=np.int64)
+    converged = np.zeros(size, dtype=bool)
+
+    active = np.arange(size)
+    for _ in range(MAX_ITERATIONS):
+        P, E, N, r = loan_amount[active], emi[active], n[active], rate[active]
+        error = emi_values(P, r, N) - E
+        done = np.abs(error) <= RELATIVE_TOLERANCE * E
+        converged[active[done]] = True
+
+        keep = ~done
+        active, P, E, N, r, error = active[keep], P[keep], E[keep], N[keep], r[keep], error[keep]
+        if not active.size:
+            break
+        iterations[active] += 1
+
+        # EMI grows with the rate, so the sign of the error moves the bracket
+        above = error > 0
+        high[active] = np.where(above, r, high[active])
+        low[active] = np.where(above, low[active], r)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = r - error / _emi_derivative(P, r, N)
+        inside = (step > low[active]) & (step < high[active])
+        rate[active] = np.where(inside, step, (low[active] + high[active]) / 2)
+
+    return {
+        'annual_rate': rate * 12 * 100,
+        'residual': emi_values(loan_amount, rate, n) - emi,
+        'iterations': iterations,
+        'converged': converged
+    }
+
+
+def _parse_columns(data, names):
+    """
+    Read number-or-list parameters and broadcast them to one length.
+
+    Returns:
+        tuple: (arrays, error) - list of float64 arrays, or None and an
+        error message
+    """
+    values = []
+    for name in names:
+        value = data.get(name)
+        if value is None or (isinstance(value, list) and None in value):
+            return None, f'{name} is required'
+        values.append(value)
+    try:
+        arrays = [np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in values]
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid parameter types'
+    try:
+        arrays = np.broadcast_arrays(*arrays)
+    except ValueError:
+        return None, 'Array parameters must have the same length'
+    if arrays[0].ndim != 1:
+        return None, 'Parameters must be numbers or flat lists of numbers'
+    if arrays[0].size > SOLVER_MAX_ITEMS:
+        return None, f'Too many items (max {SOLVER_MAX_ITEMS})'
+    return [np.array(array) for array in arrays], None
+
+
+# Per-item range checks, in order; the first failing check is reported
+_RANGE_CHECKS = {
+    'emi': (lambda v: ~(v > 0), 'EMI must be positive'),
+    'loan_amount': (lambda v: ~((v >= 1000) & (v <= 10000000)),
+                    'Loan amount must be between $1,000 and $10,000,000'),
+    'annual_rate': (lambda v: ~((v >= 0) & (v <= 30)), 'Annual rate must be between 0% and 30%'),
+    'tenure_years': (lambda v: ~((v >= 1) & (v <= 30)), 'Tenure must be between 1 and 30 years'),
+}
+
+
+def _solve(names, solver, fields, domain=None):
+    """
+    Shared body of the solver endpoints.
+
+    Args:
+        names (tuple): Request parameters, in solver argument order
+        solver (callable): Vectorized solver taking one array per parameter
+        fields (tuple): Result fields the solver returns
+        domain (callable): Optional extra check taking the arrays and
+            returning (invalid_mask, message) pairs
+    """
+    data = request.get_json()
+
+    if not data:
+        return jsonify({'error': 'Request body must be JSON'}), 400
+
+    arrays, error = _parse_columns(data, names)
+    if error:
+        return jsonify({'error': error}), 400
+    if 'tenure_years' in names:
+        index = names.index('tenure_years')
+        arrays[index] = np.trunc(arrays[index])
+
+    # Index of the first failing check per item (-1 = valid)
+    size = arrays[0].size
+    failed = np.full(size, -1)
+    # Finiteness first: the range checks let +inf through as "positive"
+    checks = [~np.isfinite(arrays).all(axis=0)]
+    texts = ['Parameters must be finite numbers']
+    checks += [_RANGE_CHECKS[name][0](array) for name, array in zip(names, arrays)]
+    texts += [_RANGE_CHECKS[name][1] for name in names]
+    if domain is not None:
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            for mask, text in domain(*arrays):
+                checks.append(mask)
+                texts.append(text)
+    for check, mask in enumerate(checks):
+        failed[(failed < 0) & mask] = check
+
+    valid = failed < 0
+    response = {}
+    diagnostics = {}
+    if valid.any():
+        solved = solver(*(array[valid] for array in arrays))
+        for field, values in solved.items():
+            column = np.full(size, None, dtype=object)
+            column[valid] = values.tolist()
+            response[field] = column.tolist()
+        finite = np.abs(solved['residual'])[np.isfinite(solved['residual'])]
+        diagnostics['max_abs_residual'] = float(finite.max()) if finite.size else None
+        if 'iterations' in solved:
+            diagnostics['max_iterations'] = int(solved['iterations'].max())
+            diagnostics['unconverged'] = int((~solved['converged']).sum())
+    else:
+        for field in fields:
+            response[field] = [None] * size
+
+    response['count'] = size
+    response['errors'] = [
+        {'index': index, 'error': texts[failed[index]]} for index in np.flatnonzero(~valid).tolist()
+    ]
+    response['diagnostics'] = diagnostics
+    return jsonify(response), 200
+
+
+@financial_bp.route('/emi/solve/principal', methods=['POST'])
+def solve_principal_endpoint():
+    """
+    Affordable principal solver.
+
+    Request body:
+        {
+            "emi": number | [number, ...],
+            "annual_rate": number | [number, ...] (0 - 30),
+            "tenure_years": int | [int, ...] (1 - 30)
+        }
+        Lists are solved elementwise; numbers are broadcast (max SOLVER_MAX_ITEMS).
+
+    Returns:
+        200: {
+            "loan_amount": [float | null, ...],  # rounded down to the cent
+            "residual": [float | null, ...],     # EMI(loan_amount) - emi
+            "count": int,
+            "errors": [{"index": int, "error": str}, ...],
+            "diagnostics": {"max_abs_residual": float}
+        }
+        400: {"error": str}
+    """
+    return _solve(('emi', 'annual_rate', 'tenure_years'), solve_principal,
+                  ('loan_amount', 'residual'))
+
+
+@financial_bp.route('/emi/solve/tenure', methods=['POST'])
+def solve_tenure_endpoint():
+    """
+    Tenure solver.
+
+    Request body:
+        {
+            "emi": number | [number, ...],
+            "loan_amount": number | [number, ...] (1000 - 10000000),
+            "annual_rate": number | [number, ...] (0 - 30)
+        }
+
+    Returns:
+        200: {
+            "tenure_months": [float | null, ...],  # fractional months
+            "residual": [float | null, ...],
+            "count": int,
+            "errors": [{"index": int, "error": str}, ...],
+            "diagnostics": {"max_abs_residual": float}
+        }
+        400: {"error": str}
+    """
+    def domain(emi, loan_amount, annual_rate):
+        # The EMI must exceed the first month's interest to ever repay
+        return [(emi <= loan_amount * annual_rate / 12 / 100,
+                 'EMI must exceed the monthly interest on the loan')]
+
+    return _solve(('emi', 'loan_amount', 'annual_rate'), solve_tenure,
+                  ('tenure_months', 'residual'), domain)
+
+
+@financial_bp.route('/emi/solve/rate', methods=['POST'])
+def solve_rate_endpoint():
+    """
+    Interest rate solver.
+
+    Request body:
+        {
+            "emi": number | [number, ...],
+            "loan_amount": number | [number, ...] (1000 - 10000000),
+            "tenure_years": int | [int, ...] (1 - 30)
+        }
+
+    Returns:
+        200: {
+            "annual_rate": [float | null, ...],  # percent
+            "residual": [float | null, ...],
+            "iterations": [int | null, ...],
+            "converged": [bool | null, ...],
+            "count": int,
+            "errors": [{"index": int, "error": str}, ...],
+            "diagnostics": {"max_abs_residual": float, "max_iterations": int,
+                            "unconverged": int}
+        }
+        400: {"error": str}
+    """
+    def domain(emi, loan_amount, tenure_years):
+        n = tenure_years * 12
+        return [
+            (emi * n < loan_amount, 'EMI too low: total payments are less than the loan'),
+            (emi > emi_values(loan_amount, np.full(n.shape, MAX_MONTHLY_RATE), n),
+             'EMI too high: rate would exceed 30%'),
+        ]
+
+    return _solve(('emi', 'loan_amount', 'tenure_years'), solve_rate,
+                  ('annual_rate', 'residual', 'iterations', 'converged'), domain)
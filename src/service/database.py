@@ -26,3 +26,16 @@ def init_db(app):
     # Create tables if they don't exist
     with app.app_context():
         db.create_all()
+        create_missing_indexes()
+
+
+def create_missing_indexes():
+    """
+    Create indexes declared on models but missing from existing tables.
+    
+    create_all() only creates indexes together with new tables, so indexes
+    added to a model later are created here.
+    """
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
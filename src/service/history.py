@@ -1,13 +1,143 @@
 """
 History management endpoints for calculation history.
+
+History is listed newest first, ordered by (timestamp, id) descending.
+Besides page numbers, GET /api/history supports keyset pagination: the
+next/prev cursors encode the (timestamp, id) of the last/first row
+returned, and the following page is fetched with a range condition on
+that key instead of OFFSET, so every page costs the same however deep
+it is.
+
+POST /api/history/batch saves many calculations at once: every entry is
+validated like a single save, the valid ones are written with one
+executemany INSERT and committed in one transaction, and entries may
+carry an idempotency key so a retried batch does not store them twice.
+
+Single saves can optionally go through a write-behind queue instead
+(history_queue, enabled by HISTORY_WRITE_BEHIND in app.py): they are
+validated, queued and answered with 202 and a provisional id at once,
+and a background thread writes the queue in batches through the same
+path as the batch endpoint. The provisional id is saved as the entry's
+idempotency key, so retried flushes never store an entry twice and the
+final id can be looked up with GET /api/history/keys/<key>.
 """
-from flask import Blueprint, request, jsonify
+import base64
+import binascii
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+import click
+from flask import Blueprint, current_app, request, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
 from src.service.database import db
-from src.service.models import CalculationHistory
+from src.service.history_stats import check_stats, get_stats, rebuild_stats, record_cleared, record_saved
+from src.service.models import CalculationHistory, HistoryIdempotencyKey, CALCULATION_TYPES
+from src.service.write_behind import WriteBehindQueue
 
 history_bp = Blueprint('history', __name__, url_prefix='/api/history')
 
+CURSOR_DIRECTIONS = ('next', 'prev')
+
+# Limits of POST /api/history/batch
+BATCH_MAX_ITEMS = 10000
+IDEMPOTENCY_KEY_MAX_LENGTH = 64
+
+# Seconds a save waits for room in a full write-behind queue before 503
+QUEUE_PUT_TIMEOUT = 0.1
+
+
+def encode_cursor(calculation, direction):
+    """
+    Build an opaque pagination cursor for a history row.
+    
+    Args:
+        calculation (CalculationHistory): Row the page starts after
+        direction (str): 'next' for older rows, 'prev' for newer rows
+    
+    Returns:
+        str: URL-safe cursor
+    """
+    key = {'t': calculation.timestamp.isoformat(), 'i': calculation.id, 'd': direction}
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor from encode_cursor().
+    
+    Args:
+        cursor (str): Cursor from a previous response
+    
+    Returns:
+        tuple: ((timestamp, id, direction), error) - the decoded key, or
+        None and an error message
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        timestamp = datetime.fromisoformat(key['t'])
+        calculation_id = key['i']
+        direction = key['d']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None, 'Invalid cursor'
+    if not isinstance(calculation_id, int) or direction not in CURSOR_DIRECTIONS:
+        return None, 'Invalid cursor'
+    return (timestamp, calculation_id, direction), None
+
+
+def history_statement(user_id, limit, offset=0, key=None):
+    """
+    Build the query for one page of a user's history.
+    
+    Selects only the to_dict() columns, ordered to match the
+    (user_id, timestamp DESC, id DESC) index so no sort step is needed.
+    
+    Args:
+        user_id (int): Owner of the calculations
+        limit (int): Rows to fetch
+        offset (int): Rows to skip, used when key is None
+        key (tuple): (timestamp, id, direction) from decode_cursor()
+    
+    Returns:
+        Select: Statement yielding rows newest first, or for a 'prev' key
+        nearest first (oldest of the newer rows first)
+    """
+    timestamp = CalculationHistory.timestamp
+    calculation_id = CalculationHistory.id
+    statement = select(*CalculationHistory.dict_columns()).where(CalculationHistory.user_id == user_id)
+    
+    if key is None:
+        return statement.order_by(timestamp.desc(), calculation_id.desc()).limit(limit).offset(offset)
+    
+    # (timestamp, id) < key, spelled with a plain bound on timestamp so
+    # the database seeks the index instead of scanning from the top
+    after_timestamp, after_id, direction = key
+    if direction == 'next':
+        # Older rows, newest first
+        return statement.where(
+            timestamp <= after_timestamp,
+            or_(timestamp < after_timestamp, calculation_id < after_id)
+        ).order_by(timestamp.desc(), calculation_id.desc()).limit(limit)
+    # Newer rows, nearest first
+    return statement.where(
+        timestamp >= after_timestamp,
+        or_(timestamp > after_timestamp, calculation_id > after_id)
+    ).order_by(timestamp.asc(), calculation_id.asc()).limit(limit)
+
+
+def _flag(name, default):
+    """Parse an optional boolean query parameter."""
+    value = request.args.get(name)
+    if value is None:
+        return default, None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True, None
+    if value.lower() in ('0', 'false', 'no'):
+        return False, None
+    return None, f'{name} must be true or false'
+
 
 @history_bp.route('', methods=['GET'])
 @login_required
@@ -18,6 +148,10 @@ def get_history():
     Query parameters:
         limit (int): Maximum number of results (default: 50, max: 100)
         page (int): Page number for pagination (default: 1)
+        cursor (str): "next" or "prev" cursor from a previous response;
+            replaces page
+        include_total (bool): Count all of the user's calculations
+            (default: true with page, false with cursor)
     
     Returns:
         200: {
@@ -30,38 +164,98 @@ def get_history():
                     "timestamp": str (ISO 8601)
                 }
             ],
-            "total": int,
-            "page": int,
-            "per_page": int
+            "total": int,  # if include_total
+            "page": int,  # page mode only
+            "per_page": int,
+            "next": str | null,  # cursor to older calculations
+            "prev": str | null  # cursor to newer calculations
         }
+        400: {"error": str} - invalid parameters or cursor
     """
     # Parse query parameters
     limit = request.args.get('limit', 50, type=int)
     page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor')
     
     # Validate parameters
     if limit < 1 or limit > 100:
         return jsonify({'error': 'Limit must be between 1 and 100'}), 400
     if page < 1:
         return jsonify({'error': 'Page must be at least 1'}), 400
+    if cursor is not None and 'page' in request.args:
+        return jsonify({'error': 'Use either page or cursor, not both'}), 400
+    include_total, error = _flag('include_total', cursor is None)
+    if error:
+        return jsonify({'error': error}), 400
     
-    # Query calculations for current user
-    query = CalculationHistory.query.filter_by(user_id=current_user.id).order_by(
-        CalculationHistory.timestamp.desc()
-    )
+    key = None
+    if cursor is not None:
+        key, error = decode_cursor(cursor)
+        if error:
+            return jsonify({'error': error}), 400
     
-    # Get total count
-    total = query.count()
+    # Query one row past the page to tell whether more follow; rows are
+    # plain tuples of the to_dict() columns, not ORM objects
+    calculations = db.session.execute(history_statement(current_user.id, limit + 1, (page - 1) * limit, key)).all()
+    more = len(calculations) > limit
+    calculations = calculations[:limit]
+    if key is None:
+        has_newer, has_older = page > 1, more
+    elif key[2] == 'prev':
+        calculations.reverse()
+        has_newer, has_older = more, True
+    else:
+        has_newer, has_older = True, more
     
-    # Paginate
-    calculations = query.limit(limit).offset((page - 1) * limit).all()
+    response = {
+        'calculations': [CalculationHistory.row_to_dict(row) for row in calculations],
+        'per_page': limit,
+        'next': encode_cursor(calculations[-1], 'next') if calculations and has_older else None,
+        'prev': encode_cursor(calculations[0], 'prev') if calculations and has_newer else None
+    }
+    if cursor is None:
+        response['page'] = page
+    if include_total:
+        # Maintained counter, not COUNT(*)
+        response['total'] = get_stats(current_user.id).total
+        db.session.commit()
     
-    return jsonify({
-        'calculations': [calc.to_dict() for calc in calculations],
-        'total': total,
-        'page': page,
-        'per_page': limit
-    }), 200
+    return jsonify(response), 200
+
+
+def validate_calculation(data):
+    """
+    Validate a calculation to save to history.
+    
+    Args:
+        data (dict): Request body or batch entry with calculation_type,
+            expression and result
+    
+    Returns:
+        tuple: (fields, error) - {"calculation_type", "expression", "result"}
+        stripped of surrounding whitespace, or None and an error message
+    """
+    # Validate required fields
+    fields = {}
+    for name in ('calculation_type', 'expression', 'result'):
+        value = data.get(name, '')
+        if not isinstance(value, str):
+            return None, f'{name} must be a string'
+        fields[name] = value.strip()
+        if not fields[name]:
+            return None, f'{name} is required'
+    
+    # Validate calculation_type
+    if fields['calculation_type'] not in CALCULATION_TYPES:
+        return None, f'Invalid calculation_type. Must be one of: {", ".join(CALCULATION_TYPES)}'
+    
+    # Validate length
+    if len(fields['expression']) > 500:
+        return None, 'expression too long (max 500 characters)'
+    if len(fields['result']) > 100:
+        return None, 'result too long (max 100 characters)'
+    
+    return fields, None
 
 
 @history_bp.route('', methods=['POST'])
@@ -79,44 +273,28 @@ def save_calculation():
     
     Returns:
         201: {"success": true, "id": int}
+        202: {"success": true, "provisional_id": str, "queued": true} -
+             write-behind mode; saved by the next flush
         400: {"error": str} - validation error
+        503: {"error": str} - write-behind queue full, with Retry-After
     """
     data = request.get_json()
     
     if not data:
         return jsonify({'error': 'Request body must be JSON'}), 400
     
-    # Validate required fields
-    calculation_type = data.get('calculation_type', '').strip()
-    expression = data.get('expression', '').strip()
-    result = data.get('result', '').strip()
-    
-    if not calculation_type:
-        return jsonify({'error': 'calculation_type is required'}), 400
-    if not expression:
-        return jsonify({'error': 'expression is required'}), 400
-    if not result:
-        return jsonify({'error': 'result is required'}), 400
+    fields, error = validate_calculation(data)
+    if error:
+        return jsonify({'error': error}), 400
     
-    # Validate calculation_type
-    valid_types = ['basic', 'scientific', 'emi', 'simple_interest', 'compound_interest']
-    if calculation_type not in valid_types:
-        return jsonify({'error': f'Invalid calculation_type. Must be one of: {", ".join(valid_types)}'}), 400
-    
-    # Validate length
-    if len(expression) > 500:
-        return jsonify({'error': 'expression too long (max 500 characters)'}), 400
-    if len(result) > 100:
-        return jsonify({'error': 'result too long (max 100 characters)'}), 400
+    if history_queue.running:
+        return queue_calculation(fields)
     
     # Create history entry
-    calculation = CalculationHistory(
-        user_id=current_user.id,
-        calculation_type=calculation_type,
-        expression=expression,
-        result=result
-    )
+    calculation = CalculationHistory(user_id=current_user.id, **fields)
     
+    # Counters first: they are built from the rows already saved
+    record_saved(current_user.id, {fields['calculation_type']: 1})
     db.session.add(calculation)
     db.session.commit()
     
@@ -126,6 +304,243 @@ def save_calculation():
     }), 201
 
 
+def queue_calculation(fields):
+    """
+    Queue a validated calculation for the write-behind writer.
+    
+    Args:
+        fields (dict): Columns from validate_calculation()
+    
+    Returns:
+        tuple: (response, status) - 202 with the provisional id, or 503
+        when the queue stays full for QUEUE_PUT_TIMEOUT
+    """
+    key = uuid.uuid4().hex
+    row = {**fields, 'timestamp': datetime.utcnow()}
+    if not history_queue.put((current_user.id, row, key), timeout=QUEUE_PUT_TIMEOUT):
+        response = jsonify({'error': 'History write queue is full, retry later'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    return jsonify({'success': True, 'provisional_id': key, 'queued': True}), 202
+
+
+def write_queued(entries):
+    """
+    Write a batch of queued calculations, one transaction per user.
+    
+    A user whose rows fail to save is rolled back alone, so the other
+    users' saves in the batch are kept.
+    
+    Args:
+        entries (list): (user_id, row, key) tuples from queue_calculation()
+    
+    Returns:
+        list: Entries that were not saved, for the queue to retry
+    """
+    by_user = {}
+    for entry in entries:
+        by_user.setdefault(entry[0], []).append(entry)
+    failed = []
+    for user_id, user_entries in by_user.items():
+        try:
+            insert_calculations(user_id, [(row, key) for _, row, key in user_entries])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            current_app.logger.warning('Queued history save failed for user %s', user_id, exc_info=True)
+            failed.extend(user_entries)
+    return failed
+
+
+# Write-behind queue for POST /api/history, off unless started (see app.py)
+history_queue = WriteBehindQueue(write_queued)
+
+
+def parse_timestamp(value):
+    """
+    Parse an entry's ISO 8601 timestamp as naive UTC, like the stored ones.
+    
+    Args:
+        value (str): Date-time, with or without offset (none means UTC)
+    
+    Returns:
+        tuple: (datetime, error) - one of them is None
+    """
+    try:
+        timestamp = datetime.fromisoformat(value)
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    except (TypeError, ValueError, OverflowError):
+        # OverflowError: an offset moves year 1 or 9999 out of range
+        return None, 'timestamp must be an ISO 8601 date-time'
+    return timestamp, None
+
+
+def validate_batch_entry(item):
+    """
+    Validate one entry of POST /api/history/batch.
+    
+    Args:
+        item: Batch entry
+    
+    Returns:
+        tuple: (row, key, error) - the columns to insert and the entry's
+        idempotency key (or None), or None, None and an error message
+    """
+    if not isinstance(item, dict):
+        return None, None, 'Item must be a JSON object'
+    
+    row, error = validate_calculation(item)
+    if error:
+        return None, None, error
+    
+    row['timestamp'] = datetime.utcnow()
+    if item.get('timestamp') is not None:
+        row['timestamp'], error = parse_timestamp(item['timestamp'])
+        if error:
+            return None, None, error
+    
+    key = item.get('idempotency_key')
+    if key is not None and (not isinstance(key, str) or not 0 < len(key) <= IDEMPOTENCY_KEY_MAX_LENGTH):
+        return None, None, f'idempotency_key must be a string of 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters'
+    return row, key, None
+
+
+def insert_calculations(user_id, entries):
+    """
+    Add validated calculations for one user to the session, without committing.
+    
+    Entries whose idempotency key is already saved, or repeated earlier in
+    entries, are not inserted again. The rest are written with one
+    executemany INSERT, together with their keys and the user's counters;
+    the caller commits (an IntegrityError then means a key was saved
+    concurrently).
+    
+    Args:
+        user_id (int): Owner of the calculations
+        entries (list): (row, key) pairs - columns from validate_batch_entry()
+            and an idempotency key or None
+    
+    Returns:
+        tuple: (results, inserted) - {"id": int} or {"id": int, "duplicate":
+        true} per entry, and the number of rows inserted
+    """
+    # Entries whose key is already saved, or repeated within the batch
+    keys = {key for _, key in entries if key is not None}
+    saved = {}
+    if keys:
+        saved = dict(db.session.execute(
+            select(HistoryIdempotencyKey.key, HistoryIdempotencyKey.calculation_id).where(
+                HistoryIdempotencyKey.user_id == user_id,
+                HistoryIdempotencyKey.key.in_(keys)
+            )
+        ).all())
+    first = {}      # key -> index of the entry that saves it
+    new_rows = []   # (index, row) of entries to insert
+    for index, (row, key) in enumerate(entries):
+        if key in saved or (key is not None and key in first):
+            continue
+        if key is not None:
+            first[key] = index
+        new_rows.append((index, row))
+    
+    results = [None] * len(entries)
+    if new_rows:
+        counts = {}
+        for _, row in new_rows:
+            counts[row['calculation_type']] = counts.get(row['calculation_type'], 0) + 1
+        
+        # Counters first: they are built from the rows already saved. Their
+        # UPDATE also takes SQLite's write lock, so nothing else inserts
+        # until the commit and the new rows get consecutive ids above
+        # last_id, in entry order (RETURNING ids in parameter order would
+        # make SQLAlchemy fall back to one INSERT per row on SQLite).
+        record_saved(user_id, counts)
+        last_id = db.session.scalar(select(func.max(CalculationHistory.id))) or 0
+        db.session.execute(insert(CalculationHistory), [
+            {'user_id': user_id, **row} for _, row in new_rows
+        ])
+        ids = db.session.scalars(
+            select(CalculationHistory.id).where(
+                CalculationHistory.user_id == user_id, CalculationHistory.id > last_id
+            ).order_by(CalculationHistory.id)
+        ).all()
+        if len(ids) != len(new_rows):
+            # Another writer got in despite the lock; never pair wrong ids
+            raise RuntimeError(f'Inserted {len(new_rows)} history rows but read back {len(ids)} ids')
+        for (index, _), calculation_id in zip(new_rows, ids):
+            results[index] = {'id': calculation_id}
+        if first:
+            db.session.execute(insert(HistoryIdempotencyKey), [
+                {'user_id': user_id, 'key': key, 'calculation_id': results[index]['id']}
+                for key, index in first.items()
+            ])
+    
+    for index, (_, key) in enumerate(entries):
+        if results[index] is None:
+            calculation_id = saved[key] if key in saved else results[first[key]]['id']
+            results[index] = {'id': calculation_id, 'duplicate': True}
+    return results, len(new_rows)
+
+
+@history_bp.route('/batch', methods=['POST'])
+@login_required
+def save_calculations():
+    """
+    Save many calculations to history in one transaction.
+    
+    Request body:
+        [item, ...] or {"items": [item, ...]} - at most BATCH_MAX_ITEMS
+        items, each the body of POST /api/history plus optional
+        "timestamp": str - ISO 8601 date-time (default: now)
+        "idempotency_key": str - up to 64 characters; an entry whose key
+            was already saved (earlier or in this batch) is not stored again
+    
+    Returns:
+        200: {"results": [{"id": int} | {"id": int, "duplicate": true} |
+              {"error": str}], "count": int, "errors": int, "inserted": int}
+        400: {"error": str} - malformed request
+        409: {"error": str} - keys saved concurrently by another request
+    """
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else data
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Request body must be a non-empty JSON array of items'}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({'error': f'Too many items (max {BATCH_MAX_ITEMS})'}), 400
+    
+    results = [None] * len(items)
+    indexes = []
+    entries = []
+    for index, item in enumerate(items):
+        row, key, error = validate_batch_entry(item)
+        if error:
+            results[index] = {'error': error}
+        else:
+            indexes.append(index)
+            entries.append((row, key))
+    
+    inserted = 0
+    if entries:
+        saved, inserted = insert_calculations(current_user.id, entries)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'An idempotency_key was saved concurrently; retry the batch'}), 409
+        for index, result in zip(indexes, saved):
+            results[index] = result
+    
+    errors = sum('error' in result for result in results)
+    return jsonify({
+        'results': results,
+        'count': len(results),
+        'errors': errors,
+        'inserted': inserted
+    }), 200
+
+
 @history_bp.route('', methods=['DELETE'])
 @login_required
 def clear_history():
@@ -135,8 +550,13 @@ def clear_history():
     Returns:
         200: {"success": true, "message": str, "deleted_count": int}
     """
-    # Delete all calculations for current user
+    # Queued saves were made before the clear: write them first
+    history_queue.flush()
+    
+    # Delete all calculations for current user, and the keys pointing to them
+    HistoryIdempotencyKey.query.filter_by(user_id=current_user.id).delete()
     deleted_count = CalculationHistory.query.filter_by(user_id=current_user.id).delete()
+    record_cleared(current_user.id)
     db.session.commit()
     
     return jsonify({
@@ -144,3 +564,54 @@ def clear_history():
         'message': f'Deleted {deleted_count} calculation(s)',
         'deleted_count': deleted_count
     }), 200
+
+
+@history_bp.route('/keys/<key>', methods=['GET'])
+@login_required
+def get_key(key):
+    """
+    Look up the calculation saved under an idempotency key or provisional id.
+    
+    Returns:
+        200: {"id": int}
+        404: {"error": str} - unknown key, or still queued
+    """
+    calculation_id = db.session.scalar(select(HistoryIdempotencyKey.calculation_id).where(
+        HistoryIdempotencyKey.user_id == current_user.id, HistoryIdempotencyKey.key == key
+    ))
+    if calculation_id is None:
+        return jsonify({'error': 'Unknown key'}), 404
+    return jsonify({'id': calculation_id}), 200
+
+
+@history_bp.route('/stats', methods=['GET'])
+@login_required
+def history_stats():
+    """
+    Get the number of saved calculations, in total and per type.
+    
+    Returns:
+        200: {"total": int, "by_type": {calculation_type: int}}
+    """
+    stats = get_stats(current_user.id)
+    response = {'total': stats.total, 'by_type': stats.counts()}
+    db.session.commit()
+    return jsonify(response), 200
+
+
+@history_bp.cli.command('check-stats')
+def check_stats_command():
+    """Report history counters that disagree with the history table."""
+    mismatches = check_stats()
+    for mismatch in mismatches:
+        click.echo(f'user {mismatch["user_id"]}: stored {mismatch["stored"]}, actual {mismatch["actual"]}')
+    click.echo(f'{len(mismatches)} mismatched counter row(s)')
+    if mismatches:
+        sys.exit(1)
+
+
+@history_bp.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute every user's history counters from the history table."""
+    rows, corrected = rebuild_stats()
+    click.echo(f'Rebuilt {rows} counter row(s), {corrected} corrected')
@@ -0,0 +1,135 @@
+"""
+Incrementally maintained per-user history counters (HistoryStats).
+
+Writers adjust a user's row in the same transaction as the history rows
+they add or delete, so reading the total is one primary-key lookup
+however long the history is. A user's row is built from COUNT(*) the
+first time it is needed (for history saved before the counters existed);
+check_stats() and rebuild_stats() compare every row against the history
+table and repair it, and are exposed as `flask history check-stats` and
+`flask history rebuild-stats`.
+"""
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from src.service.database import db
+from src.service.models import CalculationHistory, HistoryStats, CALCULATION_TYPES
+
+
+def count_history(user_id=None):
+    """
+    Count history rows per user and calculation_type with COUNT(*).
+
+    Args:
+        user_id (int): Only this user (default: every user)
+
+    Returns:
+        dict: {user_id: {calculation_type: int}} for users with history
+    """
+    statement = select(
+        CalculationHistory.user_id, CalculationHistory.calculation_type, func.count()
+    ).group_by(CalculationHistory.user_id, CalculationHistory.calculation_type)
+    if user_id is not None:
+        statement = statement.where(CalculationHistory.user_id == user_id)
+
+    counts = {}
+    with db.session.no_autoflush:
+        for owner, calculation_type, count in db.session.execute(statement):
+            counts.setdefault(owner, dict.fromkeys(CALCULATION_TYPES, 0))[calculation_type] = count
+    return counts
+
+
+def get_stats(user_id):
+    """
+    A user's counters, built from the history table if missing.
+
+    Pending (unflushed) history rows are not counted, so writers call this
+    (through record_saved()) before adding their rows to the session.
+
+    Args:
+        user_id (int): User whose counters to read
+
+    Returns:
+        HistoryStats: The user's row
+    """
+    stats = db.session.get(HistoryStats, user_id)
+    if stats is not None:
+        return stats
+
+    counts = count_history(user_id).get(user_id, dict.fromkeys(CALCULATION_TYPES, 0))
+    try:
+        with db.session.begin_nested():
+            stats = HistoryStats(user_id=user_id, total=sum(counts.values()), **counts)
+            db.session.add(stats)
+    except IntegrityError:
+        # Built concurrently by another request
+        stats = db.session.get(HistoryStats, user_id)
+    return stats
+
+
+def record_saved(user_id, counts):
+    """
+    Add newly saved calculations to a user's counters.
+
+    Call before adding the new CalculationHistory rows to the session;
+    the caller commits both together.
+
+    Args:
+        user_id (int): Owner of the new calculations
+        counts (dict): {calculation_type: number saved}
+    """
+    get_stats(user_id)
+    values = {'total': HistoryStats.total + sum(counts.values())}
+    for calculation_type, count in counts.items():
+        values[calculation_type] = getattr(HistoryStats, calculation_type) + count
+    db.session.execute(update(HistoryStats).where(HistoryStats.user_id == user_id).values(**values))
+
+
+def record_cleared(user_id):
+    """
+    Reset a user's counters after deleting all of their history.
+
+    Args:
+        user_id (int): User whose history was cleared
+    """
+    get_stats(user_id)
+    db.session.execute(update(HistoryStats).where(HistoryStats.user_id == user_id).values(
+        total=0, **dict.fromkeys(CALCULATION_TYPES, 0)
+    ))
+
+
+def check_stats():
+    """
+    Compare every user's counters with COUNT(*) over the history table.
+
+    Users without a counters row are skipped: theirs is built on first use.
+
+    Returns:
+        list: [{"user_id": int, "stored": dict, "actual": dict}] for each
+        row that differs; dicts hold "total" and each calculation_type
+    """
+    actual = count_history()
+    mismatches = []
+    for stats in HistoryStats.query.order_by(HistoryStats.user_id):
+        counts = actual.get(stats.user_id, dict.fromkeys(CALCULATION_TYPES, 0))
+        expected = {'total': sum(counts.values()), **counts}
+        stored = {'total': stats.total, **stats.counts()}
+        if stored != expected:
+            mismatches.append({'user_id': stats.user_id, 'stored': stored, 'actual': expected})
+    return mismatches
+
+
+def rebuild_stats():
+    """
+    Recompute every user's counters from the history table and commit.
+
+    Returns:
+        tuple: (rows, corrected) - rows written, and how many of them
+        existed with different counts
+    """
+    corrected = len(check_stats())
+    actual = count_history()
+    HistoryStats.query.delete()
+    for user_id, counts in actual.items():
+        db.session.add(HistoryStats(user_id=user_id, total=sum(counts.values()), **counts))
+    db.session.commit()
+    return len(actual), corrected
@@ -6,6 +6,9 @@ import bcrypt
 from flask_login import UserMixin
 from src.service.database import db
 
+# Accepted values of CalculationHistory.calculation_type
+CALCULATION_TYPES = ('basic', 'scientific', 'emi', 'simple_interest', 'compound_interest')
+
 
 class User(db.Model, UserMixin):
     """
@@ -58,24 +61,88 @@ class CalculationHistory(db.Model):
     __tablename__ = 'calculation_history'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     calculation_type = db.Column(db.String(20), nullable=False)  # 'basic', 'scientific', 'emi', 'simple_interest', 'compound_interest'
     expression = db.Column(db.String(500), nullable=False)  # e.g., "5 + 3", "sqrt(16)", "EMI(100000, 7.5, 60)"
     result = db.Column(db.String(100), nullable=False)  # String to handle large numbers and special results
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     
+    __table_args__ = (
+        # Serves "WHERE user_id = ? ORDER BY timestamp DESC, id DESC" (and
+        # keyset seeks on that key) straight from the index, with no sort
+        # step; also covers lookups by user_id alone
+        db.Index('ix_calculation_history_user_timestamp_id', user_id, timestamp.desc(), id.desc()),
+    )
+    
     # Relationship
     user = db.relationship('User', backref=db.backref('calculations', lazy='dynamic'))
     
-    def to_dict(self):
-        """Serialize for API responses."""
+    @classmethod
+    def dict_columns(cls):
+        """Columns read by to_dict(), for queries that skip ORM objects."""
+        return (cls.id, cls.calculation_type, cls.expression, cls.result, cls.timestamp)
+    
+    @staticmethod
+    def row_to_dict(row):
+        """
+        Serialize a row selected with dict_columns() for API responses.
+        
+        Args:
+            row: Result row (or CalculationHistory) with the dict_columns() fields
+        
+        Returns:
+            dict: Same shape as to_dict()
+        """
         return {
-            'id': self.id,
-            'calculation_type': self.calculation_type,
-            'expression': self.expression,
-            'result': self.result,
-            'timestamp': self.timestamp.isoformat() + 'Z'
+            'id': row.id,
+            'calculation_type': row.calculation_type,
+            'expression': row.expression,
+            'result': row.result,
+            'timestamp': row.timestamp.isoformat() + 'Z'
         }
     
+    def to_dict(self):
+        """Serialize for API responses."""
+        return self.row_to_dict(self)
+    
     def __repr__(self):
         return f'<CalculationHistory {self.id}: {self.expression} = {self.result}>'
+
+
+class HistoryStats(db.Model):
+    """
+    Per-user calculation counts: the total and one count per
+    calculation_type, kept in step with calculation_history by the
+    history endpoints so listing history never counts rows.
+    """
+    __tablename__ = 'history_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    basic = db.Column(db.Integer, nullable=False, default=0)
+    scientific = db.Column(db.Integer, nullable=False, default=0)
+    emi = db.Column(db.Integer, nullable=False, default=0)
+    simple_interest = db.Column(db.Integer, nullable=False, default=0)
+    compound_interest = db.Column(db.Integer, nullable=False, default=0)
+    
+    def counts(self):
+        """Counts per calculation_type, as a dict."""
+        return {calculation_type: getattr(self, calculation_type) for calculation_type in CALCULATION_TYPES}
+    
+    def __repr__(self):
+        return f'<HistoryStats user {self.user_id}: {self.total}>'
+
+
+class HistoryIdempotencyKey(db.Model):
+    """
+    Client-chosen keys of calculations saved through POST /api/history/batch,
+    so retried or repeated syncs do not store an entry twice.
+    """
+    __tablename__ = 'history_idempotency_keys'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    key = db.Column(db.String(64), primary_key=True)
+    calculation_id = db.Column(db.Integer, db.ForeignKey('calculation_history.id'), nullable=False)
+    
+    def __repr__(self):
+        return f'<HistoryIdempotencyKey user {self.user_id}: {self.key} -> {self.calculation_id}>'
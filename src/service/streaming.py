@@ -0,0 +1,95 @@
+"""
+Newline-delimited JSON (NDJSON) streaming helpers.
+
+Bulk endpoints accept an NDJSON body (one JSON object per line) and
+stream one NDJSON result per input line. Input is read incrementally
+from request.stream and results are produced by a generator, so memory
+use stays flat however large the job is.
+"""
+import json
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Longest accepted input line, in bytes
+MAX_LINE_BYTES = 64 * 1024
+
+
+def is_ndjson_request():
+    """Return True if the current request body is NDJSON."""
+    return request.mimetype == NDJSON_MIMETYPE
+
+
+def iter_ndjson(stream, max_line_bytes=MAX_LINE_BYTES):
+    """
+    Parse an NDJSON stream line by line.
+
+    Blank lines are skipped. Lines that are too long, not valid JSON or
+    not JSON objects are reported as errors instead of stopping the stream.
+
+    Args:
+        stream: File-like object opened in binary mode (e.g. request.stream)
+        max_line_bytes (int): Longest accepted line
+
+    Yields:
+        tuple: (line_number, data, error) - the parsed object, or None and
+        an error message
+    """
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        line_number += 1
+
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            # Discard the rest of the oversized line
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes)
+            yield line_number, None, f'Line too long (max {max_line_bytes} bytes)'
+            continue
+
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'Invalid JSON'
+            continue
+        if not isinstance(data, dict):
+            yield line_number, None, 'Line must be a JSON object'
+            continue
+        yield line_number, data, None
+
+
+def ndjson_response(process):
+    """
+    Stream NDJSON results for an NDJSON request body.
+
+    Each result line carries the input line number plus either the
+    processed fields or an "error". An unexpected exception from process()
+    is logged and reported as that line's error, so one bad line never
+    ends the stream.
+
+    Args:
+        process (callable): Takes a parsed input object and returns a dict
+            of result fields, or a dict with an 'error' key
+
+    Returns:
+        Response: Streaming application/x-ndjson response
+    """
+    def generate():
+        for line_number, data, error in iter_ndjson(request.stream):
+            record = {'line': line_number}
+            if error:
+                record['error'] = error
+            else:
+                try:
+                    record.update(process(data))
+                except Exception:
+                    current_app.logger.exception('NDJSON line %d failed', line_number)
+                    record['error'] = 'Could not process line'
+            yield json.dumps(record) + '\n'
+
+    return Response(stream_with_context(generate()), status=200, mimetype=NDJSON_MIMETYPE)
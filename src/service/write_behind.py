@@ -0,0 +1,268 @@
+"""
+Write-behind queue: accept writes now, persist them in batches later.
+
+Producers put() items on a bounded in-process queue and return at once;
+one background thread takes them off in batches and hands each batch to
+a write function. A batch is written when it reaches batch_size items or
+when its oldest item has waited interval seconds, whichever comes first.
+When the queue is full, put() waits up to a timeout and then refuses the
+item, so producers slow down (or report the refusal) instead of memory
+growing without bound. stop() drains the queue before returning and is
+registered to run at interpreter exit.
+
+A batch whose write raises is retried, so writes should be idempotent.
+A write may also return the items it could not write, and only those are
+retried. Items still failing after the last retry are dropped and counted
+as failed.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue drained in batches by a background thread.
+
+    Tracks queue depth, items enqueued, rejected, written and dropped, and
+    flush latency, so they can be reported by /metrics.
+    """
+
+    def __init__(self, write, maxsize=10000, batch_size=500, interval=0.5, retries=3,
+                 retry_delay=0.1, wrap=None):
+        """
+        Args:
+            write (callable): Persists a list of items; raises on failure,
+                or returns the items it could not write
+            maxsize (int): Items the queue holds before put() blocks
+            batch_size (int): Largest batch passed to write()
+            interval (float): Seconds the oldest queued item waits at most
+                before its batch is written
+            retries (int): Further attempts at a batch whose write raised
+            retry_delay (float): Seconds before the first retry, doubling
+                after each
+            wrap (callable): Context manager factory entered around every
+                write, e.g. an application context
+        """
+        self.write = write
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.interval = interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.wrap = wrap
+        self._queue = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._counter_lock = threading.Lock()
+        # Guards the stopping flag and the count of put() calls in flight
+        self._puts = threading.Condition()
+        self._active_puts = 0
+        self._reset_stats()
+        atexit.register(self.stop)
+
+    def _reset_stats(self):
+        self.enqueued = 0
+        self.rejected = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    def configure(self, maxsize=None, batch_size=None, interval=None, wrap=None):
+        """
+        Change the queue bound, batch size, flush interval or write wrapper.
+
+        Stops a running queue first (writing what it holds); start() it
+        again to apply the new settings.
+
+        Args:
+            maxsize (int or None): New queue bound, or None to keep
+            batch_size (int or None): New batch size, or None to keep
+            interval (float or None): New flush interval, or None to keep
+            wrap (callable or None): New write wrapper, or None to keep
+
+        Raises:
+            ValueError: If a value is not positive
+        """
+        for name, value in (('maxsize', maxsize), ('batch_size', batch_size), ('interval', interval)):
+            if value is not None and value <= 0:
+                raise ValueError(f'{name} must be positive')
+        self.stop()
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if interval is not None:
+            self.interval = interval
+        if wrap is not None:
+            self.wrap = wrap
+
+    @property
+    def running(self):
+        """Whether put() accepts items."""
+        return self._thread is not None
+
+    def start(self):
+        """Start the background writer, if not already running."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._queue = queue.Queue(self.maxsize)
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Write everything still queued, then stop the background writer."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            with self._puts:
+                self._stopping.set()
+                # A put() that got past its check enqueues before the drain
+                self._puts.wait_for(lambda: not self._active_puts)
+            thread.join()
+            self._thread = None
+            # Items put while the writer was exiting
+            while not self._queue.empty():
+                self._flush_batch(self._next_batch())
+
+    def put(self, item, timeout=0):
+        """
+        Queue an item for writing.
+
+        Args:
+            item: Item passed to write() in a later batch
+            timeout (float): Seconds to wait for room when the queue is full
+
+        Returns:
+            bool: False if the queue stayed full (the item was not queued)
+
+        Raises:
+            RuntimeError: If the queue is not running
+        """
+        with self._puts:
+            if not self.running or self._stopping.is_set():
+                raise RuntimeError('Write-behind queue is not running')
+            self._active_puts += 1
+        try:
+            if timeout:
+                self._queue.put(item, timeout=timeout)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            with self._counter_lock:
+                self.rejected += 1
+            return False
+        finally:
+            with self._puts:
+                self._active_puts -= 1
+                self._puts.notify_all()
+        with self._counter_lock:
+            self.enqueued += 1
+        return True
+
+    def flush(self):
+        """Block until every item queued so far has been written (or dropped)."""
+        if self.running:
+            self._queue.join()
+
+    def _next_batch(self):
+        """Wait for a batch: batch_size items, or what arrived within interval."""
+        try:
+            batch = [self._queue.get(timeout=self.interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0 or self._stopping.is_set():
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """Write a batch, retrying what failed with backoff; record latency and outcome."""
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            start = time.perf_counter()
+            try:
+                if self.wrap is None:
+                    failed = self.write(batch)
+                else:
+                    with self.wrap():
+                        failed = self.write(batch)
+            except Exception:
+                logger.warning('Write of %d queued item(s) failed', len(batch), exc_info=True)
+                failed = batch
+            else:
+                failed = list(failed or ())
+                elapsed = time.perf_counter() - start
+                self.flushes += 1
+                self.written += len(batch) - len(failed)
+                self.flush_seconds += elapsed
+                self.last_flush_seconds = elapsed
+                self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+            if not failed:
+                return
+            if attempt == self.retries:
+                logger.error('Dropping %d queued item(s) after %d attempts', len(failed), attempt + 1)
+                self.failed += len(failed)
+                return
+            time.sleep(delay)
+            delay *= 2
+            batch = failed
+
+    def _flush_batch(self, batch):
+        try:
+            self._write(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch:
+                self._flush_batch(batch)
+            elif self._stopping.is_set():
+                return
+
+    def stats(self):
+        """
+        Queue counters.
+
+        Returns:
+            dict: enabled, depth, capacity, enqueued, rejected, written,
+            failed, flushes and last/max/average flush latency in ms
+        """
+        return {
+            'enabled': self.running,
+            'depth': self._queue.qsize() if self._queue is not None else 0,
+            'capacity': self.maxsize,
+            'enqueued': self.enqueued,
+            'rejected': self.rejected,
+            'written': self.written,
+            'failed': self.failed,
+            'flushes': self.flushes,
+            'last_flush_ms': self.last_flush_seconds * 1e3,
+            'max_flush_ms': self.max_flush_seconds * 1e3,
+            'avg_flush_ms': self.flush_seconds / self.flushes * 1e3 if self.flushes else 0.0
+        }
+
+    def clear_stats(self):
+        """Reset the counters (not the queue)."""
+        self._reset_stats()
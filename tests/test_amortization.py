@@ -0,0 +1,169 @@
+"""
+Tests for the amortization schedule (closed-form rows, streaming output).
+"""
+import json
+import pytest
+from decimal import Decimal, ROUND_HALF_UP
+from src.service.calculators.amortization import amortization_schedule, iter_schedule_rows
+
+
+def iterative_schedule(loan_amount, annual_rate, tenure_years, emi):
+    """Reference month-by-month loop in exact Decimal arithmetic."""
+    balance = Decimal(str(loan_amount))
+    r = Decimal(str(annual_rate)) / 12 / 100
+    emi = Decimal(str(emi))
+    balances = []
+    for _ in range(tenure_years * 12):
+        balance = balance * (1 + r) - emi
+        balances.append(balance)
+    return balances
+
+
+@pytest.mark.parametrize('loan_amount,annual_rate,tenure_years', [
+    (100000, 8.5, 20),
+    (5000000, 8.5, 30),
+    (10000000, 30, 30),
+    (1234.56, 7.25, 5),
+    (12000, 0, 1),
+    (1000, 0.01, 30),
+])
+def test_schedule_reconciles_exactly(loan_amount, annual_rate, tenure_years):
+    """Rows sum to the loan and the final balance is exactly zero."""
+    schedule = amortization_schedule(loan_amount, annual_rate, tenure_years)
+    months = tenure_years * 12
+
+    assert len(schedule['payment']) == months
+    assert schedule['balance'][-1] == 0
+    assert schedule['principal'].sum() == round(loan_amount * 100)
+    assert (schedule['payment'] == schedule['principal'] + schedule['interest']).all()
+    assert (schedule['interest'] >= 0).all()
+    assert (schedule['principal'] > 0).all()
+    # Balance falls by exactly the principal paid each month
+    assert schedule['balance'][0] == round(loan_amount * 100) - schedule['principal'][0]
+    assert (schedule['balance'][:-1] - schedule['balance'][1:] == schedule['principal'][1:]).all()
+
+
+def test_schedule_matches_emi_and_iterative_balances():
+    """Closed-form balances agree with an exact iterative loop to the cent."""
+    schedule = amortization_schedule(100000, 8.5, 20)
+
+    assert (schedule['payment'][:-1] == 86782).all()
+    reference = iterative_schedule(100000, 8.5, 20, '867.82')
+    for k in range(len(reference) - 1):
+        expected = int((reference[k] * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+        assert schedule['balance'][k] == expected
+    # First month interest is simply P * r
+    assert schedule['interest'][0] == 70833
+
+
+def test_schedule_high_rate_corner_never_overpays():
+    """Loans repaid early by EMI rounding stop at payoff with a reduced last payment."""
+    for cents in list(range(100000, 300000, 37)) + [123456]:
+        schedule = amortization_schedule(cents / 100, 30, 30)
+        assert (schedule['payment'] >= 0).all(), cents
+        assert (schedule['interest'] >= 0).all(), cents
+        assert (schedule['balance'] >= 0).all(), cents
+        assert schedule['balance'][-1] == 0
+        assert schedule['principal'].sum() == cents
+
+    schedule = amortization_schedule(1234.56, 30, 30)
+    assert len(schedule['payment']) < 360
+    assert 0 < schedule['payment'][-1] <= schedule['payment'][0]
+
+
+def test_schedule_rows_negative_amounts():
+    """Negative cents are formatted with a sign, not floor division."""
+    import numpy as np
+    schedule = {name: np.array([value]) for name, value in
+                [('payment', -47535), ('principal', -1), ('interest', 5), ('balance', 0)]}
+
+    row = json.loads(next(iter_schedule_rows(schedule)))
+    assert row == {'month': 1, 'payment': -475.35, 'principal': -0.01, 'interest': 0.05, 'balance': 0}
+    assert list(iter_schedule_rows(schedule, 'csv'))[1] == '1,-475.35,-0.01,0.05,0.00\n'
+
+
+def test_schedule_rows_ndjson_and_csv():
+    """Rows are formatted as exact two-decimal amounts."""
+    schedule = amortization_schedule(1234.56, 7.25, 5)
+
+    rows = [json.loads(line) for line in iter_schedule_rows(schedule)]
+    assert len(rows) == 60
+    assert rows[0] == {'month': 1, 'payment': 24.59, 'principal': 17.13,
+                       'interest': 7.46, 'balance': 1217.43}
+    assert rows[-1]['balance'] == 0
+
+    lines = list(iter_schedule_rows(schedule, 'csv'))
+    assert lines[0] == 'month,payment,principal,interest,balance\n'
+    assert lines[1] == '1,24.59,17.13,7.46,1217.43\n'
+    assert len(lines) == 61
+
+
+def test_schedule_endpoint_ndjson(client):
+    """Schedule streams one NDJSON row per month with totals in headers."""
+    response = client.post('/api/calculate/emi/schedule', json={
+        'loan_amount': 100000,
+        'annual_rate': 8.5,
+        'tenure_years': 20
+    })
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(rows) == 240
+    assert rows[0]['payment'] == 867.82
+    assert rows[-1]['balance'] == 0
+
+    total = sum(Decimal(str(row['payment'])) for row in rows)
+    interest = sum(Decimal(str(row['interest'])) for row in rows)
+    assert Decimal(response.headers['X-Total-Payment']) == total
+    assert Decimal(response.headers['X-Total-Interest']) == interest
+    assert total - interest == 100000
+
+
+def test_schedule_endpoint_csv(client):
+    """format=csv streams a CSV document."""
+    response = client.post('/api/calculate/emi/schedule', json={
+        'loan_amount': 12000,
+        'annual_rate': 0,
+        'tenure_years': 1,
+        'format': 'csv'
+    })
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'month,payment,principal,interest,balance'
+    assert lines[1] == '1,1000.00,1000.00,0.00,11000.00'
+    assert lines[-1] == '12,1000.00,1000.00,0.00,0.00'
+
+
+def test_schedule_endpoint_validation(client):
+    """Schedule uses the EMI validation rules."""
+    response = client.post('/api/calculate/emi/schedule', json={
+        'loan_amount': 500,
+        'annual_rate': 8.5,
+        'tenure_years': 20
+    })
+    assert response.status_code == 400
+    assert 'loan amount' in response.get_json()['error'].lower()
+
+    response = client.post('/api/calculate/emi/schedule', json={
+        'loan_amount': 100000,
+        'annual_rate': 8.5,
+        'tenure_years': 20,
+        'format': 'xml'
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'format must be one of: ndjson, csv'
+
+    response = client.post('/api/calculate/emi/schedule', json={
+        'loan_amount': 100000,
+        'annual_rate': 8.5,
+        'tenure_years': 20,
+        'format': ['csv']
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'format must be one of: ndjson, csv'
+
+    response = client.post('/api/calculate/emi/schedule', data='x', content_type='text/plain')
+    assert response.status_code in (400, 415)
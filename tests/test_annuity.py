@@ -0,0 +1,95 @@
+"""
+Tests for the annuity-factor cache and memory-mapped table.
+"""
+import pytest
+from decimal import Decimal, ROUND_HALF_UP
+from src.service.calculators import annuity
+from src.service.calculators.financial import calculate_emi, result_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_annuity():
+    """Start and end every test with empty caches and no table."""
+    annuity.clear()
+    result_cache.clear()
+    yield
+    annuity.clear()
+    result_cache.clear()
+
+
+def direct_emi(loan_amount, annual_rate, tenure_years):
+    """EMI computed without the cache, as calculate_emi() used to."""
+    P = Decimal(str(loan_amount))
+    r = Decimal(str(annual_rate)) / Decimal('12') / Decimal('100')
+    one_plus_r_power_n = (Decimal('1') + r) ** (tenure_years * 12)
+    emi = P * r * one_plus_r_power_n / (one_plus_r_power_n - Decimal('1'))
+    return emi.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+
+CASES = [
+    (100000, 8.5, 20),
+    (1234.56, 0.01, 1),
+    (10000000, 30, 30),
+    (50000, 12, 5),
+    (75000, 7.125, 15),     # off the 0.01 grid
+    (75000, 7.0, 40),       # tenure beyond the table
+]
+
+
+@pytest.mark.parametrize('loan_amount,annual_rate,tenure_years', CASES)
+def test_cached_emi_is_identical(loan_amount, annual_rate, tenure_years):
+    """Cached factors give exactly the direct Decimal result."""
+    first = calculate_emi(loan_amount, annual_rate, tenure_years)
+    second = calculate_emi(loan_amount, annual_rate, tenure_years)
+
+    assert first['emi'] == direct_emi(loan_amount, annual_rate, tenure_years)
+    assert str(first['emi']) == str(second['emi'])
+    assert first == second
+
+
+def test_factors_cached_per_rate_and_months():
+    """Factors are computed once per (rate, months)."""
+    annuity.annuity_factors(8.5, 240)
+    annuity.annuity_factors(8.5, 240)
+    annuity.annuity_factors(8.5, 360)
+
+    assert annuity.stats() == {'cached_factors': 2, 'table_loaded': False}
+    assert annuity.annuity_factors(8.5, 240) == annuity.compute_factors('8.5', 240)
+
+
+def test_table_index():
+    """Only on-grid rates and whole-year tenures map to table records."""
+    assert annuity._table_index('0.0', 12) == 1
+    assert annuity._table_index('8.5', 240) == 1 + 850 * 30 + 19
+    assert annuity._table_index('30.0', 360) == annuity.TABLE_RATE_STEPS * annuity.TABLE_YEARS
+    assert annuity._table_index('7.125', 240) is None
+    assert annuity._table_index('8', 240) is None        # table spells it '8.0'
+    assert annuity._table_index('30.01', 240) is None
+    assert annuity._table_index('8.5', 250) is None
+    assert annuity._table_index('8.5', 372) is None
+
+
+def test_table_build_and_lookup(tmp_path):
+    """The mapped table returns the same factors as direct computation."""
+    path = str(tmp_path / 'annuity.tbl')
+    annuity.load_table(path)
+
+    assert annuity.stats()['table_loaded']
+    for rate, months in [(0.01, 12), (8.5, 240), (17.37, 96), (30.0, 360)]:
+        assert annuity.annuity_factors(rate, months) == annuity.compute_factors(str(rate), months)
+    for case in CASES:
+        assert calculate_emi(*case)['emi'] == direct_emi(*case)
+
+
+def test_table_reused_and_rebuilt_when_stale(tmp_path):
+    """An existing table is mapped as is; a corrupt one is rebuilt."""
+    path = tmp_path / 'annuity.tbl'
+    annuity.build_table(str(path))
+    size = path.stat().st_size
+
+    path.write_bytes(b'not a table')
+    annuity.load_table(str(path))
+
+    assert path.stat().st_size == size
+    assert annuity.stats()['table_loaded']
+    assert not [name for name in tmp_path.iterdir() if name.name.startswith('.annuity-')]
@@ -0,0 +1,143 @@
+"""
+Tests for the LRU/TTL result cache and its use by the financial calculators.
+"""
+import threading
+import time
+import pytest
+from src.service.cache import LRUCache, cached
+from src.service.calculators.financial import calculate_emi, result_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Start and end every test with an empty result cache."""
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    """The least recently used entry is evicted and counted."""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    stats = cache.stats()
+    assert stats['evictions'] == 1
+    assert stats['size'] == 2
+    assert (stats['hits'], stats['misses']) == (3, 1)
+
+
+def test_ttl_expiry():
+    """Entries expire ttl seconds after they are stored."""
+    clock = FakeClock()
+    cache = LRUCache(ttl=10, clock=clock)
+    cache.put('a', 1)
+
+    clock.now = 9.9
+    assert cache.get('a') == 1
+    clock.now = 10
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_get_or_compute_single_flight():
+    """Concurrent misses on one key run compute() once."""
+    cache = LRUCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {'value': 42}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', compute)))
+                 for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while cache.stats()['coalesced'] < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{'value': 42}] * 5
+    stats = cache.stats()
+    assert (stats['misses'], stats['coalesced'], stats['hit_ratio']) == (1, 4, 0.8)
+
+
+def test_get_or_compute_errors_not_cached():
+    """A failing computation raises and is retried on the next call."""
+    cache = LRUCache()
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError, match='boom'):
+        cache.get_or_compute('k', fail)
+    assert len(cache) == 0
+    assert cache.get_or_compute('k', lambda: 7) == 7
+
+
+def test_cached_decorator_returns_copies():
+    """Callers may modify results without affecting the cache."""
+    cache = LRUCache()
+
+    @cached(cache, lambda x: (x,))
+    def square(x):
+        return {'result': x * x}
+
+    first = square(3)
+    first['result'] = 0
+
+    assert square(3) == {'result': 9}
+    assert square.uncached(4) == {'result': 16}
+    assert cache.stats()['hits'] == 1
+
+
+def test_emi_keys_are_normalized():
+    """Numerically equal inputs share one cache entry."""
+    first = calculate_emi(500000, 8.5, 20)
+    second = calculate_emi(500000.0, 8.50, 20)
+
+    assert first == second == calculate_emi.uncached(500000, 8.5, 20)
+    stats = result_cache.stats()
+    assert (stats['misses'], stats['hits'], stats['size']) == (1, 1, 1)
+
+
+def test_result_cache_metrics(client):
+    """Repeated endpoint calls are served from the cache and reported."""
+    body = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20}
+    first = client.post('/api/calculate/emi', json=body).get_json()
+    second = client.post('/api/calculate/emi', json=body).get_json()
+
+    assert first == second
+    data = client.get('/metrics').get_json()
+    assert data['result_cache_misses'] == 1
+    assert data['result_cache_hits'] == 1
+    assert data['result_cache_hit_ratio'] == 0.5
+    assert data['result_cache_size'] == 1
+    assert data['result_cache_evictions'] == 0
@@ -243,3 +243,269 @@ def test_calculate_modulo_zero_divisor(client):
     data = response.get_json()
     assert 'error' in data
     assert data['error'] == 'Division by zero'
+
+
+# Batch tests
+def test_calculate_batch_preserves_order(client):
+    """Test batch results come back in request order across operations."""
+    response = client.post('/api/calculate/batch', json=[
+        {'operation': 'add', 'a': 2, 'b': 3},
+        {'operation': 'multiply', 'a': 4, 'b': 3},
+        {'operation': 'add', 'a': 10, 'b': -1},
+        {'operation': 'factorial', 'a': 5},
+        {'operation': 'power', 'a': 2, 'b': -2}
+    ])
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [item['result'] for item in data['results']] == [5, 12, 9, 120, 0.25]
+    assert data['count'] == 5
+    assert data['errors'] == 0
+
+
+def test_calculate_batch_items_object(client):
+    """Test batch accepts an object with an items array."""
+    response = client.post('/api/calculate/batch', json={
+        'items': [{'operation': 'subtract', 'a': 5, 'b': 3}]
+    })
+    assert response.status_code == 200
+    assert response.get_json()['results'] == [{'result': 2}]
+
+
+def test_calculate_batch_per_item_errors(client):
+    """Test invalid items report errors without failing the batch."""
+    response = client.post('/api/calculate/batch', json=[
+        {'operation': 'divide', 'a': 10, 'b': 0},
+        {'operation': 'divide', 'a': 10, 'b': 4},
+        {'operation': 'invalid', 'a': 1, 'b': 2},
+        {'operation': 'factorial', 'a': 21},
+        'not an object'
+    ])
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['results'] == [
+        {'error': 'Division by zero'},
+        {'result': 2.5},
+        {'error': 'Invalid operation'},
+        {'error': 'Factorial input too large (max 20)'},
+        {'error': 'Item must be a JSON object'}
+    ]
+    assert data['errors'] == 4
+
+
+def test_calculate_huge_integer_operands(client):
+    """Integers too large for a float are invalid operands, not a 500."""
+    response = client.post('/api/calculate/batch', json=[
+        {'operation': 'add', 'a': 10 ** 400, 'b': 1},
+        {'operation': 'add', 'a': 1, 'b': 2}
+    ])
+    assert response.status_code == 200
+    assert response.get_json()['results'] == [{'error': 'Operands must be numbers'}, {'result': 3.0}]
+
+    response = client.post('/api/calculate', json={'operation': 'add', 'a': [1, 10 ** 400], 'b': 1})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Operands must be numbers'
+
+
+def test_calculate_batch_matches_single_endpoint(client):
+    """Test every batch item matches the single calculate endpoint."""
+    items = [
+        {'operation': 'add', 'a': 0.1, 'b': 0.2},
+        {'operation': 'modulo', 'a': -7, 'b': 3},
+        {'operation': 'modulo', 'a': 10, 'b': 0},
+        {'operation': 'power', 'a': 2, 'b': 101},
+        {'operation': 'power', 'a': -8, 'b': 0.5},
+        {'operation': 'factorial', 'a': 5.5},
+        {'operation': 'factorial', 'a': -1},
+        {'operation': 'add', 'a': 5},
+        {'operation': 'add', 'a': 'x', 'b': 1},
+        {'operation': 'factorial'}
+    ]
+    batch = client.post('/api/calculate/batch', json=items).get_json()['results']
+    for item, batch_result in zip(items, batch):
+        single = client.post('/api/calculate', json=item).get_json()
+        assert batch_result == single
+
+
+def test_calculate_batch_invalid_body(client):
+    """Test batch rejects bodies that are not arrays of calculations."""
+    response = client.post('/api/calculate/batch', json={'operation': 'add'})
+    assert response.status_code == 400
+    
+    response = client.post('/api/calculate/batch', json=[])
+    assert response.status_code == 400
+
+
+def test_calculate_batch_too_many_items(client):
+    """Test batch enforces the item limit."""
+    from src.service.app import BATCH_MAX_ITEMS
+    items = [{'operation': 'add', 'a': 1, 'b': 1}] * (BATCH_MAX_ITEMS + 1)
+    response = client.post('/api/calculate/batch', json=items)
+    assert response.status_code == 400
+    assert 'Too many items' in response.get_json()['error']
+
+
+# Exact mode tests
+def test_calculate_exact_factorial_1000(client):
+    """Test exact factorial well beyond the float limit of 20."""
+    import math
+    response = client.post('/api/calculate', json={
+        'operation': 'factorial',
+        'a': 1000,
+        'exact': True
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['exact'] is True
+    assert data['digits'] == 2568
+    assert int(data['result']) == math.factorial(1000)
+
+
+def test_calculate_exact_small_factorial(client):
+    """Test small exact results are returned as decimal strings."""
+    response = client.post('/api/calculate', json={
+        'operation': 'factorial',
+        'a': 25,
+        'exact': True
+    })
+    assert response.status_code == 200
+    assert response.get_json()['result'] == '15511210043330985984000000'
+
+
+def test_calculate_exact_power_streamed(client):
+    """Test large exact powers stream the full decimal string."""
+    response = client.post('/api/calculate', json={
+        'operation': 'power',
+        'a': 7,
+        'b': 20000,
+        'exact': True
+    })
+    assert response.status_code == 200
+    assert response.is_streamed
+    data = response.get_json()
+    # 7^20000 has 16902 digits - past the default int/str conversion limit
+    assert data['digits'] == len(data['result']) == 16902
+    assert data['result'][-1000:] == str(7 ** 20000 % 10 ** 1000).zfill(1000)
+    assert data['result'][:4] == '9136'
+
+
+def test_calculate_exact_negative_power(client):
+    """Test exact powers of negative bases keep their sign."""
+    response = client.post('/api/calculate', json={
+        'operation': 'power',
+        'a': -3,
+        'b': 3,
+        'exact': True
+    })
+    assert response.get_json()['result'] == '-27'
+
+
+def test_calculate_exact_budget(client):
+    """Test results over the digit budget are rejected before computing."""
+    response = client.post('/api/calculate', json={
+        'operation': 'factorial',
+        'a': 10 ** 9,
+        'exact': True
+    })
+    assert response.status_code == 400
+    assert 'Result too large for exact mode' in response.get_json()['error']
+    
+    response = client.post('/api/calculate', json={
+        'operation': 'power',
+        'a': 10,
+        'b': 10 ** 12,
+        'exact': True
+    })
+    assert response.status_code == 400
+    assert 'Result too large for exact mode' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('operation,a,b', [
+    ('factorial', '1' + '0' * 400, None),
+    ('power', 10, 1e308),
+    ('power', 2, '1' + '0' * 400),
+])
+def test_calculate_exact_budget_huge_operands(client, operation, a, b):
+    """Test operands too large to estimate get the budget error, not a 500."""
+    response = client.post('/api/calculate', json={'operation': operation, 'a': a, 'b': b, 'exact': True})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Result too large for exact mode (max 100000 digits)'
+
+
+def test_calculate_exact_validation(client):
+    """Test exact mode input validation."""
+    cases = [
+        ({'operation': 'factorial', 'a': -1}, 'Factorial not defined for negative numbers'),
+        ({'operation': 'factorial', 'a': 5.5}, 'Factorial requires integer input'),
+        ({'operation': 'power', 'a': 2, 'b': -1}, 'Exact power requires a non-negative exponent'),
+        ({'operation': 'power', 'a': 2.5, 'b': 2}, 'Exact mode requires integer operands'),
+        ({'operation': 'add', 'a': 1, 'b': 2}, 'Exact mode supports factorial and power only'),
+        ({'operation': 'invalid', 'a': 1}, 'Invalid operation'),
+    ]
+    for body, message in cases:
+        response = client.post('/api/calculate', json=dict(body, exact=True))
+        assert response.status_code == 400
+        assert response.get_json()['error'] == message
+
+
+# Binary array tests
+def post_binary(client, operation, *arrays):
+    """POST packed float64 arrays and unpack (values, mask)."""
+    import numpy as np
+    body = b''.join(np.asarray(array, dtype='<f8').tobytes() for array in arrays)
+    response = client.post('/api/calculate', data=body,
+                           content_type='application/octet-stream',
+                           headers={'X-Operation': operation})
+    assert response.status_code == 200
+    count = int(response.headers['X-Count'])
+    values = np.frombuffer(response.data[:8 * count], dtype='<f8')
+    mask = np.frombuffer(response.data[8 * count:], dtype=np.uint8)
+    return values, mask
+
+
+def test_calculate_binary_elementwise(client):
+    """Test binary bodies are computed elementwise."""
+    values, mask = post_binary(client, 'multiply', [1.5, 2, 3], [2, 4, -1])
+    assert values.tolist() == [3.0, 8.0, -3.0]
+    assert mask.tolist() == [1, 1, 1]
+
+
+def test_calculate_binary_validity_mask(client):
+    """Test division by zero and out-of-bound exponents are masked."""
+    import math
+    values, mask = post_binary(client, 'divide', [10, 10, 9], [2, 0, 3])
+    assert mask.tolist() == [1, 0, 1]
+    assert values[0] == 5 and math.isnan(values[1]) and values[2] == 3
+
+    values, mask = post_binary(client, 'power', [2, 2, 2, 10], [3, 101, -101, 400.5 / 4])
+    assert mask.tolist() == [1, 0, 0, 0]
+    assert values[0] == 8
+
+
+def test_calculate_binary_non_finite_results_are_nan(client):
+    """Test results that overflow are masked and NaN even when every rule passes."""
+    import math
+    values, mask = post_binary(client, 'multiply', [1e308, 2], [10, 3])
+    assert mask.tolist() == [0, 1]
+    assert math.isnan(values[0]) and values[1] == 6
+
+
+def test_calculate_binary_factorial(client):
+    """Test unary operations take a single array."""
+    values, mask = post_binary(client, 'factorial', [0, 5, 21, -1, 2.5])
+    assert values[:2].tolist() == [1, 120]
+    assert mask.tolist() == [1, 1, 0, 0, 0]
+
+
+def test_calculate_binary_errors(client):
+    """Test bad binary requests return JSON errors."""
+    response = client.post('/api/calculate', data=b'\x00' * 16,
+                           content_type='application/octet-stream',
+                           headers={'X-Operation': 'nope'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid operation'
+
+    response = client.post('/api/calculate', data=b'\x00' * 24,
+                           content_type='application/octet-stream',
+                           headers={'X-Operation': 'add'})
+    assert response.status_code == 400
+    assert 'float64' in response.get_json()['error']
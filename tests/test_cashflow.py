@@ -0,0 +1,127 @@
+"""
+Tests for the NPV / IRR / XIRR cash-flow calculators.
+"""
+import numpy as np
+import pytest
+from src.service.calculators.cashflow import irr_many, npv_many, MAX_FLOWS
+
+DATED = {
+    'cash_flows': [-10000, 2750, 4250, 3250, 2750],
+    'dates': ['2008-01-01', '2008-03-01', '2008-10-30', '2009-02-15', '2009-04-01'],
+}
+
+
+def test_npv_many_matches_direct_sum():
+    """Flat evaluation agrees with a per-portfolio discounted sum."""
+    portfolios = [[-1000, 300, 400, 500], [50], [-5, 1, 1, 1, 1, 1, 1]]
+    rates = np.array([0.1, 0.2, -0.5])
+    lengths = np.array([len(flows) for flows in portfolios])
+    times = np.concatenate([np.arange(len(flows)) for flows in portfolios]).astype(float)
+
+    values = npv_many(rates, np.concatenate(portfolios).astype(float), times, lengths)
+
+    for value, flows, rate in zip(values, portfolios, rates):
+        assert value == pytest.approx(sum(c / (1 + rate) ** t for t, c in enumerate(flows)))
+
+
+def test_irr_many_roots():
+    """Each rate zeroes its portfolio's NPV, including roots far from 0%."""
+    rng = np.random.default_rng(17)
+    portfolios = [[-1000] + rng.uniform(0, 400, rng.integers(2, 40)).tolist() for _ in range(500)]
+    portfolios += [[-100, 0, 0, 0, 0, 1e6], [-100, 1], [100, -50, -60], [-100, 100]]
+    lengths = np.array([len(flows) for flows in portfolios])
+    flows = np.concatenate(portfolios)
+    times = np.concatenate([np.arange(length) for length in lengths]).astype(float)
+
+    solved = irr_many(flows, times, lengths)
+
+    assert solved['converged'].all()
+    assert solved['iterations'].max() <= 40
+    residual = npv_many(solved['rate'], flows, times, lengths)
+    scale = np.add.reduceat(np.abs(flows), np.concatenate(([0], np.cumsum(lengths)[:-1])))
+    assert (np.abs(residual) <= 1e-9 * scale).all()
+    assert solved['rate'][-1] == 0
+
+
+def test_irr_prefers_root_nearest_zero():
+    """With two IRRs (10% and 20%) the one nearer 0% is reported."""
+    solved = irr_many(np.array([-100.0, 230, -132]), np.arange(3.0), np.array([3]))
+    assert solved['rate'][0] == pytest.approx(0.1)
+
+
+def test_npv_irr_xirr_endpoints(client):
+    """Single-portfolio endpoints, checked against spreadsheet values."""
+    response = client.post('/api/calculate/npv', json={'rate': 10, 'cash_flows': [-1000, 300, 400, 500]})
+    assert response.status_code == 200
+    assert response.get_json()['npv'] == pytest.approx(-21.0368, abs=1e-4)
+
+    data = client.post('/api/calculate/irr', json={'cash_flows': [-1000, 300, 400, 500]}).get_json()
+    assert data['irr'] == pytest.approx(8.8963, abs=1e-4)
+    assert data['converged'] is True
+
+    data = client.post('/api/calculate/xirr', json=DATED).get_json()
+    assert data['xirr'] == pytest.approx(37.3363, abs=1e-4)
+
+    data = client.post('/api/calculate/npv', json={**DATED, 'rate': 9}).get_json()
+    assert data['npv'] == pytest.approx(2086.6476, abs=1e-4)
+
+
+def test_irr_large_portfolio(client):
+    """100k flows are solved in one request."""
+    flows = [-1000000.0] + [11.0] * (MAX_FLOWS - 1)
+
+    data = client.post('/api/calculate/irr', json={'cash_flows': flows}).get_json()
+
+    assert data['converged'] is True
+    assert data['irr'] > 0
+
+
+def test_cash_flow_batches(client):
+    """Batches solve valid portfolios together and report the rest."""
+    response = client.post('/api/calculate/irr/batch', json={'items': [
+        {'cash_flows': [-1000, 300, 400, 500]},
+        {'cash_flows': [100, 200]},
+        {'cash_flows': [-100, 50, -100]},
+        'x',
+    ]})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == 4 and data['errors'] == 3
+    assert data['results'][0]['irr'] == pytest.approx(8.8963, abs=1e-4)
+    assert data['results'][1] == {'error': 'cash_flows must contain at least one positive and one negative value'}
+    assert data['results'][2] == {'error': 'No IRR found: NPV does not change sign'}
+    assert data['results'][3] == {'error': 'Item must be a JSON object'}
+
+    data = client.post('/api/calculate/npv/batch', json=[
+        {'rate': 10, 'cash_flows': [-1000, 300, 400, 500]}, {**DATED, 'rate': 9}
+    ]).get_json()
+    assert [round(item['npv'], 2) for item in data['results']] == [-21.04, 2086.65]
+
+    data = client.post('/api/calculate/xirr/batch', json=[DATED, DATED]).get_json()
+    assert data['results'][0] == data['results'][1]
+
+
+@pytest.mark.parametrize('path,body,error', [
+    ('/api/calculate/npv', {'cash_flows': [1]}, 'rate is required'),
+    ('/api/calculate/npv', {'cash_flows': [1], 'rate': -100}, 'Rate must be greater than -100%'),
+    ('/api/calculate/npv', {'cash_flows': [1], 'rate': 10 ** 400}, 'Invalid parameter types'),
+    ('/api/calculate/irr', {'cash_flows': [-1, 10 ** 400]}, 'Invalid parameter types'),
+    ('/api/calculate/irr', {}, 'Request body must be JSON'),
+    ('/api/calculate/irr', {'cash_flows': []}, 'cash_flows must be a non-empty list of numbers'),
+    ('/api/calculate/irr', {'cash_flows': ['a', 1]}, 'Invalid parameter types'),
+    ('/api/calculate/irr', {'cash_flows': [-1] * (MAX_FLOWS + 1)}, f'Too many cash flows (max {MAX_FLOWS})'),
+    ('/api/calculate/xirr', {'cash_flows': [-1, 2]}, 'dates is required'),
+    ('/api/calculate/xirr', {'cash_flows': [-1, 2], 'dates': ['2024-01-01']},
+     'dates and cash_flows must have the same length'),
+    ('/api/calculate/xirr', {'cash_flows': [-1, 2], 'dates': ['2024-01-01', 'soon']},
+     'Invalid date format (use YYYY-MM-DD)'),
+    ('/api/calculate/xirr', {'cash_flows': [-1, 2], 'dates': ['2024-01-01', '2023-01-01']},
+     'dates must not be earlier than the first date'),
+])
+def test_cash_flow_validation(client, path, body, error):
+    """Malformed portfolios are rejected with a message."""
+    response = client.post(path, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
@@ -0,0 +1,87 @@
+"""
+Tests for the controlled-precision Decimal power engine.
+"""
+import pytest
+from decimal import Decimal, localcontext, ROUND_HALF_UP
+from src.service.calculators.decimal_power import (
+    compound_growth,
+    result_digits,
+    PowerError,
+    MAX_RESULT_DIGITS
+)
+from src.service.calculators.financial import calculate_compound_interest, COMPOUNDING_FREQUENCIES
+
+CENT = Decimal('0.01')
+
+
+def reference_amount(principal, rate, time_years, frequency):
+    """Compound final amount at 80 significant digits, rounded to the cent."""
+    with localcontext() as ctx:
+        ctx.prec = 80
+        n = Decimal(COMPOUNDING_FREQUENCIES[frequency])
+        base = 1 + Decimal(str(rate)) / 100 / n
+        amount = Decimal(str(principal)) * base ** (n * Decimal(str(time_years)))
+        return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@pytest.mark.parametrize('principal,rate,time_years,frequency', [
+    (10000, 5, 10, 'monthly'),
+    (10000, 5, 2.37, 'monthly'),
+    (10000, 5, 0.123456789, 'annual'),
+    (10000, 5, 1 / 3, 'quarterly'),
+    (1, 100, 0.5, 'annual'),
+    (9999999.99, 29.99, 29.99, 'monthly'),
+    (123.45, 0, 7.7, 'monthly'),
+    (50000, 6, 0, 'quarterly'),
+])
+def test_compound_interest_correct_to_the_cent(principal, rate, time_years, frequency):
+    """Fractional and integer tenures round exactly like a high-precision result."""
+    result = calculate_compound_interest(principal, rate, time_years, frequency)
+
+    expected = reference_amount(principal, rate, time_years, frequency)
+    assert result['final_amount'] == expected
+    assert result['interest'] == expected - Decimal(str(principal))
+
+
+def test_compound_growth_integer_and_fractional_exponents():
+    """Integer exponents skip exp/ln; fractional ones split k + f."""
+    assert compound_growth(Decimal('100'), Decimal('1.1'), Decimal('2')).quantize(CENT) == Decimal('121.00')
+    assert compound_growth(Decimal('100'), Decimal('4'), Decimal('1.5')).quantize(CENT) == Decimal('800.00')
+    assert compound_growth(Decimal('0'), Decimal('2'), Decimal('10')) == 0
+    assert compound_growth(Decimal('5'), Decimal('2'), Decimal('0')) == 5
+
+
+def test_result_digits_estimate():
+    """Digit estimates come from float logs."""
+    assert result_digits(Decimal('999'), Decimal('1'), Decimal('5')) == 3
+    assert result_digits(Decimal('1000'), Decimal('10'), Decimal('2.5')) == 6
+    assert result_digits(Decimal('0.5'), Decimal('1.01'), Decimal('1')) == 1
+    assert result_digits(Decimal('1'), Decimal('2'), Decimal('10000000')) > 3000000
+
+
+def test_cost_guard():
+    """Oversized results and invalid operands are rejected up front."""
+    with pytest.raises(PowerError, match=f'max {MAX_RESULT_DIGITS} digits'):
+        compound_growth(Decimal('10000000'), Decimal('2'), Decimal('1000000.5'))
+    with pytest.raises(PowerError):
+        compound_growth(Decimal('1'), Decimal('0'), Decimal('1'))
+    with pytest.raises(PowerError):
+        compound_growth(Decimal('1'), Decimal('2'), Decimal('-1'))
+    with pytest.raises(PowerError):
+        calculate_compound_interest(10000000, 100, 100, 'monthly')
+
+
+def test_compound_interest_endpoint_too_large(client):
+    """The endpoint reports oversized results as validation errors."""
+    body = {'principal': 10000000, 'rate': 100, 'time_years': 100, 'frequency': 'monthly'}
+
+    response = client.post('/api/calculate/compound-interest', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'Result too large (max {MAX_RESULT_DIGITS} digits)'
+
+    for precision in ('exact', 'fast'):
+        response = client.post('/api/calculate/compound-interest/batch',
+                               json={'items': [body], 'precision': precision})
+        assert response.get_json()['results'] == [
+            {'error': f'Result too large (max {MAX_RESULT_DIGITS} digits)'}
+        ]
@@ -0,0 +1,146 @@
+"""
+Tests for the what-if EMI grid endpoint.
+"""
+import pytest
+from src.service.calculators.financial import calculate_emi, result_cache
+from src.service.calculators.emi_grid import emi_grid, parse_axis, MAX_GRID_CELLS
+
+
+def test_grid_matches_calculate_emi():
+    """Every vectorized cell equals the Decimal calculate_emi() result."""
+    loans = [1000, 1234.56, 100000, 10000000]
+    rates = [0, 0.01, 7.25, 8.5, 30]
+    tenures = [1, 7, 20, 30]
+
+    grid = emi_grid(loans, rates, tenures)
+
+    assert grid['emi'].shape == (4, 5, 4)
+    for i, loan in enumerate(loans):
+        for j, rate in enumerate(rates):
+            for k, tenure in enumerate(tenures):
+                expected = calculate_emi(loan, rate, tenure)
+                for field in ('emi', 'total_interest', 'total_payment'):
+                    assert grid[field][i, j, k] == float(expected[field])
+
+
+def test_parse_axis_forms():
+    """Axes accept a number, a list or an inclusive range."""
+    assert parse_axis('annual_rate', 8.5) == ([8.5], None)
+    assert parse_axis('annual_rate', [7, '8.5']) == ([7.0, 8.5], None)
+    assert parse_axis('annual_rate', {'start': 7, 'stop': 8, 'step': 0.1})[0][-1] == 8.0
+    assert parse_axis('annual_rate', {'start': 0.1, 'stop': 0.3, 'step': 0.1}) == ([0.1, 0.2, 0.3], None)
+    assert parse_axis('tenure_years', {'start': 5, 'stop': 30, 'step': 5}) == ([5, 10, 15, 20, 25, 30], None)
+
+    assert parse_axis('annual_rate', None)[1] == 'annual_rate is required'
+    assert parse_axis('annual_rate', [])[1] == 'annual_rate must not be empty'
+    assert parse_axis('annual_rate', ['x'])[1] == 'Invalid parameter types'
+    assert 'step > 0' in parse_axis('annual_rate', {'start': 1, 'stop': 2, 'step': 0})[1]
+    assert 'start and stop' in parse_axis('annual_rate', {'start': 1})[1]
+
+
+def test_grid_endpoint(client):
+    """Endpoint returns the full cube indexed [amount][rate][tenure]."""
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': [100000, 200000],
+        'annual_rate': {'start': 8, 'stop': 9, 'step': 0.5},
+        'tenure_years': 20
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['annual_rate'] == [8.0, 8.5, 9.0]
+    assert data['tenure_years'] == [20]
+    assert data['cells'] == 6
+    assert data['emi'][0][1][0] == 867.82
+    assert data['emi'][1][1][0] == float(calculate_emi(200000, 8.5, 20)['emi'])
+    assert 'max_deviation' not in data
+
+
+def test_grid_endpoint_verify(client):
+    """Verified mode recomputes cells in Decimal and reports deviation."""
+    result_cache.clear()
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': [1000, 55555.55, 10000000],
+        'annual_rate': [0, 3.3, 30],
+        'tenure_years': {'start': 1, 'stop': 30, 'step': 29},
+        'verify': True
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['max_deviation'] == 0
+    assert data['mismatched_cells'] == 0
+    # Verification bypasses the shared result cache
+    assert result_cache.stats()['misses'] == 0
+
+
+def test_grid_endpoint_validation(client):
+    """Grid values use the same ranges as /api/calculate/emi."""
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': [100000, 20000000],
+        'annual_rate': 8.5,
+        'tenure_years': 20
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Loan amount must be between $1,000 and $10,000,000'
+
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': 100000,
+        'annual_rate': {'start': 0, 'stop': 31},
+        'tenure_years': 20
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Annual rate must be between 0% and 30%'
+
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': 100000,
+        'annual_rate': 8.5
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'tenure_years is required'
+
+
+@pytest.mark.parametrize('field,value', [
+    ('loan_amount', {'start': 1000, 'stop': float('inf')}),
+    ('loan_amount', {'start': 1000, 'stop': 2000, 'step': float('nan')}),
+    ('annual_rate', [8.5, float('nan')]),
+    ('tenure_years', [float('inf')]),
+])
+def test_grid_endpoint_rejects_non_finite(client, field, value):
+    """NaN and infinite axis values are validation errors, not a 500."""
+    body = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20, field: value}
+    response = client.post('/api/calculate/emi/grid', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'{field} must be finite numbers'
+
+
+def test_grid_endpoint_size_limits(client):
+    """Oversized grids are rejected before computing."""
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': {'start': 1000, 'stop': 10000000, 'step': 1000},
+        'annual_rate': {'start': 0, 'stop': 30, 'step': 1},
+        'tenure_years': 20
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'Grid too large (max {MAX_GRID_CELLS} cells)'
+
+    response = client.post('/api/calculate/emi/grid', json={
+        'loan_amount': {'start': 1000, 'stop': 100000, 'step': 1000},
+        'annual_rate': {'start': 0, 'stop': 30, 'step': 0.25},
+        'tenure_years': 20,
+        'verify': True
+    })
+    assert response.status_code == 400
+    assert 'Verified grid too large' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('value,error', [
+    ([100000, 10 ** 400], 'Invalid parameter types'),
+    ({'start': 1000, 'stop': 10 ** 400}, 'loan_amount range requires numeric start and stop (and optional step)'),
+])
+def test_grid_endpoint_rejects_huge_integers(client, value, error):
+    """Integers too large for a float are validation errors, not a 500."""
+    body = {'loan_amount': value, 'annual_rate': 8.5, 'tenure_years': 20}
+    response = client.post('/api/calculate/emi/grid', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
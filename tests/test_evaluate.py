@@ -0,0 +1,125 @@
+"""
+Tests for the expression engine and /api/evaluate endpoint.
+"""
+import pytest
+from src.service.app import app
+from src.service.cache import LRUCache
+from src.service.calculators import expression
+from src.service.calculators.expression import ExpressionError
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    app.config['TESTING'] = True
+    expression.plan_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+
+def test_evaluate_precedence(client):
+    """Test multiplication binds tighter than addition."""
+    response = client.post('/api/evaluate', json={'expression': '2 + 3 * 4'})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['result'] == 14
+    assert data['expression'] == '2 + 3 * 4'
+
+
+def test_evaluate_parentheses_and_power(client):
+    """Test parentheses, right-associative power and unary minus."""
+    assert expression.evaluate('(2 + 3) * 4')[1] == 20
+    assert expression.evaluate('2 ^ 3 ^ 2')[1] == 512
+    assert expression.evaluate('2 ** 3')[1] == 8
+    assert expression.evaluate('-2 ^ 2')[1] == -4
+    assert expression.evaluate('(-2) ^ 2')[1] == 4
+    assert expression.evaluate('10 % 3 - -1')[1] == 2
+
+
+def test_evaluate_factorial(client):
+    """Test postfix factorial."""
+    assert expression.evaluate('5!')[1] == 120
+    assert expression.evaluate('3! + 1')[1] == 7
+    assert expression.evaluate('3!!')[1] == 720
+
+
+def test_evaluate_matches_calculate_errors(client):
+    """Test calculation errors use the same messages as /api/calculate."""
+    cases = {
+        '10 / 0': 'Division by zero',
+        '10 % (2 - 2)': 'Division by zero',
+        '2 ^ 101': 'Exponent out of bounds (-100 to 100)',
+        '21!': 'Factorial input too large (max 20)',
+        '(-5)!': 'Factorial not defined for negative numbers',
+        '2.5!': 'Factorial requires integer input',
+    }
+    for text, message in cases.items():
+        response = client.post('/api/evaluate', json={'expression': text})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == message
+
+
+def test_evaluate_malformed_expressions(client):
+    """Test malformed expressions return 400 and never reach eval."""
+    for text in ['', '2 +', '(1 + 2', '1 2', '__import__("os")', '2 * * 3']:
+        response = client.post('/api/evaluate', json={'expression': text})
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+
+def test_evaluate_requires_string(client):
+    """Test missing or non-string expressions are rejected."""
+    response = client.post('/api/evaluate', json={'expression': 5})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'expression must be a string'
+
+
+def test_evaluate_limits():
+    """Test length and nesting limits."""
+    with pytest.raises(ExpressionError):
+        expression.evaluate('1' * (expression.MAX_EXPRESSION_LENGTH + 1))
+    with pytest.raises(ExpressionError):
+        expression.evaluate('(' * 101 + '1' + ')' * 101)
+    # A long flat chain stays within the length limit and evaluates
+    assert expression.evaluate('+'.join(['1'] * 500))[1] == 500
+
+
+def test_evaluate_factorial_chain_depth(client):
+    """Test chained '!' counts toward the nesting limit instead of recursing."""
+    response = client.post('/api/evaluate', json={'expression': '1' + '!' * 998})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'Expression nested too deeply (max {expression.MAX_NESTING_DEPTH})'
+    assert expression.evaluate('3!!')[1] == 720
+
+
+def test_evaluate_plan_cache_normalizes_whitespace(client):
+    """Test equivalent spellings share one cached plan."""
+    client.post('/api/evaluate', json={'expression': '1+2'})
+    client.post('/api/evaluate', json={'expression': ' 1 +   2 '})
+    stats = expression.plan_cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert stats['size'] == 1
+
+
+def test_evaluate_cache_metrics(client):
+    """Test plan cache counters are reported by /metrics."""
+    client.post('/api/evaluate', json={'expression': '6 * 7'})
+    client.post('/api/evaluate', json={'expression': '6*7'})
+    data = client.get('/metrics').get_json()
+    assert data['expression_cache_hits'] == 1
+    assert data['expression_cache_misses'] == 1
+    assert data['expression_cache_size'] == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test the LRU cache stays bounded and evicts the oldest entry."""
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
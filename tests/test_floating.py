@@ -0,0 +1,117 @@
+"""
+Tests for floating-rate schedules (segmented closed form, two modes).
+"""
+import pytest
+from src.service.calculators.amortization import amortization_schedule
+from src.service.calculators.floating import floating_segments, floating_schedule, parse_rate_timeline
+from src.service.calculators.scenarios import parse_scenario, simulate
+
+BODY = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20, 'rate_timeline': {'13': 9.5, '61': 7.25}}
+
+
+@pytest.mark.parametrize('loan_amount,annual_rate,tenure_years', [
+    (100000, 8.5, 20),
+    (12000, 0, 1),
+    (10000000, 30, 30),
+])
+def test_single_segment_matches_amortization_schedule(loan_amount, annual_rate, tenure_years):
+    """Without resets the schedule is exactly the fixed-rate one."""
+    segments = floating_segments(loan_amount, tenure_years, [(1, annual_rate)])
+    schedule = floating_schedule(segments)
+    expected = amortization_schedule(loan_amount, annual_rate, tenure_years)
+
+    for column in expected:
+        assert (schedule[column] == expected[column]).all()
+
+
+@pytest.mark.parametrize('mode,strategy', [('recompute_emi', 'reduce_emi'), ('keep_emi', 'reduce_tenure')])
+def test_segments_agree_with_month_by_month_replay(mode, strategy):
+    """Segment totals match replaying the resets month by month, to the cent."""
+    resets, _ = parse_rate_timeline(BODY['rate_timeline'], 8.5, 20)
+    segments = floating_segments(100000, 20, resets, mode)
+    replay = simulate((100000, 8.5, 20), parse_scenario({
+        'strategy': strategy,
+        'rate_resets': [{'month': 13, 'annual_rate': 9.5}, {'month': 61, 'annual_rate': 7.25}]
+    }, 20)[0])
+
+    assert sum(segment['months'] for segment in segments) == replay['months']
+    assert segments[-1]['emi'] == replay['final_emi']
+    assert abs(sum(segment['payment'] for segment in segments) - replay['total_payment']) <= 1
+
+
+def test_schedule_reconciles_across_segments():
+    """Rows chain across resets and end at zero."""
+    resets, _ = parse_rate_timeline({'13': 9.5, '61': 7.25}, 8.5, 20)
+    for mode in ('recompute_emi', 'keep_emi'):
+        segments = floating_segments(100000, 20, resets, mode)
+        schedule = floating_schedule(segments)
+
+        assert schedule['balance'][-1] == 0
+        assert schedule['principal'].sum() == 10000000
+        assert schedule['payment'].sum() == sum(segment['payment'] for segment in segments)
+        assert (schedule['payment'] == schedule['principal'] + schedule['interest']).all()
+        assert schedule['balance'][11] == segments[0]['closing_balance']
+
+
+def test_floating_endpoint_summary(client):
+    """Summaries list one segment per reset with per-segment interest."""
+    response = client.post('/api/calculate/emi/floating', json=BODY)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['mode'] == 'recompute_emi'
+    assert data['months'] == 240
+    assert [(s['start_month'], s['end_month']) for s in data['segments']] == [(1, 12), (13, 60), (61, 240)]
+    assert data['segments'][0]['emi'] == 867.82
+    assert data['segments'][1]['emi'] > 867.82 > data['segments'][2]['emi']
+    assert data['segments'][2]['closing_balance'] == 0
+    assert round(sum(s['interest'] for s in data['segments']), 2) == data['total_interest']
+    assert round(data['total_payment'] - data['total_interest'], 2) == 100000
+
+    data = client.post('/api/calculate/emi/floating', json={**BODY, 'mode': 'keep_emi'}).get_json()
+    assert {s['emi'] for s in data['segments']} == {867.82}
+    assert data['months'] < 240
+
+
+def test_floating_endpoint_streams_schedule(client):
+    """Schedules stream as CSV rows with totals in headers."""
+    response = client.post('/api/calculate/emi/floating', json={**BODY, 'mode': 'keep_emi', 'format': 'csv'})
+    summary = client.post('/api/calculate/emi/floating', json={**BODY, 'mode': 'keep_emi'}).get_json()
+
+    assert response.mimetype == 'text/csv'
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'month,payment,principal,interest,balance'
+    assert len(lines) == summary['months'] + 1
+    assert lines[-1].endswith(',0.00')
+    assert float(response.headers['X-Total-Interest']) == summary['total_interest']
+
+
+def test_floating_schedule_high_rate_never_overpays():
+    """At 30% the rounded EMI can repay early; the schedule ends there."""
+    for loan_amount in (1234.56, 1001.85):
+        for timeline in ({'2': 30}, {'359': 30}):
+            resets, _ = parse_rate_timeline(timeline, 30, 30)
+            schedule = floating_schedule(floating_segments(loan_amount, 30, resets))
+            assert (schedule['payment'] > 0).all()
+            assert (schedule['balance'][:-1] > 0).all()
+            assert schedule['balance'][-1] == 0
+
+
+def test_floating_endpoint_validation(client):
+    """Timelines, modes and non-amortizing fixed EMIs are rejected."""
+    cases = [
+        ({'rate_timeline': {'241': 9}}, 'Reset month must be between 1 and 240'),
+        ({'rate_timeline': {'13': 31}}, 'Annual rate must be between 0% and 30%'),
+        ({'rate_timeline': {'13': float('nan')}}, 'Annual rate must be between 0% and 30%'),
+        ({'rate_timeline': {'13': float('inf')}}, 'Annual rate must be between 0% and 30%'),
+        ({'rate_timeline': [9]}, 'rate_timeline must be an object of month: rate'),
+        ({'rate_timeline': {'x': 9}}, 'Invalid parameter types'),
+        ({'mode': 'x'}, 'mode must be one of: recompute_emi, keep_emi'),
+        ({'format': 'x'}, 'format must be one of: summary, ndjson, csv'),
+        ({'rate_timeline': {'2': 12}, 'mode': 'keep_emi'}, 'EMI does not cover the interest from month 2'),
+        ({'rate_timeline': {'2': 10.4}, 'mode': 'keep_emi'}, 'Loan not repaid within 600 months'),
+    ]
+    for extra, error in cases:
+        response = client.post('/api/calculate/emi/floating', json={**BODY, **extra})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == error
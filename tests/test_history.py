@@ -3,8 +3,10 @@ Tests for calculation history endpoints.
 """
 import pytest
 from datetime import datetime
-from src.service.models import User, CalculationHistory
+from src.service.models import User, CalculationHistory, HistoryStats
+from sqlalchemy import event
 from src.service.database import db
+from src.service.history import history_statement, BATCH_MAX_ITEMS
 
 
 def test_get_history_unauthenticated(client):
@@ -330,3 +332,362 @@ def test_calculation_to_dict(test_user):
     assert dict_data['result'] == '0.5'
     assert 'timestamp' in dict_data
     assert dict_data['timestamp'].endswith('Z')
+
+
+def add_calculations(user, count, timestamp=None):
+    """Add count calculations, optionally all sharing one timestamp."""
+    for i in range(count):
+        calc = CalculationHistory(
+            user_id=user.id,
+            calculation_type='basic',
+            expression=f'{i} + 0',
+            result=str(i)
+        )
+        if timestamp is not None:
+            calc.timestamp = timestamp
+        db.session.add(calc)
+    db.session.commit()
+
+
+def test_get_history_cursor_walk(auth_client, test_user):
+    """Following next cursors visits every row once, in page order."""
+    add_calculations(test_user, 4, datetime(2025, 1, 1))   # ties broken by id
+    add_calculations(test_user, 3)
+    expected = [calc['id'] for calc in auth_client.get('/api/history').get_json()['calculations']]
+
+    data = auth_client.get('/api/history?limit=3').get_json()
+    assert data['prev'] is None
+    seen = [calc['id'] for calc in data['calculations']]
+    pages = 1
+    while data['next']:
+        data = auth_client.get(f'/api/history?limit=3&cursor={data["next"]}').get_json()
+        assert 'total' not in data and 'page' not in data
+        seen += [calc['id'] for calc in data['calculations']]
+        pages += 1
+
+    assert seen == expected
+    assert pages == 3
+    assert len(data['calculations']) == 1
+
+
+def test_get_history_cursor_prev(auth_client, test_user):
+    """prev cursors return the newer rows in the same order."""
+    add_calculations(test_user, 5, datetime(2025, 1, 1))
+    first = auth_client.get('/api/history?limit=2').get_json()
+    second = auth_client.get(f'/api/history?limit=2&cursor={first["next"]}').get_json()
+
+    back = auth_client.get(f'/api/history?limit=2&cursor={second["prev"]}').get_json()
+
+    assert back['calculations'] == first['calculations']
+    assert back['prev'] is None
+    assert back['next'] is not None
+
+
+def test_get_history_total_optional(auth_client, test_user):
+    """The count runs by default only in page mode."""
+    add_calculations(test_user, 3)
+
+    data = auth_client.get('/api/history?limit=1&include_total=false').get_json()
+    assert 'total' not in data
+    data = auth_client.get(f'/api/history?limit=1&cursor={data["next"]}&include_total=true').get_json()
+    assert data['total'] == 3
+
+    response = auth_client.get('/api/history?include_total=maybe')
+    assert response.status_code == 400
+
+
+def test_get_history_cursor_no_offset_or_count(app, auth_client, test_user):
+    """Cursor pages are fetched by key range, without OFFSET or COUNT."""
+    add_calculations(test_user, 3)
+    cursor = auth_client.get('/api/history?limit=1').get_json()['next']
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement.upper(), parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        auth_client.get(f'/api/history?limit=1&cursor={cursor}')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    history_queries = [(sql, params) for sql, params in statements if 'FROM CALCULATION_HISTORY' in sql]
+    assert len(history_queries) == 1
+    sql, params = history_queries[0]
+    assert 'COUNT(' not in sql
+    # SQLite renders LIMIT ? OFFSET ?; the offset is always 0
+    assert sql.endswith('LIMIT ? OFFSET ?') and params[-2:] == (2, 0)
+
+
+@pytest.mark.parametrize('query', [
+    'cursor=not-a-cursor',
+    'cursor=eyJ0IjoieCJ9',       # {"t":"x"}
+    'cursor=eyJ0IjoiMjAyNS0wMS0wMVQwMDowMDowMCIsImkiOjEsImQiOiJ1cCJ9',   # bad direction
+    'cursor=abc&page=2',
+])
+def test_get_history_invalid_cursor(auth_client, query):
+    """Malformed cursors are rejected."""
+    response = auth_client.get(f'/api/history?{query}')
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] in ('Invalid cursor', 'Use either page or cursor, not both')
+
+
+def query_plan(statement):
+    """EXPLAIN QUERY PLAN details of a statement, joined with ' | '."""
+    compiled = statement.compile(dialect=db.engine.dialect)
+    params = tuple(
+        str(value) if isinstance(value, datetime) else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize('offset,key', [
+    (0, None),
+    (5000, None),
+    (0, (datetime(2025, 1, 1), 42, 'next')),
+    (0, (datetime(2025, 1, 1), 42, 'prev')),
+])
+def test_history_query_uses_composite_index(app, offset, key):
+    """Every page is read in index order: no sort step."""
+    plan = query_plan(history_statement(1, 51, offset, key))
+
+    assert 'ix_calculation_history_user_timestamp_id' in plan
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_history_rows_match_to_dict(test_user):
+    """The column-only read path serializes like the ORM objects."""
+    add_calculations(test_user, 2)
+    rows = db.session.execute(history_statement(test_user.id, 10)).all()
+    calculations = CalculationHistory.query.order_by(CalculationHistory.id.desc()).all()
+
+    assert [CalculationHistory.row_to_dict(row) for row in rows] == [calc.to_dict() for calc in calculations]
+
+
+def test_history_stats_follow_saves_and_clear(auth_client):
+    """Counters change with every save and reset on clear."""
+    for calculation_type in ('basic', 'emi', 'emi'):
+        auth_client.post('/api/history', json={
+            'calculation_type': calculation_type, 'expression': 'x', 'result': '1'
+        })
+
+    data = auth_client.get('/api/history/stats').get_json()
+    assert data['total'] == 3
+    assert data['by_type'] == {'basic': 1, 'scientific': 0, 'emi': 2,
+                               'simple_interest': 0, 'compound_interest': 0}
+    assert auth_client.get('/api/history').get_json()['total'] == 3
+
+    auth_client.delete('/api/history')
+    assert auth_client.get('/api/history/stats').get_json()['total'] == 0
+
+
+def test_history_stats_built_for_existing_rows(auth_client, test_user):
+    """History saved before the counters existed is counted once."""
+    add_calculations(test_user, 4)
+    assert db.session.get(HistoryStats, test_user.id) is None
+
+    auth_client.post('/api/history', json={'calculation_type': 'scientific', 'expression': 'x', 'result': '1'})
+
+    stats = db.session.get(HistoryStats, test_user.id)
+    assert (stats.total, stats.basic, stats.scientific) == (5, 4, 1)
+
+
+def test_get_history_total_without_count(app, auth_client, test_user):
+    """With counters in place the total is a key lookup, not COUNT(*)."""
+    auth_client.post('/api/history', json={'calculation_type': 'basic', 'expression': 'x', 'result': '1'})
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.upper())
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        data = auth_client.get('/api/history').get_json()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert data['total'] == 1
+    assert not [sql for sql in statements if 'COUNT(' in sql]
+
+
+def test_history_stats_check_and_rebuild(app, auth_client, test_user):
+    """The CLI reports drifted counters and rebuilds them."""
+    auth_client.post('/api/history', json={'calculation_type': 'basic', 'expression': 'x', 'result': '1'})
+    add_calculations(test_user, 2)   # bypasses the counters
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['history', 'check-stats'])
+    assert result.exit_code == 1
+    assert f'user {test_user.id}: stored' in result.output
+    assert '1 mismatched counter row(s)' in result.output
+
+    result = runner.invoke(args=['history', 'rebuild-stats'])
+    assert result.exit_code == 0
+    assert 'Rebuilt 1 counter row(s), 1 corrected' in result.output
+    assert auth_client.get('/api/history/stats').get_json()['total'] == 3
+
+    result = runner.invoke(args=['history', 'check-stats'])
+    assert result.exit_code == 0
+
+
+def entry(index, **fields):
+    """A valid batch entry."""
+    return {'calculation_type': 'basic', 'expression': f'{index} + 1', 'result': str(index + 1), **fields}
+
+
+def test_save_batch_one_insert_one_transaction(app, auth_client):
+    """Valid entries are written with one INSERT statement and one commit."""
+    statements = []
+    commits = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.upper())
+
+    def commit(conn):
+        commits.append(conn)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    event.listen(db.engine, 'commit', commit)
+    try:
+        response = auth_client.post('/api/history/batch', json=[entry(i) for i in range(2000)])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+        event.remove(db.engine, 'commit', commit)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data['count'], data['errors'], data['inserted']) == (2000, 0, 2000)
+    assert len({result['id'] for result in data['results']}) == 2000
+    assert len([sql for sql in statements if sql.startswith('INSERT INTO CALCULATION_HISTORY')]) == 1
+    assert len(commits) == 1
+
+    history = auth_client.get('/api/history?limit=100').get_json()
+    assert history['total'] == 2000
+    saved = {item['id']: item['expression'] for item in history['calculations']}
+    for index, result in enumerate(data['results']):
+        if result['id'] in saved:
+            assert saved[result['id']] == f'{index} + 1'
+
+
+def test_save_batch_per_entry_errors(auth_client):
+    """Invalid entries report the single-save errors in place; the rest are saved."""
+    response = auth_client.post('/api/history/batch', json={'items': [
+        entry(0),
+        entry(1, calculation_type='unknown'),
+        {'calculation_type': 'basic', 'result': '2'},
+        'not an object',
+        entry(4, expression='x' * 501),
+        entry(5, result=5),
+        entry(6, timestamp='yesterday'),
+        entry(7, idempotency_key='k' * 65),
+        entry(8, calculation_type='emi'),
+    ]})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data['count'], data['errors'], data['inserted']) == (9, 7, 2)
+    assert [result.get('error') for result in data['results'][1:8]] == [
+        'Invalid calculation_type. Must be one of: basic, scientific, emi, simple_interest, compound_interest',
+        'expression is required',
+        'Item must be a JSON object',
+        'expression too long (max 500 characters)',
+        'result must be a string',
+        'timestamp must be an ISO 8601 date-time',
+        'idempotency_key must be a string of 1 to 64 characters',
+    ]
+    assert auth_client.get('/api/history/stats').get_json() == {
+        'total': 2,
+        'by_type': {'basic': 1, 'scientific': 0, 'emi': 1, 'simple_interest': 0, 'compound_interest': 0}
+    }
+
+
+def test_save_batch_idempotency_keys(auth_client):
+    """Keys already saved, in earlier batches or the same one, are not stored again."""
+    first = auth_client.post('/api/history/batch', json=[
+        entry(0, idempotency_key='a'), entry(1, idempotency_key='b'), entry(2, idempotency_key='a')
+    ]).get_json()
+
+    assert first['inserted'] == 2
+    assert first['results'][2] == {'id': first['results'][0]['id'], 'duplicate': True}
+
+    retry = auth_client.post('/api/history/batch', json=[
+        entry(0, idempotency_key='a'), entry(1, idempotency_key='b'), entry(3, idempotency_key='c'), entry(4)
+    ]).get_json()
+
+    assert retry['inserted'] == 2
+    assert retry['results'][0] == {'id': first['results'][0]['id'], 'duplicate': True}
+    assert retry['results'][1] == {'id': first['results'][1]['id'], 'duplicate': True}
+    assert auth_client.get('/api/history/stats').get_json()['total'] == 4
+
+    # Clearing history forgets the keys
+    auth_client.delete('/api/history')
+    again = auth_client.post('/api/history/batch', json=[entry(0, idempotency_key='a')]).get_json()
+    assert again['results'][0].get('duplicate') is None
+    assert again['inserted'] == 1
+
+
+def test_save_batch_keys_are_per_user(app, auth_client):
+    """Another user's key does not mark an entry as a duplicate."""
+    with app.app_context():
+        other = User(username='other', email='other@example.com')
+        other.set_password('password123')
+        db.session.add(other)
+        db.session.commit()
+        db.session.add(CalculationHistory(user_id=other.id, calculation_type='basic', expression='1', result='1'))
+        db.session.commit()
+
+    data = auth_client.post('/api/history/batch', json=[entry(0, idempotency_key='shared')]).get_json()
+    assert data['inserted'] == 1
+    again = auth_client.post('/api/history/batch', json=[entry(0, idempotency_key='shared')]).get_json()
+    assert again['results'][0]['duplicate'] is True
+
+
+def test_save_batch_timestamps(auth_client):
+    """Entry timestamps are stored in UTC and ordered like any other history."""
+    data = auth_client.post('/api/history/batch', json=[
+        entry(0, timestamp='2024-01-01T12:00:00Z'),
+        entry(1, timestamp='2024-01-01T15:00:00+05:00'),
+        entry(2, timestamp='2024-01-02T00:00:00'),
+    ]).get_json()
+    assert data['errors'] == 0
+
+    history = auth_client.get('/api/history').get_json()['calculations']
+    assert [item['timestamp'] for item in history] == [
+        '2024-01-02T00:00:00Z', '2024-01-01T12:00:00Z', '2024-01-01T10:00:00Z'
+    ]
+
+
+def test_save_batch_timestamps_out_of_range_in_utc(auth_client):
+    """Offsets that move a timestamp past year 1 or 9999 are per-entry errors."""
+    data = auth_client.post('/api/history/batch', json=[
+        entry(0, timestamp='0001-01-01T00:00:00+01:00'),
+        entry(1, timestamp='9999-12-31T23:59:59-01:00'),
+        entry(2),
+    ]).get_json()
+
+    assert (data['errors'], data['inserted']) == (2, 1)
+    assert data['results'][0] == data['results'][1] == {'error': 'timestamp must be an ISO 8601 date-time'}
+
+
+@pytest.mark.parametrize('body,error', [
+    ([], 'Request body must be a non-empty JSON array of items'),
+    ({'items': 'x'}, 'Request body must be a non-empty JSON array of items'),
+    ({'calculation_type': 'basic'}, 'Request body must be a non-empty JSON array of items'),
+    ([entry(0)] * (BATCH_MAX_ITEMS + 1), f'Too many items (max {BATCH_MAX_ITEMS})'),
+])
+def test_save_batch_invalid_request(auth_client, body, error):
+    """Malformed batches are rejected as a whole."""
+    response = auth_client.post('/api/history/batch', json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+    assert auth_client.get('/api/history/stats').get_json()['total'] == 0
+
+
+def test_save_batch_unauthenticated(client):
+    """Test that unauthenticated users cannot save batches."""
+    response = client.post('/api/history/batch', json=[entry(0)])
+    assert response.status_code == 401
@@ -0,0 +1,208 @@
+"""
+Tests for the simple and compound interest endpoints.
+"""
+import json
+import pytest
+from src.service.calculators.financial import calculate_compound_interest, BATCH_MAX_ITEMS
+from src.service.calculators.interest import compound_interest_many, simple_interest_many
+
+
+# Single requests
+
+def test_simple_interest_endpoint(client):
+    """Simple interest returns interest and final amount."""
+    response = client.post('/api/calculate/simple-interest', json={
+        'principal': 10000,
+        'rate': 5,
+        'time_years': 3
+    })
+
+    assert response.status_code == 200
+    assert response.get_json() == {'interest': 1500.0, 'final_amount': 11500.0}
+
+
+def test_compound_interest_endpoint(client):
+    """Compound interest defaults to monthly compounding."""
+    response = client.post('/api/calculate/compound-interest', json={
+        'principal': 10000,
+        'rate': 5,
+        'time_years': 10
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data == {'interest': 6470.09, 'final_amount': 16470.09}
+
+    response = client.post('/api/calculate/compound-interest', json={
+        'principal': 10000,
+        'rate': 5,
+        'time_years': 10,
+        'frequency': 'Annual'
+    })
+    assert response.get_json()['final_amount'] == 16288.95
+
+
+def test_interest_endpoint_validation(client):
+    """Missing, malformed and out-of-range parameters are rejected."""
+    cases = [
+        ('/api/calculate/simple-interest', {'rate': 5, 'time_years': 1}, 'principal is required'),
+        ('/api/calculate/simple-interest', {'principal': 'x', 'rate': 5, 'time_years': 1}, 'Invalid parameter types'),
+        ('/api/calculate/simple-interest', {'principal': 0, 'rate': 5, 'time_years': 1},
+         'Principal must be between $1 and $10,000,000'),
+        ('/api/calculate/compound-interest', {'principal': 100, 'rate': 101, 'time_years': 1},
+         'Rate must be between 0% and 100%'),
+        ('/api/calculate/compound-interest', {'principal': 100, 'rate': 5, 'time_years': -1},
+         'Time must be between 0 and 100 years'),
+        ('/api/calculate/compound-interest', {'principal': 100, 'rate': 5, 'time_years': 1, 'frequency': 'daily'},
+         'Frequency must be one of: monthly, quarterly, annual'),
+    ]
+    for url, body, error in cases:
+        response = client.post(url, json=body)
+        assert response.status_code == 400
+        assert response.get_json()['error'] == error
+
+
+@pytest.mark.parametrize('path', ['/api/calculate/simple-interest', '/api/calculate/compound-interest'])
+@pytest.mark.parametrize('precision', ['exact', 'fast'])
+@pytest.mark.parametrize('field,value,error', [
+    ('principal', float('nan'), 'Principal must be between $1 and $10,000,000'),
+    ('principal', float('inf'), 'Principal must be between $1 and $10,000,000'),
+    ('rate', float('nan'), 'Rate must be between 0% and 100%'),
+    ('rate', float('-inf'), 'Rate must be between 0% and 100%'),
+    ('time_years', float('nan'), 'Time must be between 0 and 100 years'),
+    ('time_years', float('inf'), 'Time must be between 0 and 100 years'),
+])
+def test_interest_endpoint_rejects_non_finite(client, path, precision, field, value, error):
+    """NaN and Infinity are out of range, in either precision."""
+    body = {'principal': 10000, 'rate': 5, 'time_years': 3, 'precision': precision, field: value}
+    response = client.post(path, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
+
+
+@pytest.mark.parametrize('path', ['/api/calculate/simple-interest', '/api/calculate/compound-interest'])
+@pytest.mark.parametrize('field', ['principal', 'rate', 'time_years'])
+def test_interest_endpoints_reject_huge_integers(client, path, field):
+    """Integers too large for a float are invalid, singly, in batches and in NDJSON."""
+    body = {'principal': 10000, 'rate': 5, 'time_years': 3, field: 10 ** 400}
+
+    response = client.post(path, json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid parameter types'
+
+    data = client.post(f'{path}/batch', json=[body]).get_json()
+    assert data['results'] == [{'error': 'Invalid parameter types'}]
+
+    response = client.post(path, data=json.dumps(body), content_type='application/x-ndjson')
+    assert json.loads(response.get_data(as_text=True))['error'] == 'Invalid parameter types'
+
+
+def test_interest_endpoint_ndjson(client):
+    """Single interest endpoints stream NDJSON like /api/calculate/emi."""
+    body = '\n'.join([
+        json.dumps({'principal': 1000, 'rate': 10, 'time_years': 1}),
+        json.dumps({'principal': 1000, 'rate': -1, 'time_years': 1}),
+    ])
+    response = client.post('/api/calculate/simple-interest', data=body,
+                           content_type='application/x-ndjson')
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines == [
+        {'line': 1, 'interest': 100.0, 'final_amount': 1100.0},
+        {'line': 2, 'error': 'Rate must be between 0% and 100%'},
+    ]
+
+
+# Batches
+
+def test_simple_interest_batch_exact(client):
+    """Exact batches keep request order and per-item errors."""
+    response = client.post('/api/calculate/simple-interest/batch', json=[
+        {'principal': 10000, 'rate': 5, 'time_years': 3},
+        {'principal': 10000, 'rate': 5},
+        'nope',
+        {'principal': 2500.5, 'rate': 3.3, 'time_years': 0.5},
+    ])
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == 4
+    assert data['errors'] == 2
+    assert data['precision'] == 'exact'
+    assert data['results'] == [
+        {'interest': 1500.0, 'final_amount': 11500.0},
+        {'error': 'time_years is required'},
+        {'error': 'Item must be a JSON object'},
+        {'interest': 41.26, 'final_amount': 2541.76},
+    ]
+
+
+def test_compound_interest_batch_fast_matches_exact(client):
+    """Fast batches agree with the Decimal path to a cent (or float precision)."""
+    items = [
+        {'principal': principal, 'rate': rate, 'time_years': years, 'frequency': frequency}
+        for principal in (1, 999.99, 125000, 10000000)
+        for rate in (0, 4.5, 12, 100)
+        for years in (0, 0.5, 7, 30)
+        for frequency in ('monthly', 'quarterly', 'annual')
+    ]
+    exact = client.post('/api/calculate/compound-interest/batch', json={'items': items}).get_json()
+    fast = client.post('/api/calculate/compound-interest/batch',
+                       json={'items': items, 'precision': 'fast'}).get_json()
+
+    assert fast['precision'] == 'fast'
+    assert fast['errors'] == exact['errors']
+    for exact_item, fast_item in zip(exact['results'], fast['results']):
+        if 'error' in exact_item:
+            assert fast_item == exact_item
+            continue
+        for field in ('interest', 'final_amount'):
+            assert abs(exact_item[field] - fast_item[field]) <= 0.01 + exact_item[field] * 1e-13
+
+
+def test_interest_batch_fast_errors_in_place(client):
+    """Invalid items keep their position in fast batches."""
+    response = client.post('/api/calculate/compound-interest/batch', json={
+        'items': [
+            {'principal': 1000, 'rate': 12, 'time_years': 1, 'frequency': 'annual'},
+            {'principal': 1000, 'rate': 12, 'time_years': 1, 'frequency': 'weekly'},
+            {'principal': 1000, 'rate': 12, 'time_years': 1, 'frequency': 'quarterly'},
+        ],
+        'precision': 'fast'
+    })
+
+    data = response.get_json()
+    assert data['results'][0] == {'interest': 120.0, 'final_amount': 1120.0}
+    assert data['results'][1] == {'error': 'Frequency must be one of: monthly, quarterly, annual'}
+    assert data['results'][2] == {'interest': 125.51, 'final_amount': 1125.51}
+
+
+def test_interest_batch_validation(client):
+    """Malformed batches are rejected up front."""
+    response = client.post('/api/calculate/simple-interest/batch', json={'items': []})
+    assert response.status_code == 400
+
+    response = client.post('/api/calculate/simple-interest/batch', json={
+        'items': [{'principal': 1, 'rate': 1, 'time_years': 1}],
+        'precision': 'approximate'
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'precision must be exact or fast'
+
+    response = client.post('/api/calculate/simple-interest/batch',
+                           json=[{}] * (BATCH_MAX_ITEMS + 1))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == f'Too many items (max {BATCH_MAX_ITEMS})'
+
+
+def test_vectorized_interest_functions():
+    """Vectorized helpers return cent-rounded arrays."""
+    interest, final_amount = simple_interest_many([1000, 2000], [10, 5], [1, 2])
+    assert interest.tolist() == [100.0, 200.0]
+    assert final_amount.tolist() == [1100.0, 2200.0]
+
+    interest, final_amount = compound_interest_many([10000], [5], [10], [12])
+    expected = calculate_compound_interest(10000, 5, 10, 'monthly')
+    assert final_amount.tolist() == [float(expected['final_amount'])]
+    assert interest.tolist() == [float(expected['interest'])]
@@ -0,0 +1,82 @@
+"""
+Tests for the Monte Carlo loan-cost simulation.
+"""
+import numpy as np
+import pytest
+from src.service.calculators import montecarlo
+from src.service.calculators.financial import calculate_emi
+from src.service.calculators.montecarlo import simulate_interest, MAX_PATHS
+
+BODY = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20}
+
+
+def test_zero_volatility_matches_fixed_rate():
+    """Without rate moves every path pays the fixed-rate interest."""
+    totals = simulate_interest(100000, 8.5, 20, 50, volatility=0)
+    expected = float(calculate_emi(100000, 8.5, 20)['total_interest'])
+
+    assert totals.shape == (50,)
+    # The unrounded EMI differs from the rounded one by under a cent a month
+    assert np.allclose(totals, expected, atol=240 * 0.005)
+    assert (simulate_interest(12000, 0, 1, 3, volatility=0) == 0).all()
+
+
+def test_seeded_and_independent_of_chunk_size(monkeypatch):
+    """A seed reproduces the same paths however they are chunked."""
+    first = simulate_interest(100000, 8.5, 20, 2500, seed=7, reset_months=6)
+    assert np.array_equal(first, simulate_interest(100000, 8.5, 20, 2500, seed=7, reset_months=6))
+    assert not np.array_equal(first, simulate_interest(100000, 8.5, 20, 2500, seed=8, reset_months=6))
+
+    monkeypatch.setattr(montecarlo, 'PATH_CHUNK', 333)
+    assert np.array_equal(first, simulate_interest(100000, 8.5, 20, 2500, seed=7, reset_months=6))
+
+
+def test_drift_moves_the_distribution():
+    """Upward drift raises the cost of every path compared with downward drift."""
+    up = simulate_interest(100000, 8.5, 20, 500, seed=1, volatility=0, drift=0.25)
+    down = simulate_interest(100000, 8.5, 20, 500, seed=1, volatility=0, drift=-0.25)
+    fixed = float(calculate_emi(100000, 8.5, 20)['total_interest'])
+
+    assert (down < fixed).all() and (up > fixed).all()
+
+
+def test_monte_carlo_endpoint(client):
+    """Summary statistics, percentiles and a histogram over all paths."""
+    body = {**BODY, 'paths': 4000, 'seed': 42, 'bins': 8, 'percentiles': [10, 50, 90]}
+    response = client.post('/api/calculate/emi/monte-carlo', json=body)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['paths'] == 4000 and data['seed'] == 42
+    assert data['fixed_rate_interest'] == 108277.58
+    assert set(data['percentiles']) == {'p10', 'p50', 'p90'}
+    assert data['min'] <= data['percentiles']['p10'] <= data['percentiles']['p50'] \
+        <= data['percentiles']['p90'] <= data['max']
+    assert sum(data['histogram']['counts']) == 4000
+    assert len(data['histogram']['edges']) == 9
+    assert data['histogram']['edges'][0] == data['min']
+
+    assert client.post('/api/calculate/emi/monte-carlo', json=body).get_json() == data
+
+
+@pytest.mark.parametrize('extra,error', [
+    ({'paths': 0}, f'paths must be between 1 and {MAX_PATHS}'),
+    ({'paths': MAX_PATHS + 1}, f'paths must be between 1 and {MAX_PATHS}'),
+    ({'seed': -1}, 'seed must be non-negative'),
+    ({'reset_months': 241}, 'reset_months must be between 1 and 240'),
+    ({'bins': 0}, 'bins must be between 1 and 1000'),
+    ({'percentiles': [101]}, 'percentiles must be a list of numbers between 0 and 100'),
+    ({'percentiles': '50'}, 'percentiles must be a list of numbers between 0 and 100'),
+    ({'paths': float('inf')}, 'Invalid parameter types'),
+    ({'volatility': 10 ** 400}, 'Invalid parameter types'),
+    ({'drift': -10 ** 400}, 'Invalid parameter types'),
+    ({'volatility': 11}, 'volatility must be between 0 and 10'),
+    ({'drift': 'x'}, 'Invalid parameter types'),
+    ({'tenure_years': 0}, 'Tenure must be between 1 and 30 years'),
+])
+def test_monte_carlo_validation(client, extra, error):
+    """Settings out of range are rejected before simulating."""
+    response = client.post('/api/calculate/emi/monte-carlo', json={**BODY, **extra})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
@@ -0,0 +1,116 @@
+"""
+Tests for "precision": "fast" and its verification harness.
+"""
+import json
+import pytest
+from src.service.calculators.financial import (
+    emi_many,
+    result_cache,
+    BATCH_MAX_ITEMS,
+    FAST_ABSOLUTE_ERROR,
+    FAST_RELATIVE_ERROR
+)
+from benchmarks.precision import verify_fast
+
+LOAN = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20}
+
+
+def within_bound(fast, exact):
+    """The documented worst-case error of fast mode."""
+    return abs(fast - exact) <= FAST_ABSOLUTE_ERROR + FAST_RELATIVE_ERROR * abs(exact)
+
+
+def test_verify_fast_within_documented_bound():
+    """Sampled inputs from every calculator stay within the bound."""
+    reports = verify_fast(samples=2000, seed=3)
+
+    assert set(reports) == {'emi', 'simple_interest', 'compound_interest'}
+    for report in reports.values():
+        assert report['samples'] == 2000
+        assert report['within_bound'], report
+
+
+def test_emi_many_zero_rate_and_small_rates():
+    """Zero rates repay the principal; tiny rates stay close to it."""
+    emi, total_interest, total_payment = emi_many([12000, 12000], [0, 1e-9], [1, 1])
+
+    assert emi.tolist() == [1000.0, 1000.0]
+    assert total_interest.tolist() == [0.0, 0.0]
+    assert total_payment.tolist() == [12000.0, 12000.0]
+
+
+@pytest.mark.parametrize('path,body', [
+    ('/api/calculate/emi', LOAN),
+    ('/api/calculate/simple-interest', {'principal': 10000, 'rate': 5, 'time_years': 3}),
+    ('/api/calculate/compound-interest', {'principal': 10000, 'rate': 5, 'time_years': 10}),
+])
+def test_fast_single_requests(client, path, body):
+    """Fast single requests return the same fields, within the bound."""
+    exact = client.post(path, json=body).get_json()
+    response = client.post(path, json={**body, 'precision': 'fast'})
+
+    assert response.status_code == 200
+    fast = response.get_json()
+    assert fast.keys() == exact.keys()
+    for field in exact:
+        assert within_bound(fast[field], exact[field])
+
+
+def test_fast_requests_bypass_result_cache(client):
+    """Only the default Decimal path goes through the result cache."""
+    result_cache.clear()
+    client.post('/api/calculate/emi', json={**LOAN, 'precision': 'fast'})
+    assert result_cache.stats()['misses'] == 0
+
+    client.post('/api/calculate/emi', json={**LOAN, 'precision': 'exact'})
+    assert result_cache.stats()['misses'] == 1
+    result_cache.clear()
+
+
+def test_fast_ndjson_lines(client):
+    """Each NDJSON line picks its own precision."""
+    body = '\n'.join(json.dumps(line) for line in [LOAN, {**LOAN, 'precision': 'fast'},
+                                                    {**LOAN, 'precision': 'float'}])
+    response = client.post('/api/calculate/emi', data=body, content_type='application/x-ndjson')
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[0]['emi'] == lines[1]['emi'] == 867.82
+    assert lines[2]['error'] == 'precision must be exact or fast'
+
+
+def test_emi_batch(client):
+    """EMI batches compute valid items in either precision, errors in place."""
+    items = [
+        LOAN,
+        {**LOAN, 'tenure_years': 31},
+        {'loan_amount': 12000, 'annual_rate': 0, 'tenure_years': 1},
+        {'loan_amount': 9999999.99, 'annual_rate': 29.99, 'tenure_years': 30},
+    ]
+    exact = client.post('/api/calculate/emi/batch', json=items).get_json()
+    fast = client.post('/api/calculate/emi/batch', json={'items': items, 'precision': 'fast'}).get_json()
+
+    assert (exact['precision'], fast['precision']) == ('exact', 'fast')
+    assert exact['count'] == fast['count'] == 4
+    assert exact['errors'] == fast['errors'] == 1
+    assert exact['results'][0] == client.post('/api/calculate/emi', json=LOAN).get_json()
+    assert exact['results'][1] == fast['results'][1] == {'error': 'Tenure must be between 1 and 30 years'}
+    for exact_item, fast_item in zip(exact['results'], fast['results']):
+        if 'error' in exact_item:
+            continue
+        for field in exact_item:
+            assert within_bound(fast_item[field], exact_item[field])
+
+
+@pytest.mark.parametrize('path,body,error', [
+    ('/api/calculate/emi', {**LOAN, 'precision': 'approximate'}, 'precision must be exact or fast'),
+    ('/api/calculate/compound-interest', {'principal': 1, 'rate': 1, 'time_years': 1, 'precision': 1},
+     'precision must be exact or fast'),
+    ('/api/calculate/emi/batch', {'items': [LOAN], 'precision': 'float'}, 'precision must be exact or fast'),
+    ('/api/calculate/emi/batch', [LOAN] * (BATCH_MAX_ITEMS + 1), f'Too many items (max {BATCH_MAX_ITEMS})'),
+])
+def test_precision_validation(client, path, body, error):
+    """Unknown precisions are rejected."""
+    response = client.post(path, json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
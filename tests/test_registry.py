@@ -0,0 +1,98 @@
+"""
+Tests for the operation registry.
+"""
+import pytest
+from src.service.app import app
+from src.service.calculators.registry import OPERATIONS, Operation, register, get_operation
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def hypot_operation():
+    """Register a temporary operation and remove it afterwards."""
+    operation = register(Operation(
+        'hypot', 2, lambda a, b: (a * a + b * b) ** 0.5,
+        rules=[(lambda a, b: (a < 0) | (b < 0), 'Sides must be non-negative')]
+    ))
+    yield operation
+    del OPERATIONS['hypot']
+
+
+def test_registry_has_builtin_operations():
+    """Test all original calculate() operations are registered."""
+    for name in ['add', 'subtract', 'multiply', 'divide', 'factorial', 'power', 'modulo']:
+        assert get_operation(name).name == name
+    assert get_operation('factorial').arity == 1
+
+
+def test_registry_unknown_operation():
+    """Test unknown and unhashable operation names are not found."""
+    assert get_operation('invalid') is None
+    assert get_operation(None) is None
+    assert get_operation(['add']) is None
+
+
+def test_registry_operand_messages_follow_arity():
+    """Test operand errors match the original per-arity messages."""
+    assert get_operation('factorial').validate(None)[2] == 'Missing operand'
+    assert get_operation('factorial').validate('x')[2] == 'Operand must be a number'
+    assert get_operation('add').validate(1, None)[2] == 'Missing operands'
+    assert get_operation('add').validate(1, 'x')[2] == 'Operands must be numbers'
+
+
+def test_registry_rules_checked_in_order():
+    """Test the first failing rule determines the error."""
+    factorial = get_operation('factorial')
+    assert factorial.validate(-1.5)[2] == 'Factorial not defined for negative numbers'
+    assert factorial.validate(21.5)[2] == 'Factorial requires integer input'
+    assert factorial.validate(21)[2] == 'Factorial input too large (max 20)'
+    assert factorial.validate(float('inf'))[2] == 'Factorial requires integer input'
+
+
+def test_registry_compute_reports_float_errors():
+    """Test float errors become error messages instead of exceptions."""
+    power = get_operation('power')
+    assert power.compute(1e10, 100.0) == (None, 'Result too large')
+    assert power.compute(0.0, -1.0) == (None, 'Division by zero')
+    assert power.compute(-8.0, 0.5) == (None, 'Result is not a real number')
+
+
+def test_registry_callable_function():
+    """Test operations built from plain callables for the formula and rules."""
+    operation = Operation('double', 1, lambda a: a * 2, rules=[(lambda a, b: a > 10, 'Too big')])
+    assert operation.evaluate('4') == (8.0, None)
+    assert operation.evaluate(11) == (None, 'Too big')
+    assert operation.evaluate(None) == (None, 'Missing operand')
+    assert operation.compute_many([1.0, 2.5]) == [(2.0, None), (5.0, None)]
+
+
+def test_registered_operation_served_by_endpoints(client, hypot_operation):
+    """Test a newly registered operation is available without endpoint changes."""
+    response = client.post('/api/calculate', json={'operation': 'hypot', 'a': 3, 'b': 4})
+    assert response.status_code == 200
+    assert response.get_json()['result'] == 5
+
+    response = client.post('/api/calculate', json={'operation': 'hypot', 'a': -3, 'b': 4})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Sides must be non-negative'
+
+    response = client.post('/api/calculate/batch', json=[
+        {'operation': 'hypot', 'a': 6, 'b': 8},
+        {'operation': 'hypot', 'a': 5, 'b': 12}
+    ])
+    assert [item['result'] for item in response.get_json()['results']] == [10, 13]
+
+
+def test_registry_compute_array_without_vector_function(hypot_operation):
+    """Test compute_array falls back to scalar compute and applies rules."""
+    import numpy as np
+    values, valid = hypot_operation.compute_array(np.array([3.0, -1.0]), np.array([4.0, 1.0]))
+    assert values[0] == 5
+    assert valid.tolist() == [True, False]
@@ -0,0 +1,171 @@
+"""
+Tests for the repayment scenario engine.
+"""
+import pytest
+from src.service.calculators import scenarios
+from src.service.calculators.amortization import amortization_schedule
+from src.service.calculators.scenarios import parse_scenario, simulate, run_scenarios, MAX_SCENARIOS
+
+LOAN = (100000, 8.5, 20)
+
+
+def scenario(**fields):
+    parsed, error = parse_scenario(fields, LOAN[2])
+    assert error is None
+    return parsed
+
+
+@pytest.fixture
+def two_workers():
+    scenarios.configure(2)
+    yield
+    scenarios.configure()
+
+
+def test_baseline_matches_amortization_schedule():
+    """Without events the loan runs its full tenure, like the closed-form schedule."""
+    result = simulate(LOAN, scenario())
+    schedule = amortization_schedule(*LOAN)
+
+    assert result['months'] == 240
+    assert result['final_emi'] == 86782
+    assert result['total_payment'] == result['total_interest'] + 10000000
+    # Rounding interest each month stays within a dollar of the closed form
+    assert abs(result['total_interest'] - int(schedule['interest'].sum())) <= 100
+
+
+def test_prepayment_strategies():
+    """A prepayment shortens the loan, or lowers the EMI with reduce_emi."""
+    prepay = [{'month': 12, 'amount': 10000}]
+    tenure = simulate(LOAN, scenario(prepayments=prepay))
+    emi = simulate(LOAN, scenario(prepayments=prepay, strategy='reduce_emi'))
+    baseline = simulate(LOAN, scenario())
+
+    assert tenure['months'] < 240 and tenure['final_emi'] == 86782
+    assert emi['months'] == 240 and emi['final_emi'] < 86782
+    assert tenure['total_prepaid'] == emi['total_prepaid'] == 1000000
+    assert tenure['total_interest'] < emi['total_interest'] < baseline['total_interest']
+
+
+def test_step_up_and_rate_reset():
+    """Step-ups compound the EMI; rate resets change interest from their month."""
+    step = simulate(LOAN, scenario(step_up={'percent': 10, 'every_months': 12}))
+    assert step['final_emi'] > 86782 and step['months'] < 240
+
+    higher = simulate(LOAN, scenario(rate_resets=[{'month': 13, 'annual_rate': 9.5}]))
+    lower = simulate(LOAN, scenario(rate_resets=[{'month': 13, 'annual_rate': 7.5}]))
+    assert lower['months'] < 240 < higher['months']
+
+    reset = simulate(LOAN, scenario(rate_resets=[{'month': 13, 'annual_rate': 9.5}], strategy='reduce_emi'))
+    assert reset['months'] == 240 and reset['final_emi'] > 86782
+
+    assert simulate(LOAN, scenario(rate_resets=[{'month': 2, 'annual_rate': 30}])) == {
+        'error': 'EMI does not cover the interest in month 2'
+    }
+
+
+def test_parse_scenario_validation():
+    """Events are checked against the tenure and the accepted ranges."""
+    assert parse_scenario([], 20) == (None, 'Scenario must be an object')
+    assert parse_scenario({'strategy': 'x'}, 20)[1] == 'strategy must be one of: reduce_tenure, reduce_emi'
+    assert parse_scenario({'prepayments': [{'month': 241, 'amount': 1}]}, 20)[1] == \
+        'Event month must be between 1 and 240'
+    assert parse_scenario({'prepayments': [{'month': 1, 'amount': 0}]}, 20)[1] == \
+        'Prepayment amount must be positive'
+    assert parse_scenario({'prepayments': [{'month': 1, 'amount': 1e30}]}, 20)[1] == \
+        'Prepayment amount must be at most $10,000,000'
+    assert parse_scenario({'rate_resets': [{'month': 1, 'annual_rate': 31}]}, 20)[1] == \
+        'Annual rate must be between 0% and 30%'
+    assert parse_scenario({'step_up': {'percent': 0}}, 20)[1] == \
+        'Step-up percent must be between 0% and 100%'
+    assert parse_scenario({'prepayments': [{'month': 'x'}]}, 20)[1] == 'Invalid parameter types'
+    assert parse_scenario({'prepayments': [{'month': 1, 'amount': 1}] * 361}, 20)[1] == \
+        'Too many events (max 360)'
+
+
+def test_scenarios_endpoint(client):
+    """Per-scenario totals with interest saved against the baseline."""
+    response = client.post('/api/calculate/emi/scenarios', json={
+        'loan_amount': 100000,
+        'annual_rate': 8.5,
+        'tenure_years': 20,
+        'scenarios': [
+            {'name': 'prepay', 'prepayments': [{'month': 12, 'amount': 10000}]},
+            {'step_up': {'percent': 5}},
+            {'name': 'bad', 'prepayments': [{'month': 0, 'amount': 10}]},
+        ]
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == 3
+    assert data['workers'] == 1
+    assert data['baseline']['months'] == 240
+
+    prepay, step, bad = data['scenarios']
+    assert prepay['name'] == 'prepay'
+    assert prepay['interest_saved'] == round(data['baseline']['total_interest'] - prepay['total_interest'], 2)
+    assert prepay['months_saved'] == 240 - prepay['months']
+    assert step['name'] == 'scenario 2' and step['interest_saved'] > 0
+    assert bad == {'name': 'bad', 'error': 'Event month must be between 1 and 240'}
+    assert data['errors'] == [{'index': 2, 'error': 'Event month must be between 1 and 240'}]
+
+
+def test_scenarios_endpoint_validation(client):
+    """The base loan and the scenario list are validated."""
+    body = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20}
+
+    response = client.post('/api/calculate/emi/scenarios', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'scenarios must be a non-empty list'
+
+    response = client.post('/api/calculate/emi/scenarios', json={**body, 'scenarios': [{}] * (MAX_SCENARIOS + 1)})
+    assert response.get_json()['error'] == f'Too many scenarios (max {MAX_SCENARIOS})'
+
+    response = client.post('/api/calculate/emi/scenarios', json={**body, 'loan_amount': 10, 'scenarios': [{}]})
+    assert response.get_json()['error'] == 'Loan amount must be between $1,000 and $10,000,000'
+
+
+def test_worker_pool_matches_in_process(two_workers):
+    """Large sets fan out to the pool and return the same results in order."""
+    items = [scenario(prepayments=[{'month': month, 'amount': 5000}], step_up={'percent': month % 7 + 1})
+             for month in range(1, 41)]
+
+    pooled, workers = run_scenarios(LOAN, items)
+
+    assert workers == 2
+    assert pooled == [simulate(LOAN, item) for item in items]
+
+
+def test_configure_rejects_invalid_workers():
+    """Worker counts must be positive integers."""
+    with pytest.raises(ValueError):
+        scenarios.configure(0)
+
+
+def test_scenarios_endpoint_non_finite_inputs(client):
+    """Infinite, NaN or huge event values fail only their own scenario."""
+    bad_scenarios = [
+        {'prepayments': [{'month': float('inf'), 'amount': 10}]},
+        {'prepayments': [{'month': 1, 'amount': float('inf')}]},
+        {'prepayments': [{'month': 1, 'amount': float('nan')}]},
+        {'rate_resets': [{'month': 1, 'annual_rate': float('nan')}]},
+        {'step_up': {'percent': float('nan')}},
+        {'prepayments': [{'month': 1, 'amount': 1e30}]},
+    ]
+    response = client.post('/api/calculate/emi/scenarios', json={
+        'loan_amount': 100000,
+        'annual_rate': 8.5,
+        'tenure_years': 20,
+        'scenarios': [{}] + bad_scenarios
+    })
+
+    assert response.status_code == 200
+    assert response.get_json()['errors'] == [
+        {'index': 1, 'error': 'Invalid parameter types'},
+        {'index': 2, 'error': 'Parameters must be finite numbers'},
+        {'index': 3, 'error': 'Parameters must be finite numbers'},
+        {'index': 4, 'error': 'Parameters must be finite numbers'},
+        {'index': 5, 'error': 'Parameters must be finite numbers'},
+        {'index': 6, 'error': 'Prepayment amount must be at most $10,000,000'},
+    ]
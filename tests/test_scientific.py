@@ -0,0 +1,119 @@
+"""
+Tests for server-side scientific operations.
+"""
+import math
+import numpy as np
+import pytest
+from src.service.app import app
+from src.service.calculators.scientific import round_like_js, round_like_js_array
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def calculate(client, **body):
+    response = client.post('/api/calculate', json=body)
+    return response.status_code, response.get_json()
+
+
+def test_scientific_trig_degrees_default(client):
+    """Test trig functions default to degrees like the frontend."""
+    assert calculate(client, operation='sin', a=30) == (200, {'result': 0.5})
+    assert calculate(client, operation='cos', a=60) == (200, {'result': 0.5})
+    assert calculate(client, operation='tan', a=45) == (200, {'result': 1.0})
+
+
+def test_scientific_trig_radians(client):
+    """Test RAD angle mode."""
+    status, data = calculate(client, operation='sin', a=math.pi / 2, angle_mode='RAD')
+    assert status == 200
+    assert data['result'] == 1.0
+
+
+def test_scientific_invalid_angle_mode(client):
+    """Test unknown angle modes are rejected."""
+    status, data = calculate(client, operation='sin', a=30, angle_mode='GRAD')
+    assert status == 400
+    assert data['error'] == 'angle_mode must be DEG or RAD'
+
+
+def test_scientific_functions(client):
+    """Test sqrt, log, ln and exp with frontend rounding."""
+    assert calculate(client, operation='sqrt', a=16)[1]['result'] == 4
+    assert calculate(client, operation='log', a=1000)[1]['result'] == 3
+    assert calculate(client, operation='ln', a=math.e)[1]['result'] == 1
+    assert calculate(client, operation='exp', a=1)[1]['result'] == 2.7182818285
+
+
+def test_scientific_domain_errors(client):
+    """Test domain errors use the frontend messages."""
+    cases = [
+        ('sqrt', -1, 'Cannot take square root of negative number'),
+        ('log', 0, 'Logarithm requires positive number'),
+        ('ln', -5, 'Natural log requires positive number'),
+        ('sin', None, 'Missing operand'),
+        ('exp', 'abc', 'Operand must be a number'),
+    ]
+    for operation, a, message in cases:
+        status, data = calculate(client, operation=operation, a=a)
+        assert status == 400
+        assert data['error'] == message
+
+
+def test_scientific_array_input(client):
+    """Test a whole column is converted in one call."""
+    status, data = calculate(client, operation='sin', a=[0, 30, 90, 270])
+    assert status == 200
+    assert data == {'result': [0.0, 0.5, 1.0, -1.0], 'errors': []}
+
+
+def test_scientific_array_partial_errors(client):
+    """Test invalid elements are reported by index."""
+    status, data = calculate(client, operation='sqrt', a=[4, -4, 9])
+    assert status == 200
+    assert data['result'] == [2.0, None, 3.0]
+    assert data['errors'] == [{'index': 1, 'error': 'Cannot take square root of negative number'}]
+
+
+def test_array_input_binary_operations(client):
+    """Test arrays broadcast against scalars for binary operations."""
+    status, data = calculate(client, operation='divide', a=[10, 20], b=[2, 0])
+    assert data['result'] == [5.0, None]
+    assert data['errors'] == [{'index': 1, 'error': 'Division by zero'}]
+
+    status, data = calculate(client, operation='multiply', a=[1, 2, 3], b=2)
+    assert data['result'] == [2.0, 4.0, 6.0]
+
+    status, data = calculate(client, operation='add', a=[1, 2], b=[1, 2, 3])
+    assert status == 400
+
+
+def test_scientific_matches_batch_and_evaluate_paths(client):
+    """Test scientific operations are available in batch requests."""
+    response = client.post('/api/calculate/batch', json=[
+        {'operation': 'sin', 'a': 30},
+        {'operation': 'sin', 'a': math.pi / 6, 'angle_mode': 'RAD'},
+        {'operation': 'log', 'a': -1}
+    ])
+    results = response.get_json()['results']
+    assert results == [
+        {'result': 0.5},
+        {'result': 0.5},
+        {'error': 'Logarithm requires positive number'}
+    ]
+
+
+def test_round_like_js():
+    """Test rounding follows Math.round(x * 1e10) / 1e10."""
+    assert round_like_js(0.4999999999) == 0.4999999999
+    assert round_like_js(0.49999999999) == 0.5
+    assert round_like_js(1.23456789016) == 1.2345678902
+    assert round_like_js(-0.00000000005) == 0.0
+    assert round_like_js(1e20) == 1e20
+    values = [0.1 + 0.2, -2.00000000005, 1e300]
+    assert round_like_js_array(np.array(values)).tolist() == [round_like_js(v) for v in values]
@@ -0,0 +1,106 @@
+"""
+Tests for the SIP / recurring-deposit calculator (closed-form series).
+"""
+import pytest
+from decimal import Decimal, localcontext
+from src.service.calculators.sip import sip_series
+from src.service.calculators.financial import COMPOUNDING_FREQUENCIES
+
+PLAN = {'monthly_investment': 5000, 'annual_rate': 12, 'years': 10}
+
+
+def iterative_sip(monthly_investment, annual_rate, years, frequency, step_up_percent, timing):
+    """Reference month-by-month loop in high-precision Decimal."""
+    with localcontext() as ctx:
+        ctx.prec = 50
+        n = COMPOUNDING_FREQUENCIES[frequency]
+        q = (1 + Decimal(str(annual_rate)) / 100 / n) ** (Decimal(n) / 12)
+        contribution = Decimal(str(monthly_investment))
+        invested = value = Decimal(0)
+        series = []
+        for _ in range(years):
+            for _ in range(12):
+                value = (value + contribution) * q if timing == 'start' else value * q + contribution
+                invested += contribution
+            series.append((float(invested), float(value)))
+            contribution *= 1 + Decimal(str(step_up_percent)) / 100
+        return series
+
+
+@pytest.mark.parametrize('plan', [
+    (5000, 12, 10, 'monthly', 0, 'start'),
+    (5000, 12, 10, 'quarterly', 10, 'end'),
+    (100, 0, 5, 'monthly', 5, 'start'),
+    (1000, 10, 30, 'annual', 10, 'start'),   # yearly growth equals the step-up
+    (250.5, 7.1, 50, 'monthly', 3.5, 'end'),
+])
+def test_closed_form_matches_iterative(plan):
+    """Every year of the geometric series agrees with a month-by-month loop."""
+    monthly_investment, annual_rate, years, frequency, step_up_percent, timing = plan
+    invested, value = sip_series([monthly_investment], [annual_rate], [years],
+                                 [COMPOUNDING_FREQUENCIES[frequency]], [step_up_percent], [timing])
+
+    for year, (expected_invested, expected_value) in enumerate(iterative_sip(*plan)):
+        assert invested[0, year] == pytest.approx(expected_invested, rel=1e-12)
+        assert value[0, year] == pytest.approx(expected_value, rel=1e-12)
+
+
+def test_sip_endpoint(client):
+    """Totals plus the year-by-year series."""
+    response = client.post('/api/calculate/sip', json=PLAN)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['total_invested'] == 600000
+    assert data['future_value'] == 1161695.38
+    assert data['gains'] == 561695.38
+    assert len(data['series']['value']) == 10
+    assert data['series']['invested'][0] == 60000
+    assert data['series']['value'][-1] == data['future_value']
+
+    data = client.post('/api/calculate/sip', json={**PLAN, 'timing': 'end', 'step_up_percent': 10}).get_json()
+    assert data['total_invested'] == round(60000 * (1.1 ** 10 - 1) / 0.1, 2)
+
+
+def test_sip_batch(client):
+    """Plans of different lengths are computed together; series is opt-in."""
+    response = client.post('/api/calculate/sip/batch', json={'items': [
+        PLAN,
+        {**PLAN, 'years': 3, 'frequency': 'annual'},
+        {**PLAN, 'years': 0},
+        {**PLAN, 'monthly_investment': 10000000, 'annual_rate': 100, 'years': 50},
+    ], 'series': True})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == 4 and data['errors'] == 2
+    single = client.post('/api/calculate/sip', json=PLAN).get_json()
+    assert data['results'][0] == single
+    assert len(data['results'][1]['series']['value']) == 3
+    assert data['results'][2] == {'error': 'Years must be between 1 and 50'}
+    assert data['results'][3] == {'error': 'Result too large (max 15 digits)'}
+
+    data = client.post('/api/calculate/sip/batch', json=[PLAN]).get_json()
+    assert 'series' not in data['results'][0]
+
+
+@pytest.mark.parametrize('extra,error', [
+    ({'monthly_investment': None}, 'monthly_investment is required'),
+    ({'monthly_investment': 0}, 'Monthly investment must be between $1 and $10,000,000'),
+    ({'annual_rate': 101}, 'Rate must be between 0% and 100%'),
+    ({'years': 'x'}, 'Invalid parameter types'),
+    ({'years': float('inf')}, 'Invalid parameter types'),
+    ({'years': float('nan')}, 'Invalid parameter types'),
+    ({'monthly_investment': float('nan')}, 'Monthly investment must be between $1 and $10,000,000'),
+    ({'annual_rate': float('nan')}, 'Rate must be between 0% and 100%'),
+    ({'step_up_percent': float('inf')}, 'Step-up must be between 0% and 100%'),
+    ({'step_up_percent': -1}, 'Step-up must be between 0% and 100%'),
+    ({'frequency': 'daily'}, 'Frequency must be one of: monthly, quarterly, annual'),
+    ({'timing': 'middle'}, 'timing must be start or end'),
+])
+def test_sip_validation(client, extra, error):
+    """Out-of-range plans are rejected with a message."""
+    response = client.post('/api/calculate/sip', json={**PLAN, **extra})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == error
@@ -0,0 +1,168 @@
+"""
+Tests for the inverse EMI solvers (principal, tenure, rate).
+"""
+import numpy as np
+import pytest
+from src.service.calculators.financial import calculate_emi
+from src.service.calculators.solvers import (
+    emi_values,
+    solve_principal,
+    solve_rate,
+    solve_tenure,
+    SOLVER_MAX_ITEMS
+)
+
+
+def test_emi_values_match_calculate_emi():
+    """The vectorized formula agrees with calculate_emi() before rounding."""
+    P = np.array([100000.0, 50000.0, 12000.0])
+    rates = np.array([8.5, 12.0, 0.0])
+    years = np.array([20.0, 5.0, 1.0])
+
+    values = emi_values(P, rates / 1200, years * 12)
+
+    for value, loan, rate, tenure in zip(values, P, rates, years):
+        assert round(value, 2) == float(calculate_emi(loan, rate, int(tenure))['emi'])
+
+
+def test_solvers_round_trip():
+    """Each solver recovers the parameter that produced the EMI."""
+    rng = np.random.default_rng(7)
+    P = rng.uniform(1000, 10000000, 2000)
+    rates = np.concatenate([rng.uniform(0, 30, 1500), rng.uniform(0, 0.01, 400), np.zeros(100)])
+    years = rng.integers(1, 31, 2000).astype(float)
+    emi = emi_values(P, rates / 1200, years * 12)
+
+    rate = solve_rate(emi, P, years)
+    assert rate['converged'].all()
+    assert rate['iterations'].max() <= 10
+    assert np.allclose(rate['annual_rate'], rates, rtol=0, atol=1e-6)
+
+    tenure = solve_tenure(emi, P, rates)
+    assert np.allclose(tenure['tenure_months'], years * 12, rtol=1e-9)
+
+    principal = solve_principal(emi, rates, years)
+    assert (principal['residual'] <= 1e-6).all()
+    assert np.allclose(principal['loan_amount'], P, rtol=0, atol=0.011)
+
+
+def test_solve_principal_endpoint(client):
+    """Affordable principal keeps the EMI at or under the target."""
+    response = client.post('/api/calculate/emi/solve/principal', json={
+        'emi': [867.82, 1000, -5],
+        'annual_rate': 8.5,
+        'tenure_years': 20
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['count'] == 3
+    assert 99999 < data['loan_amount'][0] <= 100000   # 867.82 is the rounded EMI
+    assert float(calculate_emi(data['loan_amount'][1], 8.5, 20)['emi']) <= 1000
+    assert data['loan_amount'][2] is None
+    assert data['errors'] == [{'index': 2, 'error': 'EMI must be positive'}]
+    assert data['diagnostics']['max_abs_residual'] < 0.01
+
+
+def test_solve_tenure_endpoint(client):
+    """Tenure is solved in months; EMIs below the interest are rejected."""
+    response = client.post('/api/calculate/emi/solve/tenure', json={
+        'emi': [867.82, 1000, 500],
+        'loan_amount': 100000,
+        'annual_rate': [8.5, 0, 8.5]
+    })
+
+    data = response.get_json()
+    assert abs(data['tenure_months'][0] - 240) < 0.01
+    assert data['tenure_months'][1] == 100
+    assert data['tenure_months'][2] is None
+    assert data['errors'] == [{'index': 2, 'error': 'EMI must exceed the monthly interest on the loan'}]
+
+
+def test_solve_rate_endpoint(client):
+    """Rates are solved together with convergence diagnostics."""
+    response = client.post('/api/calculate/emi/solve/rate', json={
+        'emi': [867.82, 1000, 100, 100000],
+        'loan_amount': 100000,
+        'tenure_years': [20, 10, 20, 20]
+    })
+
+    data = response.get_json()
+    assert abs(data['annual_rate'][0] - 8.5) < 0.001
+    assert data['converged'][:2] == [True, True]
+    assert data['iterations'][0] >= 1
+    assert data['annual_rate'][2] is None
+    assert data['errors'] == [
+        {'index': 2, 'error': 'EMI too low: total payments are less than the loan'},
+        {'index': 3, 'error': 'EMI too high: rate would exceed 30%'},
+    ]
+    assert data['diagnostics']['unconverged'] == 0
+    assert data['diagnostics']['max_iterations'] >= 1
+    assert data['diagnostics']['max_abs_residual'] < 1e-6
+
+
+def test_solve_rate_zero_rate(client):
+    """An EMI of exactly P / n solves to a zero rate."""
+    response = client.post('/api/calculate/emi/solve/rate', json={
+        'emi': 1000,
+        'loan_amount': 12000,
+        'tenure_years': 1
+    })
+
+    data = response.get_json()
+    assert data['annual_rate'] == [0.0]
+    assert data['converged'] == [True]
+
+
+def test_solver_validation(client):
+    """Malformed requests and out-of-range items are reported."""
+    response = client.post('/api/calculate/emi/solve/rate', json={'emi': 1000, 'loan_amount': 1000})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'tenure_years is required'
+
+    response = client.post('/api/calculate/emi/solve/rate', json={
+        'emi': [1, 2], 'loan_amount': [1000, 2000, 3000], 'tenure_years': 1
+    })
+    assert response.get_json()['error'] == 'Array parameters must have the same length'
+
+    response = client.post('/api/calculate/emi/solve/rate', json={
+        'emi': 'abc', 'loan_amount': 1000, 'tenure_years': 1
+    })
+    assert response.get_json()['error'] == 'Invalid parameter types'
+
+    response = client.post('/api/calculate/emi/solve/rate', json={
+        'emi': [1000, 10 ** 400], 'loan_amount': 100000, 'tenure_years': 20
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid parameter types'
+
+    response = client.post('/api/calculate/emi/solve/tenure', json={
+        'emi': [1] * (SOLVER_MAX_ITEMS + 1), 'loan_amount': 1000, 'annual_rate': 1
+    })
+    assert response.get_json()['error'] == f'Too many items (max {SOLVER_MAX_ITEMS})'
+
+    response = client.post('/api/calculate/emi/solve/principal', json={
+        'emi': 1000, 'annual_rate': [31, 5], 'tenure_years': [5, 0]
+    })
+    data = response.get_json()
+    assert data['loan_amount'] == [None, None]
+    assert data['errors'] == [
+        {'index': 0, 'error': 'Annual rate must be between 0% and 30%'},
+        {'index': 1, 'error': 'Tenure must be between 1 and 30 years'},
+    ]
+    assert data['diagnostics'] == {}
+
+
+@pytest.mark.parametrize('path,body', [
+    ('/api/calculate/emi/solve/principal', {'emi': [1000, float('inf')], 'annual_rate': 8.5, 'tenure_years': 20}),
+    ('/api/calculate/emi/solve/tenure', {'emi': 1000, 'loan_amount': [100000, float('nan')], 'annual_rate': 8.5}),
+    ('/api/calculate/emi/solve/rate', {'emi': 1000, 'loan_amount': 100000, 'tenure_years': [20, float('inf')]}),
+])
+def test_solver_rejects_non_finite(client, path, body):
+    """Infinite or NaN items are per-item errors; the rest are solved."""
+    response = client.post(path, json=body)
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['errors'] == [{'index': 1, 'error': 'Parameters must be finite numbers'}]
+    assert data['residual'][1] is None
+    assert data['residual'][0] is not None
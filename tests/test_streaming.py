@@ -0,0 +1,138 @@
+"""
+Tests for NDJSON streaming on /api/calculate and /api/calculate/emi.
+"""
+import io
+import json
+import pytest
+from src.service.app import app
+from src.service.streaming import iter_ndjson, NDJSON_MIMETYPE
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def post_ndjson(client, url, lines):
+    """POST lines as an NDJSON body and parse the NDJSON response."""
+    body = ''.join(line + '\n' for line in lines).encode('utf-8')
+    response = client.post(url, data=body, content_type=NDJSON_MIMETYPE)
+    assert response.status_code == 200
+    assert response.mimetype == NDJSON_MIMETYPE
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_calculate_ndjson_results_in_order(client):
+    """Test each input line produces one result line in order."""
+    results = post_ndjson(client, '/api/calculate', [
+        json.dumps({'operation': 'add', 'a': 2, 'b': 3}),
+        json.dumps({'operation': 'factorial', 'a': 5}),
+        json.dumps({'operation': 'divide', 'a': 1, 'b': 4})
+    ])
+    assert results == [
+        {'line': 1, 'result': 5},
+        {'line': 2, 'result': 120},
+        {'line': 3, 'result': 0.25}
+    ]
+
+
+def test_calculate_ndjson_errors_inline(client):
+    """Test per-line errors are reported without stopping the stream."""
+    results = post_ndjson(client, '/api/calculate', [
+        json.dumps({'operation': 'divide', 'a': 1, 'b': 0}),
+        'not json',
+        '',
+        '[1, 2]',
+        json.dumps({'operation': 'subtract', 'a': 5, 'b': 3})
+    ])
+    assert results == [
+        {'line': 1, 'error': 'Division by zero'},
+        {'line': 2, 'error': 'Invalid JSON'},
+        {'line': 4, 'error': 'Line must be a JSON object'},
+        {'line': 5, 'result': 2}
+    ]
+
+
+def test_calculate_ndjson_exact_mode(client):
+    """Test exact mode works per line."""
+    results = post_ndjson(client, '/api/calculate', [
+        json.dumps({'operation': 'factorial', 'a': 25, 'exact': True})
+    ])
+    assert results[0]['result'] == '15511210043330985984000000'
+    assert results[0]['exact'] is True
+
+
+def test_emi_ndjson(client):
+    """Test EMI NDJSON results match the JSON endpoint."""
+    request_body = {'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20}
+    single = client.post('/api/calculate/emi', json=request_body).get_json()
+    results = post_ndjson(client, '/api/calculate/emi', [
+        json.dumps(request_body),
+        json.dumps({'loan_amount': 500, 'annual_rate': 8.5, 'tenure_years': 20}),
+        json.dumps({'annual_rate': 8.5, 'tenure_years': 20})
+    ])
+    assert results[0] == dict(single, line=1)
+    assert results[1]['error'] == 'Loan amount must be between $1,000 and $10,000,000'
+    assert results[2]['error'] == 'loan_amount is required'
+
+
+def test_ndjson_non_finite_inputs_inline(client):
+    """Test overflowing and NaN inputs become line errors, not a cut stream."""
+    results = post_ndjson(client, '/api/calculate/emi', [
+        '{"loan_amount": 100000, "annual_rate": 8.5, "tenure_years": 1e400}',
+        '{"loan_amount": NaN, "annual_rate": 8.5, "tenure_years": 20}',
+        '{"loan_amount": 100000, "annual_rate": Infinity, "tenure_years": 20}',
+        json.dumps({'loan_amount': 100000, 'annual_rate': 8.5, 'tenure_years': 20})
+    ])
+    assert [result.get('error') for result in results] == [
+        'Invalid parameter types',
+        'Loan amount must be between $1,000 and $10,000,000',
+        'Annual rate must be between 0% and 30%',
+        None
+    ]
+
+    results = post_ndjson(client, '/api/calculate', [
+        json.dumps({'operation': 'factorial', 'a': '1' + '0' * 400, 'exact': True}),
+        json.dumps({'operation': 'add', 'a': 1, 'b': 1})
+    ])
+    assert 'Result too large for exact mode' in results[0]['error']
+    assert results[1] == {'line': 2, 'result': 2}
+
+
+def test_ndjson_unexpected_error_inline(client, monkeypatch):
+    """Test an exception while processing one line does not end the stream."""
+    from src.service import app as app_module
+
+    def calculate_record(data):
+        if data.get('fail'):
+            raise RuntimeError('boom')
+        return {'result': 1}
+    monkeypatch.setattr(app_module, 'calculate_record', calculate_record)
+
+    results = post_ndjson(client, '/api/calculate', ['{"fail": true}', '{}'])
+    assert results == [
+        {'line': 1, 'error': 'Could not process line'},
+        {'line': 2, 'result': 1}
+    ]
+
+
+def test_ndjson_large_input(client):
+    """Test a large job streams one result per line."""
+    lines = [json.dumps({'operation': 'multiply', 'a': i, 'b': 2}) for i in range(5000)]
+    results = post_ndjson(client, '/api/calculate', lines)
+    assert len(results) == 5000
+    assert results[-1] == {'line': 5000, 'result': 9998}
+
+
+def test_iter_ndjson_line_too_long():
+    """Test oversized lines are skipped with an error."""
+    stream = io.BytesIO(b'{"a": "' + b'x' * 100 + b'"}\n{"a": 1}\n{"b": 2}')
+    records = list(iter_ndjson(stream, max_line_bytes=50))
+    assert records == [
+        (1, None, 'Line too long (max 50 bytes)'),
+        (2, {'a': 1}, None),
+        (3, {'b': 2}, None)
+    ]
@@ -0,0 +1,252 @@
+"""
+Tests for the write-behind queue and write-behind history saves.
+"""
+import threading
+import time
+import pytest
+from datetime import datetime
+from src.service import history
+from src.service.database import db
+from src.service.history import history_queue
+from src.service.models import CalculationHistory, User
+from src.service.write_behind import WriteBehindQueue
+
+SAVE = {'calculation_type': 'basic', 'expression': '2 + 2', 'result': '4'}
+
+
+class Recorder:
+    """write() that records batches, optionally blocking or failing."""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, batch):
+        self.release.wait()
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('database unavailable')
+        self.batches.append(list(batch))
+
+
+def test_flush_by_size():
+    """A full batch is written without waiting for the interval."""
+    write = Recorder()
+    writer = WriteBehindQueue(write, batch_size=3, interval=10)
+    writer.start()
+    for item in range(3):
+        assert writer.put(item)
+    writer.flush()
+
+    assert write.batches == [[0, 1, 2]]
+    writer.stop()
+
+
+def test_flush_by_time():
+    """A partial batch is written once its oldest item has waited interval."""
+    write = Recorder()
+    writer = WriteBehindQueue(write, batch_size=100, interval=0.05)
+    writer.start()
+    writer.put('a')
+    writer.put('b')
+    time.sleep(0.3)
+
+    assert write.batches == [['a', 'b']]
+    stats = writer.stats()
+    assert (stats['depth'], stats['enqueued'], stats['written'], stats['flushes']) == (0, 2, 2, 1)
+    assert stats['max_flush_ms'] >= stats['last_flush_ms'] > 0
+    writer.stop()
+
+
+def test_stop_writes_queued_items():
+    """stop() drains the queue before returning."""
+    write = Recorder()
+    writer = WriteBehindQueue(write, batch_size=2, interval=10)
+    writer.start()
+    for item in range(5):
+        writer.put(item)
+    writer.stop()
+
+    assert [item for batch in write.batches for item in batch] == [0, 1, 2, 3, 4]
+    assert not writer.running
+    with pytest.raises(RuntimeError):
+        writer.put(5)
+
+
+def test_backpressure_when_full():
+    """A full queue refuses items after the timeout and counts them."""
+    write = Recorder()
+    write.release.clear()
+    writer = WriteBehindQueue(write, maxsize=2, batch_size=1, interval=0.01)
+    writer.start()
+    writer.put(0)                   # taken by the blocked writer
+    time.sleep(0.05)
+    assert writer.put(1) and writer.put(2)
+
+    start = time.monotonic()
+    assert not writer.put(3, timeout=0.05)
+    assert time.monotonic() - start >= 0.05
+    assert not writer.put(4)
+    stats = writer.stats()
+    assert (stats['depth'], stats['capacity'], stats['rejected']) == (2, 2, 2)
+
+    write.release.set()
+    writer.stop()
+    assert [batch[0] for batch in write.batches] == [0, 1, 2]
+
+
+def test_failed_writes_retried_then_dropped():
+    """A failing batch is retried; after the last retry it is dropped."""
+    write = Recorder(failures=1)
+    writer = WriteBehindQueue(write, batch_size=1, interval=0.01, retries=1, retry_delay=0.01)
+    writer.start()
+    writer.put('retried')
+    writer.flush()
+    assert write.batches == [['retried']]
+
+    write.failures = 2
+    writer.put('dropped')
+    writer.flush()
+    assert write.batches == [['retried']]
+    assert writer.stats()['failed'] == 1
+    writer.stop()
+
+
+def test_only_failed_items_are_retried():
+    """Items a write returns as failed are retried alone, and counted if dropped."""
+    attempts = []
+
+    def write(batch):
+        attempts.append(list(batch))
+        return [item for item in batch if item == 'bad']
+
+    writer = WriteBehindQueue(write, batch_size=3, interval=0.5, retries=1, retry_delay=0.01)
+    writer.start()
+    for item in ('a', 'bad', 'b'):
+        writer.put(item)
+    writer.flush()
+
+    assert attempts == [['a', 'bad', 'b'], ['bad']]
+    stats = writer.stats()
+    assert (stats['written'], stats['failed']) == (2, 1)
+    writer.stop()
+
+
+def test_stop_waits_for_puts_in_flight():
+    """An item put while stop() runs is written, never left in a dead queue."""
+    write = Recorder()
+    write.release.clear()
+    writer = WriteBehindQueue(write, maxsize=1, batch_size=1, interval=0.01)
+    writer.start()
+    writer.put(0)                   # taken by the blocked writer
+    time.sleep(0.05)
+    writer.put(1)                   # fills the queue
+    results = []
+    putter = threading.Thread(target=lambda: results.append(writer.put(2, timeout=5)))
+    putter.start()
+    time.sleep(0.05)
+    stopper = threading.Thread(target=writer.stop)
+    stopper.start()
+    time.sleep(0.05)
+
+    write.release.set()
+    putter.join()
+    stopper.join()
+    assert results == [True]
+    assert [batch[0] for batch in write.batches] == [0, 1, 2]
+
+
+@pytest.fixture
+def write_behind(app):
+    """Run history saves through the write-behind queue."""
+    history_queue.configure(batch_size=50, interval=0.05, wrap=app.app_context)
+    history_queue.start()
+    yield history_queue
+    history_queue.stop()
+    history_queue.clear_stats()
+
+
+def test_save_calculation_write_behind(auth_client, test_user, write_behind):
+    """Saves are accepted with 202 and a provisional id, and written by the next flush."""
+    response = auth_client.post('/api/history', json=SAVE)
+
+    assert response.status_code == 202
+    data = response.get_json()
+    assert data['queued'] is True
+    assert auth_client.get(f'/api/history/keys/{data["provisional_id"]}').status_code == 404
+
+    write_behind.flush()
+    found = auth_client.get(f'/api/history/keys/{data["provisional_id"]}')
+    assert found.status_code == 200
+    calculation = db.session.get(CalculationHistory, found.get_json()['id'])
+    assert (calculation.user_id, calculation.expression, calculation.result) == (test_user.id, '2 + 2', '4')
+    assert auth_client.get('/api/history/stats').get_json()['total'] == 1
+
+
+def test_write_behind_validates_before_queueing(auth_client, write_behind):
+    """Invalid saves are rejected synchronously, as without the queue."""
+    response = auth_client.post('/api/history', json={**SAVE, 'calculation_type': 'unknown'})
+
+    assert response.status_code == 400
+    assert write_behind.stats()['enqueued'] == 0
+
+
+def test_write_behind_batches_many_saves(auth_client, write_behind):
+    """Many saves are written in few batches, counted in /metrics."""
+    for index in range(120):
+        assert auth_client.post('/api/history', json={**SAVE, 'expression': f'{index} + 1'}).status_code == 202
+    write_behind.flush()
+
+    history = auth_client.get('/api/history?limit=100').get_json()
+    assert history['total'] == 120
+    assert history['calculations'][0]['expression'] == '119 + 1'
+    metrics = auth_client.get('/metrics').get_json()
+    assert metrics['history_queue_enabled'] is True
+    assert metrics['history_queue_written'] == 120
+    assert metrics['history_queue_flushes'] < 120
+    assert metrics['history_queue_depth'] == 0
+
+
+def test_write_behind_queue_full(auth_client, write_behind, monkeypatch):
+    """A full queue answers 503 with Retry-After."""
+    monkeypatch.setattr(write_behind, 'put', lambda item, timeout=0: False)
+    response = auth_client.post('/api/history', json=SAVE)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_clear_history_writes_queued_saves_first(auth_client, write_behind):
+    """Saves queued before a clear are cleared too."""
+    auth_client.post('/api/history', json=SAVE)
+    response = auth_client.delete('/api/history')
+
+    assert response.get_json()['deleted_count'] == 1
+    assert auth_client.get('/api/history/stats').get_json()['total'] == 0
+
+
+def test_write_queued_isolates_failing_users(app, test_user, monkeypatch):
+    """One user's failed transaction leaves other users' saves in the batch."""
+    with app.app_context():
+        other = User(username='other', email='other@example.com')
+        other.set_password('password123')
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+
+    insert = history.insert_calculations
+
+    def failing_insert(user_id, entries):
+        if user_id == other_id:
+            raise RuntimeError('database unavailable')
+        return insert(user_id, entries)
+
+    monkeypatch.setattr(history, 'insert_calculations', failing_insert)
+    row = {**SAVE, 'timestamp': datetime.utcnow()}
+    entries = [(test_user.id, row, 'a'), (other_id, row, 'b'), (test_user.id, row, 'c')]
+    with app.app_context():
+        assert history.write_queued(entries) == [entries[1]]
+        saved = db.session.scalars(db.select(CalculationHistory.user_id)).all()
+    assert saved == [test_user.id, test_user.id]